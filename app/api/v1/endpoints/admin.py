@@ -0,0 +1,114 @@
+"""
+Admin API Endpoints
+
+This module provides diagnostics endpoints for operators: an on-demand sampling
+profiler and the log of slow requests. They are only served when ADMIN_TOKEN is
+set, and every request must present the token, either as a bearer token in the
+Authorization header or in the X-Admin-Token header.
+
+Dependencies:
+    - FastAPI for REST API functionality
+    - core.profiling for the sampling profiler and the slow request log
+    - Response schemas for data validation
+"""
+
+import asyncio
+import secrets
+import threading
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.profiling import TimedRoute, collapse_stacks, sample_stacks, slow_requests
+from app.schemas.responses import SlowRequestsResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+# Set while a profile is being taken; one profile runs at a time per worker
+_profiling = False
+
+async def require_admin(request: Request) -> None:
+    """
+    Dependency checking the admin token of a request.
+
+    Raises:
+        HTTPException(404): If ADMIN_TOKEN is not set, so the admin API does not exist
+        HTTPException(401): If the request does not carry the admin token
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-admin-token", "")
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer":
+        token = credentials.strip()
+    if not secrets.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="How long to sample"),
+    intervalMs: float = Query(5.0, ge=1, le=1000, description="Milliseconds between samples"),
+    allThreads: bool = Query(False, description="Also sample worker threads, not only the event loop"),
+):
+    """
+    Profile the worker with a sampling profiler.
+
+    Samples the Python stack of the event loop (or of every thread) while the
+    worker keeps serving requests, and returns the samples in the collapsed
+    stack format read by flamegraph.pl, speedscope and similar tools.
+
+    Args:
+        seconds (float): How long to sample, at most PROFILER_MAX_SECONDS
+        intervalMs (float): Milliseconds between samples
+        allThreads (bool): Whether to sample every thread
+
+    Returns:
+        PlainTextResponse: One 'frame;frame;frame count' line per sampled stack,
+                           root first, most sampled first
+
+    Raises:
+        HTTPException(400): If seconds is over PROFILER_MAX_SECONDS
+        HTTPException(409): If a profile is already being taken
+    """
+    global _profiling
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profiles last at most {settings.PROFILER_MAX_SECONDS:g} seconds",
+        )
+    if _profiling:
+        raise HTTPException(status_code=409, detail="A profile is already being taken")
+
+    thread_ids = None if allThreads else {threading.get_ident()}
+    _profiling = True
+    try:
+        counts = await asyncio.to_thread(sample_stacks, seconds, intervalMs / 1000, thread_ids)
+    finally:
+        _profiling = False
+    return PlainTextResponse(collapse_stacks(counts))
+
+@router.get("/slow-requests", response_model=SlowRequestsResponse, dependencies=[Depends(require_admin)])
+async def get_slow_requests(
+    limit: int = Query(50, ge=1, le=1000, description="Most requests to return"),
+):
+    """
+    List the most recent requests slower than SLOW_REQUEST_THRESHOLD_MS.
+
+    Args:
+        limit (int): Most requests to return
+
+    Returns:
+        SlowRequestsResponse: The threshold, the number of slow requests seen and,
+                              newest first, each request's route, status, duration and
+                              time spent receiving, parsing, validating, in the service,
+                              serializing and responding
+    """
+    return SlowRequestsResponse(
+        thresholdMs=slow_requests.threshold_ms,
+        recorded=slow_requests.recorded,
+        requests=slow_requests.recent(limit),
+    )
@@ -0,0 +1,159 @@
+"""
+Speech Pipeline API Endpoints
+
+This module provides the REST API endpoint for speech-to-speech translation.
+A single request uploads the recorded speech as raw bytes and receives the
+translated speech as a stream of MP3 audio, replacing separate round trips
+through /stt, /translate and /tts. Transcription, translation and synthesis run
+in process and overlap, and the latency of every stage is reported in a
+Server-Timing response header.
+
+Dependencies:
+    - FastAPI for REST API functionality
+    - Speech pipeline service for chaining the three stages
+    - Resilience helpers for the per-request deadline
+    - core.metrics for recording payload sizes
+    - core.profiling for timing the phases of slow requests
+    - core.uploads for the upload size limit
+    - core.responses for closing the audio stream on disconnect
+"""
+
+import time
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from app.core import metrics
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
+from app.core.profiling import TimedRoute
+from app.core.responses import ClosingStreamingResponse
+from app.core.uploads import limit_body
+from app.services.pipeline_service import SpeechPipelineService, StageTimings
+from app.services.registry import get_services
+from app.services.resilience import deadline
+
+router = APIRouter(route_class=TimedRoute)
+
+async def get_pipeline_service(request: Request) -> SpeechPipelineService:
+    """
+    Dependency injection for the speech pipeline service.
+
+    Returns:
+        SpeechPipelineService: The process-wide pipeline shared by all requests,
+                               once the application has finished starting
+    """
+    return (await get_services(request)).pipeline
+
+def _server_timing(upload_seconds: float, timings: StageTimings) -> str:
+    """
+    Format the stage latencies as a Server-Timing header value.
+
+    Args:
+        upload_seconds (float): Time spent reading the request body
+        timings (StageTimings): First-output times of the pipeline stages
+
+    Returns:
+        str: upload duration, then the time from the start of the pipeline to the
+             first output of each stage that produced any, in milliseconds
+    """
+    metrics = [f"upload;dur={upload_seconds * 1000:.1f}"]
+    for stage, description in (
+        ("stt", "first transcript segment"),
+        ("translate", "first translation"),
+        ("tts", "first audio"),
+    ):
+        if stage in timings.first:
+            metrics.append(f'{stage};desc="{description}";dur={timings.first[stage] * 1000:.1f}')
+    return ", ".join(metrics)
+
+@router.post("/speech")
+async def translate_speech(
+    http_request: Request,
+    sourceLanguage: str = Query(..., description="Language code of the speech (e.g., 'en-US')"),
+    targetLanguage: str = Query(..., description="Language code to translate to (e.g., 'es')"),
+    ttsCode: str = Query(..., description="Language code of the voice (e.g., 'es-ES')"),
+    ttsName: str = Query(..., description="Name of the voice to use"),
+    service: SpeechPipelineService = Depends(get_pipeline_service)
+):
+    """
+    Translate recorded speech into synthesized speech in another language.
+
+    The body is the raw audio (Content-Type application/octet-stream or audio/*),
+    up to STT_MAX_UPLOAD_BYTES. The response streams the translated speech as MP3
+    as soon as its first chunk is synthesized, and carries a Server-Timing header
+    with the upload time and the time until each stage's first output:
+        Server-Timing: upload;dur=12.0, stt;desc="first transcript segment";dur=850.2, ...
+
+    Args:
+        http_request (Request): The incoming request carrying the audio body
+        sourceLanguage (str): Language code of the speech
+        targetLanguage (str): Language code to translate to
+        ttsCode (str): Language code of the voice
+        ttsName (str): Name of the voice to use
+        service (SpeechPipelineService): Injected speech pipeline service
+
+    Returns:
+        ClosingStreamingResponse: The translated speech as MP3 audio, or an empty 204
+                                  response if no speech was recognized
+
+    Raises:
+        HTTPException: (400) For invalid parameters or empty audio, (413) for
+                       uploads over STT_MAX_UPLOAD_BYTES, (415) for unsupported
+                       content types or (500) for internal errors.
+        QuotaExceededError: Answered with 429 and Retry-After when an API quota is used up
+        DeadlineExceededError: Answered with 504 when PIPELINE_DEADLINE_SECONDS pass before
+                               the first audio is ready; later, the stream is cut short
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != "application/octet-stream" and not content_type.startswith("audio/"):
+        raise HTTPException(status_code=415, detail="Unsupported audio upload content type")
+
+    start = time.perf_counter()
+    audio_content = await limit_body(http_request, settings.STT_MAX_UPLOAD_BYTES).body()
+    upload_seconds = time.perf_counter() - start
+    if not audio_content:
+        raise HTTPException(status_code=400, detail="Audio upload is empty")
+    metrics.AUDIO_BYTES.labels("pipeline").observe(len(audio_content))
+
+    timings = StageTimings()
+    audio = service.speak_translation(
+        audio_content,
+        source_language=sourceLanguage,
+        target_language=targetLanguage,
+        tts_language_code=ttsCode,
+        voice_name=ttsName,
+        timings=timings,
+    )
+    try:
+        # The stages started here inherit the deadline for the rest of the stream
+        with deadline(settings.PIPELINE_DEADLINE_SECONDS):
+            # Wait for the head chunk so errors in any stage still map to an HTTP status
+            try:
+                head = await anext(audio)
+            except BaseException:
+                await audio.aclose()
+                raise
+    except StopAsyncIteration:
+        return Response(status_code=204, headers={"Server-Timing": _server_timing(upload_seconds, timings)})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Speech pipeline service error")
+
+    async def body():
+        # Closing the stream cancels the recognition, translation and synthesis
+        # still in flight when the client disconnects
+        try:
+            yield head
+            async for chunk in audio:
+                yield chunk
+        finally:
+            await audio.aclose()
+
+    return ClosingStreamingResponse(
+        body(),
+        media_type="audio/mp3",
+        headers={"Server-Timing": _server_timing(upload_seconds, timings)},
+    )
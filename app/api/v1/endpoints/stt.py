@@ -5,27 +5,101 @@ This module provides the REST API endpoints for speech-to-text services.
 It handles the conversion of audio content to text with support for
 multiple languages and audio formats.
 
+Audio can be sent as base64 inside JSON, or uploaded as raw bytes
+(application/octet-stream or audio/*) or as a multipart form. Uploads are read
+incrementally into a buffer that spills to a temporary file past
+STT_UPLOAD_SPOOL_BYTES and are rejected once they exceed STT_MAX_UPLOAD_BYTES.
+
+Live audio is recognized over a WebSocket, with interim and final results pushed
+back as the recognizer produces them. Recordings in Cloud Storage that are too
+long for a single request are transcribed by batch jobs that are submitted,
+polled and cancelled through /jobs.
+
 Dependencies:
     - FastAPI for REST API functionality
     - Speech-to-Text service for handling the transcription
+    - Resilience helpers for the per-request deadline
+    - core.metrics for recording payload sizes
+    - core.profiling for timing the phases of slow requests
+    - core.uploads for the upload size limit
     - Request/Response schemas for data validation
+    - ModelResponse for serializing transcriptions without revalidating them
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from app.schemas.requests import STTRequest
-from app.schemas.responses import STTResponse
+import asyncio
+import base64
+import math
+import re
+from contextlib import aclosing
+from tempfile import SpooledTemporaryFile
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from starlette.datastructures import UploadFile
+from starlette.requests import HTTPConnection
+from app.core import metrics
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
+from app.core.profiling import TimedRoute
+from app.core.responses import ModelResponse
+from app.core.uploads import limit_body
+from app.schemas.requests import STTJobRequest, STTRequest
+from app.schemas.responses import STTJobResponse, STTResponse
+from app.services.registry import get_services
+from app.services.resilience import deadline
 from app.services.stt_service import STTService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Maps base64 in either alphabet to the URL-safe one
+_TO_URLSAFE = bytes.maketrans(b"+/", b"-_")
+# URL-safe base64, padded or not
+_BASE64_URLSAFE = re.compile(rb"[A-Za-z0-9_\-]*={0,2}")
 
-async def get_stt_service():
+async def get_stt_service(request: HTTPConnection) -> STTService:
     """
     Dependency injection for the speech-to-text service.
     
     Returns:
-        STTService: An instance of the speech-to-text service
+        STTService: The process-wide speech-to-text service shared by all requests,
+                    once the application has finished starting
+    """
+    return (await get_services(request)).stt
+
+def _decode_audio(content: str) -> bytes:
+    """
+    Decode base64 audio the way the client library does for string fields.
+
+    Both the standard and the URL-safe alphabet are accepted, with or without
+    padding and line breaks.
+
+    Raises:
+        ValueError: If the content is not base64 in either alphabet
+    """
+    try:
+        data = content.encode("ascii").translate(_TO_URLSAFE, b" \t\r\n")
+        if not _BASE64_URLSAFE.fullmatch(data):
+            raise ValueError
+        if len(data) % 4:
+            data += b"=" * (-len(data) % 4)
+        return base64.urlsafe_b64decode(data)
+    except ValueError:
+        # Also raised for non-ASCII characters and bad padding
+        raise ValueError("audioContent is not valid base64")
+
+async def _spool_body(request: Request) -> UploadFile:
     """
-    return STTService()
+    Read a raw request body into a buffer that spills to disk when it grows large.
+    """
+    upload = UploadFile(SpooledTemporaryFile(max_size=settings.STT_UPLOAD_SPOOL_BYTES))
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await upload.write(chunk)
+    except BaseException:
+        await upload.close()
+        raise
+    await upload.seek(0)
+    return upload
 
 @router.post("/synthesize", response_model=STTResponse)
 async def transcribe_speech(
@@ -50,14 +124,293 @@ async def transcribe_speech(
     
     Raises:
         HTTPException: (400) For invalid parameters or (500) for internal errors.
+        QuotaExceededError: Answered with 429 and Retry-After when the API quota is used up
+        DeadlineExceededError: Answered with 504 when STT_DEADLINE_SECONDS pass
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
     """
     try:
-        result = await service.transcribe_audio(
-            audio_content=request.audioContent,
-            language_code=request.languageCode,
-        )
-        return STTResponse(**result)
+        audio_content = _decode_audio(request.audioContent)
+        metrics.AUDIO_BYTES.labels("transcribe").observe(len(audio_content))
+        with deadline(settings.STT_DEADLINE_SECONDS):
+            result = await service.transcribe_audio(
+                audio_content=audio_content,
+                language_code=request.languageCode,
+            )
+        return ModelResponse(STTResponse, result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Speech-to-Text service error")
+
+@router.post("/upload", response_model=STTResponse)
+async def transcribe_upload(
+    http_request: Request,
+    languageCode: str | None = Query(None, description="Language code of the audio (e.g., 'en-US')"),
+    service: STTService = Depends(get_stt_service)
+):
+    """
+    Convert uploaded audio to text without base64 encoding it.
+    
+    The body is either the raw audio (Content-Type application/octet-stream or
+    audio/*) or a multipart form with the audio in an 'audio' file field. The
+    language code is taken from the query string, or from a 'languageCode' form
+    field for multipart uploads.
+    
+    Args:
+        http_request (Request): The incoming request carrying the audio body
+        languageCode (str, optional): Language code for recognition
+        service (STTService): Injected speech-to-text service
+    
+    Returns:
+        STTResponse: The transcription response
+    
+    Raises:
+        HTTPException: (400) For a missing language code or empty audio, (413) for
+                       uploads over STT_MAX_UPLOAD_BYTES, (415) for unsupported
+                       content types or (500) for internal errors.
+        QuotaExceededError: Answered with 429 and Retry-After when the API quota is used up
+        DeadlineExceededError: Answered with 504 when STT_DEADLINE_SECONDS pass
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = limit_body(http_request, settings.STT_MAX_UPLOAD_BYTES)
+
+    form = None
+    if content_type == "multipart/form-data":
+        form = await body.form(max_files=1, max_fields=8)
+        upload = form.get("audio")
+        languageCode = languageCode or form.get("languageCode")
+        if not isinstance(upload, UploadFile):
+            await form.close()
+            raise HTTPException(status_code=400, detail="Missing 'audio' file field")
+    elif content_type == "application/octet-stream" or content_type.startswith("audio/"):
+        upload = await _spool_body(body)
+    else:
+        raise HTTPException(status_code=415, detail="Unsupported audio upload content type")
+
+    try:
+        if not isinstance(languageCode, str) or not languageCode:
+            raise ValueError("languageCode is required")
+        audio_content = await upload.read()
+        if not audio_content:
+            raise ValueError("Audio upload is empty")
+        metrics.AUDIO_BYTES.labels("transcribe").observe(len(audio_content))
+        with deadline(settings.STT_DEADLINE_SECONDS):
+            result = await service.transcribe_audio(
+                audio_content=audio_content,
+                language_code=languageCode,
+            )
+        return ModelResponse(STTResponse, result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Speech-to-Text service error")
+    finally:
+        if form is not None:
+            await form.close()
+        else:
+            await upload.close()
+
+@router.websocket("/stream")
+async def stream_speech(
+    websocket: WebSocket,
+    languageCode: str = Query(..., description="Language code of the audio (e.g., 'en-US')"),
+    encoding: str = Query("LINEAR16", description="Audio encoding: LINEAR16, MULAW or ALAW"),
+    sampleRateHertz: int = Query(16000, gt=0, description="Sample rate of the audio"),
+    audioChannelCount: int = Query(1, ge=1, le=8, description="Number of interleaved channels"),
+    interimResults: bool = Query(True, description="Also send results that may still change"),
+    service: STTService = Depends(get_stt_service)
+):
+    """
+    Recognize live audio sent over a WebSocket.
+    
+    The client sends the audio as binary frames and a text frame (e.g. "end") once
+    it is done. The server sends a JSON text frame for every result:
+        {"type": "result", "text", "isFinal", "stability", "confidence",
+         "languageCode", "resultEndOffset"}
+    and, after the final results for all audio, {"type": "end", "reason"} before
+    closing the socket. The reason is "complete", or "session_limit" once the
+    session has lasted STT_STREAM_MAX_SESSION_SECONDS.
+    
+    At most STT_STREAM_QUEUE_FRAMES frames are buffered; beyond that the socket is
+    not read until the recognizer catches up.
+    
+    Args:
+        websocket (WebSocket): The client connection
+        languageCode (str): Language code for recognition
+        encoding (str, optional): Audio encoding
+        sampleRateHertz (int, optional): Sample rate of the audio
+        audioChannelCount (int, optional): Number of interleaved channels
+        interimResults (bool, optional): Also send results that may still change
+        service (STTService): Injected speech-to-text service
+    
+    Note:
+        The socket is closed with code 1008 for invalid parameters, and after
+        sending {"type": "error", "detail"} with 1013 when the API quota is used up
+        (adding "retryAfter" in seconds) and 1011 for other upstream errors.
+    """
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    session_end = loop.time() + settings.STT_STREAM_MAX_SESSION_SECONDS
+    audio: asyncio.Queue = asyncio.Queue(maxsize=settings.STT_STREAM_QUEUE_FRAMES)
+    reason = "complete"
+    disconnected = False
+
+    async def read_audio():
+        nonlocal reason, disconnected
+        try:
+            while True:
+                message = await asyncio.wait_for(websocket.receive(), session_end - loop.time())
+                if message["type"] == "websocket.disconnect":
+                    disconnected = True
+                    break
+                if message.get("bytes"):
+                    # Waiting for room in the queue stops reading the socket, which
+                    # pushes back on the client
+                    await asyncio.wait_for(audio.put(message["bytes"]), session_end - loop.time())
+                elif message.get("text") is not None:
+                    break
+        except asyncio.TimeoutError:
+            reason = "session_limit"
+        # Skipped when the reader is cancelled: the recognition is already over and
+        # nothing drains the queue any more, so waiting for room would never end
+        await audio.put(None)
+
+    reader = asyncio.create_task(read_audio())
+    try:
+        results = service.stream_recognize(
+            audio,
+            language_code=languageCode,
+            encoding=encoding,
+            sample_rate_hertz=sampleRateHertz,
+            audio_channel_count=audioChannelCount,
+            interim_results=interimResults,
+        )
+        async with aclosing(results):
+            async for result in results:
+                if disconnected:
+                    return
+                await websocket.send_json({"type": "result", **result})
+        if not disconnected:
+            await websocket.send_json({"type": "end", "reason": reason})
+            await websocket.close()
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+    except WebSocketDisconnect:
+        pass
+    except QuotaExceededError as e:
+        if not disconnected:
+            await websocket.send_json({"type": "error", "detail": str(e), "retryAfter": math.ceil(e.retry_after)})
+            await websocket.close(code=1013)
     except Exception as e:
-        raise HTTPException(status_code=500, detail="Speech-to-Text service error") 
\ No newline at end of file
+        if not disconnected:
+            await websocket.send_json({"type": "error", "detail": "Speech-to-Text service error"})
+            await websocket.close(code=1011)
+    finally:
+        reader.cancel()
+
+def _jobs(service: STTService):
+    """
+    Return the job manager, or fail with 503 when batch jobs are disabled.
+    """
+    if service.jobs is None:
+        raise HTTPException(status_code=503, detail="Transcription jobs are disabled")
+    return service.jobs
+
+async def _job_or_404(service: STTService, job_id: str) -> dict:
+    job = await _jobs(service).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Transcription job not found")
+    return job
+
+@router.post("/jobs", response_model=STTJobResponse, status_code=202)
+async def submit_transcription_job(
+    request: STTJobRequest,
+    service: STTService = Depends(get_stt_service)
+):
+    """
+    Start a batch transcription job for a recording in Cloud Storage.
+    
+    Args:
+        request (STTJobRequest): The recording URI and language code
+        service (STTService): Injected speech-to-text service
+    
+    Returns:
+        STTJobResponse: The queued job; poll GET /jobs/{jobId} for its status
+    
+    Raises:
+        HTTPException: (503) When batch jobs are disabled
+    """
+    job = await _jobs(service).submit(request.audioUri, request.languageCode)
+    return STTJobResponse(**job)
+
+@router.get("/jobs/{job_id}", response_model=STTJobResponse)
+async def get_transcription_job(
+    job_id: str,
+    service: STTService = Depends(get_stt_service)
+):
+    """
+    Report the status of a batch transcription job.
+    
+    Args:
+        job_id (str): The job identifier
+        service (STTService): Injected speech-to-text service
+    
+    Returns:
+        STTJobResponse: The job
+    
+    Raises:
+        HTTPException: (404) For unknown jobs or (503) when batch jobs are disabled
+    """
+    return STTJobResponse(**await _job_or_404(service, job_id))
+
+@router.get("/jobs/{job_id}/result", response_model=STTResponse)
+async def get_transcription_job_result(
+    job_id: str,
+    service: STTService = Depends(get_stt_service)
+):
+    """
+    Return the transcription of a finished batch job.
+    
+    Args:
+        job_id (str): The job identifier
+        service (STTService): Injected speech-to-text service
+    
+    Returns:
+        STTResponse: The transcription, with segment offsets
+    
+    Raises:
+        HTTPException: (404) For unknown jobs, (409) for jobs that have not
+                       succeeded or (503) when batch jobs are disabled
+    """
+    job = await _job_or_404(service, job_id)
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Transcription job is {job['status']}")
+    return ModelResponse(STTResponse, job["result"])
+
+@router.post("/jobs/{job_id}/cancel", response_model=STTJobResponse)
+async def cancel_transcription_job(
+    job_id: str,
+    service: STTService = Depends(get_stt_service)
+):
+    """
+    Cancel a batch transcription job that has not finished.
+    
+    Args:
+        job_id (str): The job identifier
+        service (STTService): Injected speech-to-text service
+    
+    Returns:
+        STTJobResponse: The job after cancellation; finished jobs are unchanged
+    
+    Raises:
+        HTTPException: (404) For unknown jobs or (503) when batch jobs are disabled
+    """
+    job = await _jobs(service).cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Transcription job not found")
+    return STTJobResponse(**job)
@@ -8,24 +8,45 @@ and input validation.
 Dependencies:
     - FastAPI for REST API functionality
     - Translation service for handling the actual translation
+    - Resilience helpers for the per-request deadline
+    - core.metrics for recording payload sizes
+    - core.profiling for timing the phases of slow requests
     - Request/Response schemas for data validation
+    - ModelResponse for serializing results without revalidating them
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from app.schemas.requests import TranslateRequest, DetectLanguageRequest
-from app.schemas.responses import TranslateResponse, DetectLanguageResponse
+from fastapi import APIRouter, HTTPException, Depends, Request
+from app.core import metrics
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
+from app.core.profiling import TimedRoute
+from app.core.responses import ModelResponse
+from app.schemas.requests import TranslateRequest, BatchTranslateRequest, DetectLanguageRequest
+from app.schemas.responses import TranslateResponse, BatchTranslateResponse, DetectLanguageResponse
+from app.services.registry import get_services
+from app.services.resilience import deadline
 from app.services.translation_service import TranslationService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-async def get_translation_service():
+# Added to responses served from expired results while the API is unavailable
+STALE_WARNING = '110 - "Response is Stale"'
+
+def _stale_headers(stale: bool) -> dict[str, str] | None:
+    """
+    Return the headers flagging a response served from expired results, if it is.
+    """
+    return {"Warning": STALE_WARNING} if stale else None
+
+async def get_translation_service(request: Request) -> TranslationService:
     """
     Dependency injection for the translation service.
     
     Returns:
-        TranslationService: An instance of the translation service
+        TranslationService: The process-wide translation service shared by all requests,
+                            once the application has finished starting
     """
-    return TranslationService()
+    return (await get_services(request)).translation
 
 @router.post("/translate", response_model=TranslateResponse)
 async def translate_text(
@@ -47,21 +68,77 @@ async def translate_text(
             - translated_text: The translated text
             - source_language: Detected or provided source language
             - target_language: Target language code
+            - stale: Whether it was served from an expired result while the API is unavailable,
+                     in which case the response carries a 'Warning: 110' header
     
     Raises:
         HTTPException(400): If the target language is not supported
         HTTPException(500): If there's an internal translation service error
+        QuotaExceededError: Answered with 429 and Retry-After when the API quota is used up
+        DeadlineExceededError: Answered with 504 when TRANSLATE_DEADLINE_SECONDS pass
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
+    
+    """
+    metrics.TEXT_CHARS.labels("translate").observe(len(request.text))
+    try:
+        with deadline(settings.TRANSLATE_DEADLINE_SECONDS):
+            result = await service.translate_text(
+                text=request.text,
+                target_language=request.targetLanguage,
+                source_language=request.sourceLanguage
+            )
+        return ModelResponse(TranslateResponse, result, headers=_stale_headers(result.get("stale")))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Translation service error")
+
+@router.post("/translate/batch", response_model=BatchTranslateResponse)
+async def translate_batch(
+    request: BatchTranslateRequest,
+    service: TranslationService = Depends(get_translation_service)
+):
+    """
+    Translate many segments from one language to another in a single call.
     
+    Args:
+        request (BatchTranslateRequest): The batch request containing:
+            - texts: Segments to translate
+            - targetLanguage: Language code to translate to
+            - sourceLanguage: Optional source language code
+        service (TranslationService): Injected translation service
+    
+    Returns:
+        BatchTranslateResponse: One result per segment, in input order. Segments
+        that fail carry an error message instead of a translation, and segments
+        served from expired results are flagged as stale, with a 'Warning: 110' header.
+    
+    Raises:
+        HTTPException(400): If the request is invalid
+        HTTPException(500): If there's an internal translation service error
+        QuotaExceededError: Answered with 429 and Retry-After when the API quota is used up
+        DeadlineExceededError: Answered with 504 when TRANSLATE_DEADLINE_SECONDS pass
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
     """
+    metrics.TEXT_CHARS.labels("translate_batch").observe(sum(len(text) for text in request.texts))
     try:
-        result = await service.translate_text(
-            text=request.text,
-            target_language=request.targetLanguage,
-            source_language=request.sourceLanguage
+        with deadline(settings.TRANSLATE_DEADLINE_SECONDS):
+            results = await service.translate_many(
+                texts=request.texts,
+                target_language=request.targetLanguage,
+                source_language=request.sourceLanguage
+            )
+        return ModelResponse(
+            BatchTranslateResponse,
+            {"translations": results},
+            headers=_stale_headers(any(result.get("stale") for result in results)),
         )
-        return TranslateResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Translation service error")
 
@@ -82,15 +159,23 @@ async def detect_language(
         DetectLanguageResponse: The detected language information containing:
             - language_code: Detected language code
             - confidence: Confidence score of the detection
+            - stale: Whether it was served from an expired result while the API is unavailable
     
     Raises:
         HTTPException(400): If the text is invalid
         HTTPException(500): If there's an internal service error
+        QuotaExceededError: Answered with 429 and Retry-After when the API quota is used up
+        DeadlineExceededError: Answered with 504 when TRANSLATE_DEADLINE_SECONDS pass
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
     """
+    metrics.TEXT_CHARS.labels("detect").observe(len(request.text))
     try:
-        result = await service.detect_language(text=request.text)
-        return DetectLanguageResponse(**result)
+        with deadline(settings.TRANSLATE_DEADLINE_SECONDS):
+            result = await service.detect_language(text=request.text)
+        return ModelResponse(DetectLanguageResponse, result, headers=_stale_headers(result.get("stale")))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Language detection failed") 
\ No newline at end of file
@@ -3,32 +3,87 @@ Text-to-Speech API Endpoints
 
 This module provides the REST API endpoints for text-to-speech services.
 It handles the conversion of text to synthesized speech with customizable
-voice parameters and proper error handling.
+voice parameters and proper error handling. When the audio store is enabled,
+synthesized audio is served from local disk with strong ETags, conditional
+requests and byte ranges. Long text can be streamed as it is synthesized.
 
 Dependencies:
     - FastAPI for REST API functionality
     - Text-to-Speech service for handling the speech synthesis
+    - Resilience helpers for the per-request deadline
+    - core.metrics for recording payload sizes
+    - core.profiling for timing the phases of slow requests
+    - core.responses for closing the audio stream on disconnect
     - Request/Response schemas for data validation
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Response
+import asyncio
+import os
+
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import FileResponse
+from app.core import metrics
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
+from app.core.profiling import TimedRoute
+from app.core.responses import ClosingStreamingResponse
 from app.schemas.requests import TTSRequest
+from app.services.audio_store import AudioStore
+from app.services.registry import get_services
+from app.services.resilience import deadline
 from app.services.tts_service import TTSService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-async def get_tts_service():
+async def get_tts_service(request: Request) -> TTSService:
     """
     Dependency injection for the text-to-speech service.
     
     Returns:
-        TTSService: An instance of the text-to-speech service
+        TTSService: The process-wide text-to-speech service shared by all requests,
+                    once the application has finished starting
     """
-    return TTSService()
+    return (await get_services(request)).tts
+
+async def _audio_response(http_request: Request, audio_id: str, path: str, operation: str) -> Response:
+    """
+    Serve a stored clip, honouring If-None-Match and Range request headers.
+    
+    Args:
+        http_request (Request): The incoming HTTP request
+        audio_id (str): Content address of the clip, used as a strong ETag
+        path (str): Location of the clip on local disk
+        operation (str): Operation the size of the clip is recorded under in AUDIO_BYTES
+    
+    Returns:
+        Response: 304 if the client already has the clip, otherwise the (partial) file
+    
+    Raises:
+        HTTPException: (404) If the clip was evicted from the store meanwhile
+    """
+    etag = f'"{audio_id}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Content-Location": f"{settings.API_V1_STR}/tts/audio/{audio_id}",
+    }
+    if_none_match = http_request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    try:
+        # Stat once off the event loop; FileResponse reuses the result
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    metrics.AUDIO_BYTES.labels(operation).observe(stat_result.st_size)
+    return FileResponse(path, media_type="audio/mp3", headers=headers, stat_result=stat_result)
 
 @router.post("/synthesize")
 async def synthesize_speech(
     request: TTSRequest,
+    http_request: Request,
     service: TTSService = Depends(get_tts_service)
 ):
     """
@@ -37,26 +92,101 @@ async def synthesize_speech(
     Args:
         request (TTSRequest): The synthesis request containing text to synthesize,
                               language code, and voice name.
+        http_request (Request): The incoming HTTP request, for conditional and range headers.
         service (TTSService): Injected text-to-speech service.
     
     Returns:
-        Response: The raw MP3 audio bytes with the appropriate media type.
+        Response: The raw MP3 audio bytes with the appropriate media type. When the
+                  audio store is enabled the response carries a strong ETag and
+                  supports If-None-Match and Range. With 'stream' set, the audio is
+                  streamed chunk by chunk as soon as the first chunk is synthesized.
     
     Raises:
         HTTPException: (400) For invalid parameters or (500) for internal errors.
+        QuotaExceededError: Answered with 429 and Retry-After when the API quota is used up
+        DeadlineExceededError: Answered with 504 when TTS_DEADLINE_SECONDS pass before
+                               the audio, or its first chunk when streaming, is ready
+        UpstreamUnavailableError: Answered with 503 and Retry-After while the API's circuit breaker is open
     """
+    metrics.TEXT_CHARS.labels("synthesize").observe(len(request.text))
     try:
-        result = await service.synthesize_speech(
-            text=request.text,
-            tts_language_code=request.ttsCode,
-            voice_name=request.ttsName,
-        )
-        audio_content = result["audioContent"]
-        return Response(
-            content=audio_content,  # Raw MP3 audio bytes
-            media_type="audio/mp3"
-        )
+        with deadline(settings.TTS_DEADLINE_SECONDS):
+            if request.stream:
+                audio = service.stream_speech(
+                    text=request.text,
+                    tts_language_code=request.ttsCode,
+                    voice_name=request.ttsName,
+                )
+                # Wait for the head chunk so synthesis errors still map to an HTTP status
+                try:
+                    head = await anext(audio, None)
+                except BaseException:
+                    await audio.aclose()
+                    raise
+                if head is None:
+                    raise ValueError("Text contains nothing to synthesize")
+
+                async def body():
+                    # Closing the stream cancels the chunks still being synthesized
+                    # when the client disconnects
+                    try:
+                        yield head
+                        async for chunk in audio:
+                            yield chunk
+                    finally:
+                        await audio.aclose()
+
+                return ClosingStreamingResponse(body(), media_type="audio/mp3")
+
+            if service.audio_store is not None:
+                stored = await service.synthesize_to_store(
+                    text=request.text,
+                    tts_language_code=request.ttsCode,
+                    voice_name=request.ttsName,
+                )
+                return await _audio_response(http_request, stored["audioId"], stored["path"], "synthesize")
+
+            result = await service.synthesize_speech(
+                text=request.text,
+                tts_language_code=request.ttsCode,
+                voice_name=request.ttsName,
+            )
+            audio_content = result["audioContent"]
+            metrics.AUDIO_BYTES.labels("synthesize").observe(len(audio_content))
+            return Response(
+                content=audio_content,  # Raw MP3 audio bytes
+                media_type="audio/mp3"
+            )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail="Text-to-Speech service error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Text-to-Speech service error")
+
+@router.get("/audio/{audio_id}")
+async def get_audio(
+    audio_id: str,
+    http_request: Request,
+    service: TTSService = Depends(get_tts_service)
+):
+    """
+    Serve previously synthesized audio by its content address.
+    
+    Args:
+        audio_id (str): Content address returned in the ETag of /tts/synthesize
+        http_request (Request): The incoming HTTP request
+        service (TTSService): Injected text-to-speech service
+    
+    Returns:
+        Response: The MP3 audio, supporting If-None-Match and Range requests.
+    
+    Raises:
+        HTTPException: (404) If the audio is not stored.
+    """
+    if service.audio_store is None or not AudioStore.is_key(audio_id):
+        raise HTTPException(status_code=404, detail="Audio not found")
+    path = await service.audio_store.get(audio_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    return await _audio_response(http_request, audio_id, path, "audio")
@@ -9,15 +9,19 @@ The router includes endpoints for:
 - Translation services (/translate)
 - Text-to-Speech services (/tts)
 - Speech-to-Text services (/stt)
+- Speech-to-speech pipeline (/pipeline)
+- Diagnostics for operators (/admin)
 
 Each endpoint group is tagged appropriately for OpenAPI documentation organization.
 """
 
 from fastapi import APIRouter
-from app.api.v1.endpoints import translation, tts, stt
+from app.api.v1.endpoints import translation, tts, stt, pipeline, admin
 
 api_router = APIRouter()
 
 api_router.include_router(translation.router, tags=["translation"])
 api_router.include_router(tts.router, prefix="/tts", tags=["text-to-speech"])
-api_router.include_router(stt.router, prefix="/stt", tags=["speech-to-text"]) 
\ No newline at end of file
+api_router.include_router(stt.router, prefix="/stt", tags=["speech-to-text"])
+api_router.include_router(pipeline.router, prefix="/pipeline", tags=["speech-pipeline"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"]) 
\ No newline at end of file
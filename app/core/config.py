@@ -13,6 +13,85 @@ Environment Variables:
     - VERSION: API version
     - GOOGLE_PROJECT_ID: Google Cloud project ID
     - GOOGLE_APPLICATION_CREDENTIALS: Path to the Google Cloud service account key file
+    - CLIENT_WARMUP_TIMEOUT: Seconds to wait for each upstream channel to connect at startup
+    - AUTH_TOKEN_REFRESH_MARGIN_SECONDS: Seconds before expiry at which the access token is refreshed in the background
+    - AUTH_TOKEN_REFRESH_RETRY_SECONDS: Seconds to wait before retrying a failed access token refresh
+    - TRANSLATION_CACHE_MAX_BYTES: Memory budget of the translation result cache (0 disables it)
+    - DETECTION_CACHE_MAX_BYTES: Memory budget of the language detection cache (0 disables it)
+    - RESULT_CACHE_TTL_SECONDS: Seconds a cached translation or detection stays fresh
+    - TRANSLATION_MEMORY_PATH: SQLite file of the persistent translation memory (empty disables it)
+    - TRANSLATION_MEMORY_FUZZY_THRESHOLD: Minimum similarity of a near-duplicate segment (0 disables fuzzy lookup)
+    - TRANSLATION_MEMORY_SERVE_FUZZY: Serve near-duplicates instead of only flagging them
+    - TRANSLATION_BATCH_MAX_SEGMENTS: Maximum segments per upstream TranslateText request
+    - TRANSLATION_BATCH_MAX_CODEPOINTS: Maximum codepoints per upstream TranslateText request
+    - TRANSLATION_BATCH_CONCURRENCY: Upstream requests a single batch may have in flight
+    - TRANSLATION_COALESCE_ENABLED: Merge concurrent /translate calls into multi-segment requests
+    - TRANSLATION_COALESCE_WINDOW_MS: Milliseconds to collect concurrent calls before sending
+    - TRANSLATION_COALESCE_MAX_SEGMENTS: Number of collected calls that triggers an immediate send
+    - LOCAL_LANGUAGE_ID_ENABLED: Answer /detect-language locally when the local model is confident
+    - LOCAL_LANGUAGE_ID_THRESHOLD: Minimum local confidence needed to skip the API
+    - LOCAL_LANGUAGE_ID_FOR_TRANSLATE: Use the local model to fill in a missing source language
+    - TTS_AUDIO_CACHE_DIR: Directory of the synthesized audio store (empty disables it)
+    - TTS_AUDIO_CACHE_MAX_BYTES: Disk budget of the synthesized audio store
+    - TTS_STREAM_CHUNK_BYTES: Maximum UTF-8 size of each chunk of streamed synthesis
+    - TTS_STREAM_FIRST_CHUNK_BYTES: Maximum UTF-8 size of the first chunk of streamed synthesis
+    - TTS_STREAM_CONCURRENCY: Chunks of one streamed synthesis sent to the API at the same time
+    - STT_MAX_UPLOAD_BYTES: Largest audio upload accepted by the speech-to-text endpoints
+    - STT_UPLOAD_SPOOL_BYTES: Size above which an audio upload is buffered on disk instead of in memory
+    - STT_LONG_AUDIO_CHUNK_SECONDS: Longest chunk of a long recording sent in one request
+    - STT_LONG_AUDIO_SPLIT_WINDOW_SECONDS: How far before the chunk limit a long recording may be cut
+    - STT_LONG_AUDIO_CONCURRENCY: Chunks of one long recording transcribed at the same time
+    - STT_JOBS_DB_PATH: SQLite file of the batch transcription job table (empty disables jobs)
+    - STT_JOBS_MAX_CONCURRENCY: Batch transcription jobs running at the same time
+    - STT_JOBS_MAX_PER_PROJECT: Batch transcription jobs running at the same time per project
+    - STT_JOBS_POLL_INITIAL_SECONDS: First delay between polls of a batch operation
+    - STT_JOBS_POLL_MAX_SECONDS: Longest delay between polls of a batch operation
+    - STT_JOBS_LEASE_SECONDS: How long a process owns a batch job before another process may take it over
+    - STT_JOBS_MAX_POLL_ERRORS: Consecutive failed polls after which a batch job is marked failed
+    - STT_STREAM_ROLLOVER_SECONDS: Seconds after which a live recognition stream is restarted upstream
+    - STT_STREAM_MAX_SESSION_SECONDS: Longest live recognition session on one WebSocket
+    - STT_STREAM_QUEUE_FRAMES: Audio frames buffered per session before the socket stops being read
+    - PIPELINE_TRANSLATE_CONCURRENCY: Transcript segments of one pipeline request translated at the same time
+    - TRANSLATION_QUOTA_CHARS_PER_MINUTE: Translation API quota in characters per minute (0 disables pacing)
+    - TTS_QUOTA_CHARS_PER_MINUTE: Text-to-Speech API quota in characters per minute (0 disables pacing)
+    - STT_QUOTA_AUDIO_SECONDS_PER_MINUTE: Speech-to-Text API quota in audio seconds per minute (0 disables pacing)
+    - QUOTA_MAX_QUEUE: Upstream calls that may wait for quota at the same time, per API
+    - QUOTA_MAX_QUEUE_PER_TENANT: Upstream calls of one tenant that may wait for quota at the same time, per API
+    - QUOTA_MAX_WAIT_SECONDS: Longest expected wait for quota before a request is rejected with 429
+    - QUOTA_TENANT_HEADER: Request header identifying the tenant (API key) for fair queuing
+    - QUOTA_TENANT_WEIGHTS: JSON object of quota shares by tenant (default share 1)
+    - TRANSLATE_DEADLINE_SECONDS: Deadline of a translation or detection request, shared by its upstream calls
+    - TTS_DEADLINE_SECONDS: Deadline of a synthesis request (until the first chunk when streaming)
+    - STT_DEADLINE_SECONDS: Deadline of a transcription upload request
+    - PIPELINE_DEADLINE_SECONDS: Deadline of a whole speech-to-speech pipeline request
+    - RPC_MAX_ATTEMPTS: Attempts of an upstream call failing with a transient error (1 disables retries)
+    - RPC_RETRY_BASE_DELAY_MS: Backoff before the first retry; doubles with every attempt, fully jittered
+    - RPC_RETRY_MAX_DELAY_MS: Upper bound of the retry backoff
+    - RETRY_BUDGET_RATIO: Retries and hedges allowed per upstream call, across all APIs
+    - RETRY_BUDGET_MIN_PER_SECOND: Retries and hedges always allowed per second regardless of traffic
+    - RPC_HEDGING_ENABLED: Send a second copy of slow idempotent calls and use the first reply
+    - RPC_HEDGE_PERCENTILE: Latency percentile of recent calls after which a hedge is sent
+    - RPC_HEDGE_MIN_DELAY_MS: Lower bound of the hedging delay
+    - CIRCUIT_BREAKER_ENABLED: Fail fast, or serve stale results, while an API is failing
+    - CIRCUIT_WINDOW_CALLS: Recent calls per API whose outcome decides whether its breaker opens
+    - CIRCUIT_MIN_CALLS: Calls in the window before the breaker may open
+    - CIRCUIT_FAILURE_RATE: Share of failed calls in the window that opens the breaker
+    - CIRCUIT_SLOW_CALL_RATE: Share of slow calls in the window that opens the breaker
+    - CIRCUIT_SLOW_CALL_SECONDS: Duration above which a Translation or Text-to-Speech call is slow
+    - STT_CIRCUIT_SLOW_CALL_SECONDS: Duration above which a Speech-to-Text call is slow
+    - CIRCUIT_OPEN_SECONDS: Seconds an open breaker fails fast before letting trial calls through
+    - CIRCUIT_HALF_OPEN_CALLS: Successful trial calls that close the breaker again
+    - METRICS_ENABLED: Record per-route request metrics for /metrics
+    - TRANSLATION_REGIONS: Comma-separated Translation API locations, each optionally '=endpoint'
+    - STT_REGIONS: Comma-separated Speech-to-Text API locations, each optionally '=endpoint'
+    - REGION_EWMA_ALPHA: Weight of the newest call in the per-region latency and error rate averages
+    - REGION_EJECT_ERROR_RATE: Error rate average at which a region stops receiving calls
+    - REGION_EJECT_SECONDS: Seconds an ejected region receives no calls
+    - REGION_PROBE_RATIO: Share of calls sent to another region to keep its latency measured
+    - ADMIN_TOKEN: Bearer token of the admin API; the admin API is disabled when empty
+    - PROFILER_MAX_SECONDS: Longest sampling profile the admin API runs
+    - SLOW_REQUEST_THRESHOLD_MS: Duration above which requests are recorded in the slow request log (0 to disable)
+    - SLOW_REQUEST_BUFFER_SIZE: Number of slow requests kept
     """
 
 from pydantic_settings import BaseSettings
@@ -31,6 +110,85 @@ class Settings(BaseSettings):
         VERSION (str): Current API version
         GOOGLE_PROJECT_ID (str): Google Cloud project identifier
         GOOGLE_APPLICATION_CREDENTIALS (str): Path to the Google Cloud service account key file
+        CLIENT_WARMUP_TIMEOUT (float): Seconds to wait for each upstream channel to connect at startup
+        AUTH_TOKEN_REFRESH_MARGIN_SECONDS (float): Seconds before expiry at which the access token is refreshed
+        AUTH_TOKEN_REFRESH_RETRY_SECONDS (float): Seconds to wait before retrying a failed token refresh
+        TRANSLATION_CACHE_MAX_BYTES (int): Memory budget of the translation result cache
+        DETECTION_CACHE_MAX_BYTES (int): Memory budget of the language detection cache
+        RESULT_CACHE_TTL_SECONDS (float): Seconds a cached translation or detection stays fresh
+        TRANSLATION_MEMORY_PATH (str): SQLite file of the persistent translation memory
+        TRANSLATION_MEMORY_FUZZY_THRESHOLD (float): Minimum similarity of a near-duplicate segment
+        TRANSLATION_MEMORY_SERVE_FUZZY (bool): Serve near-duplicates instead of only flagging them
+        TRANSLATION_BATCH_MAX_SEGMENTS (int): Maximum segments per upstream TranslateText request
+        TRANSLATION_BATCH_MAX_CODEPOINTS (int): Maximum codepoints per upstream TranslateText request
+        TRANSLATION_BATCH_CONCURRENCY (int): Upstream requests a single batch may have in flight
+        TRANSLATION_COALESCE_ENABLED (bool): Merge concurrent /translate calls into multi-segment requests
+        TRANSLATION_COALESCE_WINDOW_MS (float): Milliseconds to collect concurrent calls before sending
+        TRANSLATION_COALESCE_MAX_SEGMENTS (int): Number of collected calls that triggers an immediate send
+        LOCAL_LANGUAGE_ID_ENABLED (bool): Answer /detect-language locally when the local model is confident
+        LOCAL_LANGUAGE_ID_THRESHOLD (float): Minimum local confidence needed to skip the API
+        LOCAL_LANGUAGE_ID_FOR_TRANSLATE (bool): Use the local model to fill in a missing source language
+        TTS_AUDIO_CACHE_DIR (str): Directory of the synthesized audio store
+        TTS_AUDIO_CACHE_MAX_BYTES (int): Disk budget of the synthesized audio store
+        TTS_STREAM_CHUNK_BYTES (int): Maximum UTF-8 size of each chunk of streamed synthesis
+        TTS_STREAM_FIRST_CHUNK_BYTES (int): Maximum UTF-8 size of the first chunk of streamed synthesis
+        TTS_STREAM_CONCURRENCY (int): Chunks of one streamed synthesis sent to the API at the same time
+        STT_MAX_UPLOAD_BYTES (int): Largest audio upload accepted by the speech-to-text endpoints
+        STT_UPLOAD_SPOOL_BYTES (int): Size above which an audio upload is buffered on disk instead of in memory
+        STT_LONG_AUDIO_CHUNK_SECONDS (float): Longest chunk of a long recording sent in one request
+        STT_LONG_AUDIO_SPLIT_WINDOW_SECONDS (float): How far before the chunk limit a long recording may be cut
+        STT_LONG_AUDIO_CONCURRENCY (int): Chunks of one long recording transcribed at the same time
+        STT_JOBS_DB_PATH (str): SQLite file of the batch transcription job table
+        STT_JOBS_MAX_CONCURRENCY (int): Batch transcription jobs running at the same time
+        STT_JOBS_MAX_PER_PROJECT (int): Batch transcription jobs running at the same time per project
+        STT_JOBS_POLL_INITIAL_SECONDS (float): First delay between polls of a batch operation
+        STT_JOBS_POLL_MAX_SECONDS (float): Longest delay between polls of a batch operation
+        STT_JOBS_LEASE_SECONDS (float): How long a process owns a job before another may take it over
+        STT_JOBS_MAX_POLL_ERRORS (int): Consecutive failed polls after which a batch job is marked failed
+        STT_STREAM_ROLLOVER_SECONDS (float): Seconds after which a live recognition stream is restarted upstream
+        STT_STREAM_MAX_SESSION_SECONDS (float): Longest live recognition session on one WebSocket
+        STT_STREAM_QUEUE_FRAMES (int): Audio frames buffered per session before the socket stops being read
+        PIPELINE_TRANSLATE_CONCURRENCY (int): Transcript segments of one pipeline request translated at the same time
+        TRANSLATION_QUOTA_CHARS_PER_MINUTE (int): Translation API quota in characters per minute
+        TTS_QUOTA_CHARS_PER_MINUTE (int): Text-to-Speech API quota in characters per minute
+        STT_QUOTA_AUDIO_SECONDS_PER_MINUTE (float): Speech-to-Text API quota in audio seconds per minute
+        QUOTA_MAX_QUEUE (int): Upstream calls that may wait for quota at the same time, per API
+        QUOTA_MAX_QUEUE_PER_TENANT (int): Upstream calls of one tenant that may wait for quota at the same time
+        QUOTA_MAX_WAIT_SECONDS (float): Longest expected wait for quota before a request is rejected
+        QUOTA_TENANT_HEADER (str): Request header identifying the tenant for fair queuing
+        QUOTA_TENANT_WEIGHTS (dict): Quota shares by tenant
+        TRANSLATE_DEADLINE_SECONDS (float): Deadline of a translation or detection request
+        TTS_DEADLINE_SECONDS (float): Deadline of a synthesis request
+        STT_DEADLINE_SECONDS (float): Deadline of a transcription upload request
+        PIPELINE_DEADLINE_SECONDS (float): Deadline of a speech-to-speech pipeline request
+        RPC_MAX_ATTEMPTS (int): Attempts of an upstream call failing with a transient error
+        RPC_RETRY_BASE_DELAY_MS (float): Backoff before the first retry
+        RPC_RETRY_MAX_DELAY_MS (float): Upper bound of the retry backoff
+        RETRY_BUDGET_RATIO (float): Retries and hedges allowed per upstream call
+        RETRY_BUDGET_MIN_PER_SECOND (float): Retries and hedges always allowed per second
+        RPC_HEDGING_ENABLED (bool): Whether slow idempotent calls are hedged
+        RPC_HEDGE_PERCENTILE (float): Latency percentile after which a hedge is sent
+        RPC_HEDGE_MIN_DELAY_MS (float): Lower bound of the hedging delay
+        CIRCUIT_BREAKER_ENABLED (bool): Whether failing APIs are short-circuited
+        CIRCUIT_WINDOW_CALLS (int): Recent calls per API considered by its breaker
+        CIRCUIT_MIN_CALLS (int): Calls in the window before the breaker may open
+        CIRCUIT_FAILURE_RATE (float): Share of failed calls that opens the breaker
+        CIRCUIT_SLOW_CALL_RATE (float): Share of slow calls that opens the breaker
+        CIRCUIT_SLOW_CALL_SECONDS (float): Duration above which a Translation or Text-to-Speech call is slow
+        STT_CIRCUIT_SLOW_CALL_SECONDS (float): Duration above which a Speech-to-Text call is slow
+        CIRCUIT_OPEN_SECONDS (float): Seconds an open breaker fails fast
+        CIRCUIT_HALF_OPEN_CALLS (int): Successful trial calls that close the breaker
+        METRICS_ENABLED (bool): Whether per-route request metrics are recorded
+        TRANSLATION_REGIONS (str): Translation API locations ('location[=endpoint],...')
+        STT_REGIONS (str): Speech-to-Text API locations ('location[=endpoint],...')
+        REGION_EWMA_ALPHA (float): Weight of the newest call in the per-region averages
+        REGION_EJECT_ERROR_RATE (float): Error rate average at which a region is ejected
+        REGION_EJECT_SECONDS (float): Seconds an ejected region receives no calls
+        REGION_PROBE_RATIO (float): Share of calls sent to another region to measure it
+        ADMIN_TOKEN (str): Bearer token of the admin API; empty disables it
+        PROFILER_MAX_SECONDS (float): Longest sampling profile the admin API runs
+        SLOW_REQUEST_THRESHOLD_MS (float): Duration above which requests are recorded as slow
+        SLOW_REQUEST_BUFFER_SIZE (int): Number of slow requests kept
     
     Note:
         All settings can be overridden through environment variables.
@@ -45,6 +203,122 @@ class Settings(BaseSettings):
     GOOGLE_PROJECT_ID: str
     GOOGLE_APPLICATION_CREDENTIALS: str
     
+    # Upstream client settings
+    CLIENT_WARMUP_TIMEOUT: float = 5.0
+
+    # Credential refresh settings; the margin must exceed the 225 s before expiry
+    # at which google-auth itself refreshes the token on the request path
+    AUTH_TOKEN_REFRESH_MARGIN_SECONDS: float = 600.0
+    AUTH_TOKEN_REFRESH_RETRY_SECONDS: float = 10.0
+    
+    # Result cache settings
+    TRANSLATION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    DETECTION_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    RESULT_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+    
+    # Translation memory settings
+    TRANSLATION_MEMORY_PATH: str = ""
+    TRANSLATION_MEMORY_FUZZY_THRESHOLD: float = 0.0
+    TRANSLATION_MEMORY_SERVE_FUZZY: bool = False
+    
+    # Batch translation settings
+    TRANSLATION_BATCH_MAX_SEGMENTS: int = 1024
+    TRANSLATION_BATCH_MAX_CODEPOINTS: int = 30000
+    TRANSLATION_BATCH_CONCURRENCY: int = 8
+    TRANSLATION_COALESCE_ENABLED: bool = False
+    TRANSLATION_COALESCE_WINDOW_MS: float = 5.0
+    TRANSLATION_COALESCE_MAX_SEGMENTS: int = 64
+    
+    # Local language identification settings
+    LOCAL_LANGUAGE_ID_ENABLED: bool = False
+    LOCAL_LANGUAGE_ID_THRESHOLD: float = 0.95
+    LOCAL_LANGUAGE_ID_FOR_TRANSLATE: bool = False
+    
+    # Text-to-Speech settings
+    TTS_AUDIO_CACHE_DIR: str = "/tmp/gtranslate/tts-audio"
+    TTS_AUDIO_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    TTS_STREAM_CHUNK_BYTES: int = 1500
+    TTS_STREAM_FIRST_CHUNK_BYTES: int = 300
+    TTS_STREAM_CONCURRENCY: int = 4
+    
+    # Speech-to-Text upload settings
+    STT_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    STT_UPLOAD_SPOOL_BYTES: int = 1024 * 1024
+    
+    # Speech-to-Text long audio settings
+    STT_LONG_AUDIO_CHUNK_SECONDS: float = 50.0
+    STT_LONG_AUDIO_SPLIT_WINDOW_SECONDS: float = 15.0
+    STT_LONG_AUDIO_CONCURRENCY: int = 8
+    
+    # Speech-to-Text batch job settings
+    STT_JOBS_DB_PATH: str = ""
+    STT_JOBS_MAX_CONCURRENCY: int = 16
+    STT_JOBS_MAX_PER_PROJECT: int = 4
+    STT_JOBS_POLL_INITIAL_SECONDS: float = 2.0
+    STT_JOBS_POLL_MAX_SECONDS: float = 60.0
+    STT_JOBS_LEASE_SECONDS: float = 180.0
+    STT_JOBS_MAX_POLL_ERRORS: int = 10
+    
+    # Speech-to-Text streaming settings
+    STT_STREAM_ROLLOVER_SECONDS: float = 240.0
+    STT_STREAM_MAX_SESSION_SECONDS: float = 60 * 60
+    STT_STREAM_QUEUE_FRAMES: int = 32
+    
+    # Speech-to-speech pipeline settings
+    PIPELINE_TRANSLATE_CONCURRENCY: int = 4
+    
+    # Upstream quota settings
+    TRANSLATION_QUOTA_CHARS_PER_MINUTE: int = 0
+    TTS_QUOTA_CHARS_PER_MINUTE: int = 0
+    STT_QUOTA_AUDIO_SECONDS_PER_MINUTE: float = 0.0
+    QUOTA_MAX_QUEUE: int = 1000
+    QUOTA_MAX_QUEUE_PER_TENANT: int = 100
+    QUOTA_MAX_WAIT_SECONDS: float = 10.0
+    QUOTA_TENANT_HEADER: str = "X-API-Key"
+    QUOTA_TENANT_WEIGHTS: dict[str, float] = {}
+    
+    # Upstream deadline, retry and hedging settings
+    TRANSLATE_DEADLINE_SECONDS: float = 10.0
+    TTS_DEADLINE_SECONDS: float = 30.0
+    STT_DEADLINE_SECONDS: float = 120.0
+    PIPELINE_DEADLINE_SECONDS: float = 600.0
+    RPC_MAX_ATTEMPTS: int = 3
+    RPC_RETRY_BASE_DELAY_MS: float = 50.0
+    RPC_RETRY_MAX_DELAY_MS: float = 1000.0
+    RETRY_BUDGET_RATIO: float = 0.1
+    RETRY_BUDGET_MIN_PER_SECOND: float = 10.0
+    RPC_HEDGING_ENABLED: bool = False
+    RPC_HEDGE_PERCENTILE: float = 95.0
+    RPC_HEDGE_MIN_DELAY_MS: float = 10.0
+    
+    # Circuit breaker settings
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_WINDOW_CALLS: int = 50
+    CIRCUIT_MIN_CALLS: int = 10
+    CIRCUIT_FAILURE_RATE: float = 0.5
+    CIRCUIT_SLOW_CALL_RATE: float = 0.8
+    CIRCUIT_SLOW_CALL_SECONDS: float = 5.0
+    STT_CIRCUIT_SLOW_CALL_SECONDS: float = 30.0
+    CIRCUIT_OPEN_SECONDS: float = 30.0
+    CIRCUIT_HALF_OPEN_CALLS: int = 3
+    
+    # Metrics settings
+    METRICS_ENABLED: bool = True
+    
+    # Multi-region routing settings
+    TRANSLATION_REGIONS: str = "global"
+    STT_REGIONS: str = "global"
+    REGION_EWMA_ALPHA: float = 0.2
+    REGION_EJECT_ERROR_RATE: float = 0.5
+    REGION_EJECT_SECONDS: float = 30.0
+    REGION_PROBE_RATIO: float = 0.05
+    
+    # Diagnostics settings
+    ADMIN_TOKEN: str = ""
+    PROFILER_MAX_SECONDS: float = 60.0
+    SLOW_REQUEST_THRESHOLD_MS: float = 1000.0
+    SLOW_REQUEST_BUFFER_SIZE: int = 200
+    
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -60,3 +60,49 @@ class ValidationError(Exception):
     - Format violations
     """
     pass
+
+class QuotaExceededError(Exception):
+    """
+    Upstream Quota Exception
+    
+    Raised when a request cannot be sent to a Google Cloud API without exceeding
+    its quota. This could be due to:
+    - The local quota scheduler's queue for the API being full
+    - The expected wait for quota exceeding the allowed wait
+    - The API itself rejecting the request with RESOURCE_EXHAUSTED
+    
+    Attributes:
+        retry_after (float): Seconds after which the request is likely to be admitted
+    """
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class DeadlineExceededError(Exception):
+    """
+    Request Deadline Exception
+    
+    Raised when a request's deadline passes before its upstream calls complete.
+    This could be due to:
+    - A slow or overloaded Google Cloud API
+    - Retries of transient errors using up the remaining time
+    - A request too large to be served within its endpoint's deadline
+    """
+    pass
+
+class UpstreamUnavailableError(Exception):
+    """
+    Upstream Outage Exception
+    
+    Raised without calling a Google Cloud API while its circuit breaker is open.
+    This could be due to:
+    - Most recent calls to the API failing with server errors or deadlines
+    - Most recent calls to the API being slower than allowed
+    - The trial calls made after the breaker opened failing as well
+    
+    Attributes:
+        retry_after (float): Seconds until the breaker lets a trial call through
+    """
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,267 @@
+"""
+Application Metrics
+
+This module keeps the application's metrics in memory and renders them in the
+Prometheus text exposition format for the /metrics endpoint.
+
+Counters, gauges and histograms are plain Python numbers updated from the event
+loop, so recording a sample takes no lock and costs a dictionary lookup and, for
+histograms, a binary search over the bucket bounds. Children per label set are
+created on first use; label values must come from a small, fixed set (route
+templates, method names, status codes) to keep the number of series bounded.
+
+Counters kept by the service layer itself (caches, batching, quota, circuit
+breakers) are not duplicated here; render_stats turns their stats() at scrape time.
+
+Dependencies:
+    - bisect: For locating histogram buckets
+"""
+
+import math
+from bisect import bisect_left
+
+# Request and upstream call latency, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Payload sizes in bytes, from a short text to a long recording
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+# Text lengths in characters
+CHARS_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        REGISTRY.append(self)
+
+    def labels(self, *values):
+        """
+        Return the child for a set of label values, creating it on first use.
+
+        Args:
+            *values: One value per label name, in order
+
+        Returns:
+            The child recording samples for these label values
+        """
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple, child) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """
+    Counter Class
+
+    A monotonically increasing count per label set. Call labels(...).inc().
+
+    Attributes:
+        name (str): Metric name, ending in _total by convention
+        documentation (str): Help text
+        labelnames (tuple): Names of the labels
+    """
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class Gauge(_Metric):
+    """
+    Gauge Class
+
+    A value per label set that can go up and down. Call labels(...).inc(), dec() or set().
+
+    Attributes:
+        name (str): Metric name
+        documentation (str): Help text
+        labelnames (tuple): Names of the labels
+    """
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        # One count per bucket plus +Inf, not cumulative until rendered
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """
+    Histogram Class
+
+    Distribution of observed values per label set over fixed buckets.
+    Call labels(...).observe(value).
+
+    Attributes:
+        name (str): Metric name
+        documentation (str): Help text
+        labelnames (tuple): Names of the labels
+        buckets (tuple): Upper bounds of the buckets, in increasing order
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, values: tuple, child: _HistogramChild) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), list(child.counts)):
+            cumulative += count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request, including streamed bodies",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being handled"
+)
+HTTP_REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "Size of HTTP request bodies", ("route",), BYTES_BUCKETS
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Size of HTTP response bodies", ("route",), BYTES_BUCKETS
+)
+WEBSOCKET_SESSIONS = Gauge(
+    "websocket_sessions_in_flight", "Open WebSocket sessions", ("route",)
+)
+TEXT_CHARS = Histogram(
+    "text_chars", "Characters of text submitted per request", ("operation",), CHARS_BUCKETS
+)
+AUDIO_BYTES = Histogram(
+    "audio_bytes", "Bytes of audio submitted or produced per request", ("operation",), BYTES_BUCKETS
+)
+UPSTREAM_RPCS = Counter(
+    "upstream_rpcs_total", "Google Cloud API calls, including retries and hedges", ("method", "status")
+)
+UPSTREAM_RPC_DURATION = Histogram(
+    "upstream_rpc_duration_seconds", "Latency of Google Cloud API calls", ("method",)
+)
+CREDENTIAL_REFRESHES = Counter(
+    "credential_refreshes_total", "Google Cloud access token refreshes", ("status",)
+)
+CREDENTIAL_REFRESH_DURATION = Histogram(
+    "credential_refresh_duration_seconds", "Latency of Google Cloud access token refreshes"
+)
+
+
+def render() -> str:
+    """
+    Render every registered metric in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition text
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def render_stats(stats: dict[str, dict]) -> str:
+    """
+    Render the counters of the service layer in the Prometheus text format.
+
+    Every numeric entry becomes an untyped sample named <component>_<key>; text
+    entries (e.g. a circuit breaker's state) become a sample of 1 labelled with
+    the text. Other entries are skipped.
+
+    Args:
+        stats (dict): stats() of each component by component name
+
+    Returns:
+        str: The exposition text
+    """
+    lines = []
+    for component, values in stats.items():
+        for key, value in values.items():
+            name = f"{component}_{key}"
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                lines.append(f"# TYPE {name} untyped")
+                lines.append(f"{name} {_format_value(value)}")
+            elif isinstance(value, str):
+                lines.append(f"# TYPE {name} untyped")
+                lines.append(f'{name}{{{key}="{_escape(value)}"}} 1')
+    return "\n".join(lines) + "\n" if lines else ""
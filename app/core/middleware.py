@@ -0,0 +1,189 @@
+"""
+Application Middleware
+
+This module defines the ASGI middleware used by the application.
+
+TenantMiddleware identifies the tenant (API key) of every HTTP request and
+WebSocket session from the QUOTA_TENANT_HEADER request header and exposes it to
+the service layer through the current_tenant context variable. Tasks started
+while handling the request inherit the variable, so upstream calls made on a
+request's behalf are scheduled as that tenant's.
+
+MetricsMiddleware records the latency, status, body sizes and concurrency of
+every HTTP request, labelled by route template, and the number of open
+WebSocket sessions.
+
+SlowRequestMiddleware times every HTTP request and keeps the phase breakdown
+(see core.profiling) of those slower than SLOW_REQUEST_THRESHOLD_MS in the slow
+request log served by the admin API.
+
+Dependencies:
+    - Settings from core.config for the tenant header name
+    - core.metrics for recording request metrics
+    - core.profiling for request phase timings and the slow request log
+"""
+
+import time
+from contextvars import ContextVar
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.profiling import RequestTimings, current_timings, slow_request_entry, slow_requests
+
+DEFAULT_TENANT = "default"
+
+current_tenant: ContextVar[str] = ContextVar("current_tenant", default=DEFAULT_TENANT)
+
+
+class TenantMiddleware:
+    """
+    Tenant Middleware Class
+
+    Pure ASGI middleware that sets current_tenant for the duration of each
+    HTTP request or WebSocket session.
+
+    Attributes:
+        app: The wrapped ASGI application
+        header (bytes): Lower-cased name of the request header carrying the tenant
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.QUOTA_TENANT_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        tenant = DEFAULT_TENANT
+        for name, value in scope["headers"]:
+            if name == self.header and value:
+                tenant = value.decode("latin-1")
+                break
+        token = current_tenant.set(tenant)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tenant.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Metrics Middleware Class
+
+    Pure ASGI middleware that records request metrics. Requests are labelled by
+    the template of the route that handled them (e.g. /api/tts/audio/{audio_id}),
+    or 'unmatched', so the number of series stays bounded.
+
+    Attributes:
+        app: The wrapped ASGI application
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        received = 0
+        sent = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        metrics.HTTP_REQUESTS_IN_FLIGHT.labels().inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            duration = time.perf_counter() - start
+            metrics.HTTP_REQUESTS_IN_FLIGHT.labels().dec()
+            route = _route(scope)
+            method = scope["method"]
+            metrics.HTTP_REQUESTS.labels(method, route, status).inc()
+            metrics.HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+            metrics.HTTP_REQUEST_SIZE.labels(route).observe(received)
+            metrics.HTTP_RESPONSE_SIZE.labels(route).observe(sent)
+
+    async def _websocket(self, scope, receive, send):
+        gauge = None
+
+        async def tracking_receive():
+            nonlocal gauge
+            message = await receive()
+            if gauge is None and message["type"] == "websocket.connect":
+                # The route is known once the router has passed the scope on
+                gauge = metrics.WEBSOCKET_SESSIONS.labels(_route(scope))
+                gauge.inc()
+            return message
+
+        try:
+            await self.app(scope, tracking_receive, send)
+        finally:
+            if gauge is not None:
+                gauge.dec()
+
+
+def _route(scope) -> str:
+    """
+    Return the template of the route that matched a request, or 'unmatched'.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class SlowRequestMiddleware:
+    """
+    Slow Request Middleware Class
+
+    Pure ASGI middleware that times the phases of each HTTP request and records
+    the requests slower than the threshold of the slow request log. The total
+    includes sending streamed bodies.
+
+    Attributes:
+        app: The wrapped ASGI application
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def status_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            await self.app(scope, receive, status_send)
+        finally:
+            current_timings.reset(token)
+            end = time.perf_counter()
+            if (end - timings.start) * 1000 >= slow_requests.threshold_ms:
+                slow_requests.record(slow_request_entry(scope, status, timings, end))
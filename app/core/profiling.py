@@ -0,0 +1,316 @@
+"""
+Profiling Module
+
+This module provides the tools behind the admin diagnostics endpoints.
+
+Sampling profiler: sample_stacks() records the Python stack of the event loop
+thread (or of every thread) at a fixed interval from a background thread, using
+sys._current_frames(), and collapse_stacks() renders the counts in the collapsed
+format read by flamegraph.pl, speedscope and similar tools. Sampling only reads
+frames, so the request path is not instrumented and pays nothing while no
+profile is running.
+
+Slow-request capture: TimedRoute marks where FastAPI's request handling moves
+from reading and parsing the body to validating it, running the endpoint and
+serializing its result. The marks are written to the RequestTimings of the
+current request, created by SlowRequestMiddleware, which keeps the phase
+breakdown of every request slower than SLOW_REQUEST_THRESHOLD_MS in a bounded
+SlowRequestLog.
+
+Dependencies:
+    - FastAPI/Starlette for the timed route and request classes
+    - Settings from core.config for the slow-request threshold and buffer size
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from app.core.config import settings
+
+# Phases of a request, in order, and the mark that ends each of them
+_PHASES = (
+    ("receive", "received"),
+    ("parse", "parsed"),
+    ("validate", "endpoint_started"),
+    ("service", "endpoint_finished"),
+    ("serialize", "handler_finished"),
+)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class RequestTimings:
+    """
+    Request Timings Class
+
+    Points in time reached while handling one request.
+
+    Attributes:
+        start (float): perf_counter() when the request arrived
+        marks (dict): perf_counter() of each phase boundary reached, by name
+    """
+    __slots__ = ("start", "marks")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """
+        Record that a phase boundary was reached now.
+
+        Args:
+            name (str): Name of the boundary
+        """
+        self.marks[name] = time.perf_counter()
+
+    def phases(self, end: float) -> dict[str, float]:
+        """
+        Split the request's duration into phases.
+
+        Phases whose boundary was not reached (e.g. parse for a request without
+        a body) take no time. Whatever follows the handler, such as sending a
+        streamed body, is reported as 'respond'.
+
+        Args:
+            end (float): perf_counter() when the response was sent
+
+        Returns:
+            dict: Milliseconds spent in each phase
+        """
+        phases = {}
+        previous = self.start
+        for phase, boundary in _PHASES:
+            reached = self.marks.get(boundary, previous)
+            phases[phase] = round((reached - previous) * 1000, 3)
+            previous = reached
+        phases["respond"] = round((end - previous) * 1000, 3)
+        return phases
+
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar("current_timings", default=None)
+
+
+class SlowRequestLog:
+    """
+    Slow Request Log Class
+
+    A ring buffer of the most recent requests slower than a threshold.
+
+    Attributes:
+        threshold_ms (float): Duration above which a request is recorded
+        size (int): Number of requests kept
+        recorded (int): Number of slow requests seen, including those dropped since
+    """
+
+    def __init__(self, threshold_ms: float, size: int):
+        """
+        Initialize an empty log.
+
+        Args:
+            threshold_ms (float): Duration above which a request is recorded
+            size (int): Number of requests kept
+        """
+        self.threshold_ms = threshold_ms
+        self.size = size
+        self.recorded = 0
+        self._entries: deque[dict] = deque(maxlen=max(1, size))
+
+    def record(self, entry: dict) -> None:
+        """
+        Add a slow request, dropping the oldest one if the log is full.
+
+        Args:
+            entry (dict): Description and phase breakdown of the request
+        """
+        self.recorded += 1
+        self._entries.append(entry)
+
+    def recent(self, limit: int) -> list[dict]:
+        """
+        Return the most recent slow requests, newest first.
+
+        Args:
+            limit (int): Most entries to return
+
+        Returns:
+            list[dict]: The entries
+        """
+        entries = list(self._entries)
+        entries.reverse()
+        return entries[:limit]
+
+
+slow_requests = SlowRequestLog(settings.SLOW_REQUEST_THRESHOLD_MS, settings.SLOW_REQUEST_BUFFER_SIZE)
+
+
+def slow_request_entry(scope, status: int, timings: RequestTimings, end: float) -> dict:
+    """
+    Describe a finished request for the slow request log.
+
+    Args:
+        scope: The ASGI scope of the request
+        status (int): Response status code
+        timings (RequestTimings): The request's phase boundaries
+        end (float): perf_counter() when the response was sent
+
+    Returns:
+        dict: method, path, route, status, startedAt, totalMs and phases
+    """
+    route = scope.get("route")
+    total = end - timings.start
+    return {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": getattr(route, "path", None),
+        "status": status,
+        "startedAt": datetime.now(timezone.utc) - timedelta(seconds=total),
+        "totalMs": round(total * 1000, 3),
+        "phases": timings.phases(end),
+    }
+
+
+class _TimedRequest(Request):
+    """
+    Request whose body reading and decoding mark the receive and parse phases.
+    """
+
+    async def body(self) -> bytes:
+        cached = hasattr(self, "_body")
+        body = await super().body()
+        if not cached:
+            _mark("received")
+        return body
+
+    async def json(self):
+        cached = hasattr(self, "_json")
+        result = await super().json()
+        if not cached:
+            _mark("parsed")
+        return result
+
+    async def form(self, *args, **kwargs):
+        form = await super().form(*args, **kwargs)
+        _mark("received")
+        _mark("parsed")
+        return form
+
+
+def _mark(name: str) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.mark(name)
+
+
+class TimedRoute(APIRoute):
+    """
+    Timed Route Class
+
+    API route that marks the phases of its requests in the current RequestTimings:
+    reading the body, parsing it, validating the parameters (including dependency
+    injection), running the endpoint and serializing the response. Requests pay
+    a few dictionary writes; nothing is recorded outside SlowRequestMiddleware.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            if current_timings.get() is None:
+                return await handler(request)
+            response = await handler(_TimedRequest(request.scope, request.receive, request._send))
+            _mark("handler_finished")
+            return response
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint):
+    """
+    Wrap an async endpoint so its start and end are marked. The wrapper keeps the
+    endpoint's signature, which FastAPI reads to resolve its parameters.
+    """
+    @functools.wraps(endpoint)
+    async def timed(*args, **kwargs):
+        _mark("endpoint_started")
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            _mark("endpoint_finished")
+
+    return timed
+
+
+def _frame_label(code, labels: dict) -> str:
+    label = labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(_ROOT):
+            filename = os.path.relpath(filename, _ROOT)
+        else:
+            filename = os.path.basename(filename)
+        label = labels[code] = f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+def sample_stacks(seconds: float, interval: float, thread_ids: set[int] | None = None) -> Counter:
+    """
+    Sample the Python stacks of running threads.
+
+    Meant to run in a worker thread (e.g. through asyncio.to_thread) so the
+    sampled threads, including the event loop's, keep running meanwhile.
+
+    Args:
+        seconds (float): How long to sample
+        interval (float): Seconds between samples
+        thread_ids (set, optional): Threads to sample; all threads but the sampling one when None
+
+    Returns:
+        Counter: Number of samples per collapsed stack, root first and frames
+                 separated by ';'
+    """
+    me = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    labels: dict = {}
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me or (thread_ids is not None and ident not in thread_ids):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code, labels))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            stack.reverse()
+            counts[";".join(stack)] += 1
+        time.sleep(interval)
+    return counts
+
+
+def collapse_stacks(counts: Counter) -> str:
+    """
+    Render stack samples in the collapsed format of flamegraph.pl.
+
+    Args:
+        counts (Counter): Number of samples per collapsed stack
+
+    Returns:
+        str: One 'frame;frame;frame count' line per stack, most sampled first
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
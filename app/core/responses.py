@@ -0,0 +1,89 @@
+"""
+Response Serialization Module
+
+This module provides the response class of the hot JSON endpoints and the
+streaming response of the endpoints that stream audio.
+
+A model returned from an endpoint with a response_model is processed by FastAPI
+three more times after the endpoint built it: it is dumped to a dict, that dict
+is validated into a new model, and the result is converted to JSON-compatible
+data that the standard library json module then encodes. ModelResponse validates
+the service output once and encodes it straight to bytes with the model's
+compiled pydantic-core serializer. FastAPI passes a returned Response through
+unchanged, while the response_model still documents the endpoint in OpenAPI.
+
+When a client disconnects, Starlette cancels the task sending a StreamingResponse
+but leaves its body generator suspended, so the work behind it keeps running
+until the generator is garbage-collected. ClosingStreamingResponse closes the
+generator as soon as the response is done.
+
+Dependencies:
+    - pydantic: For the models' compiled validators and serializers
+    - Starlette Response and StreamingResponse as the base classes
+"""
+
+from typing import Any, Mapping
+
+from pydantic import BaseModel
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class ModelResponse(Response):
+    """
+    Model Response Class
+
+    A JSON response holding service output validated by a response model.
+    Headers normally set on the injected Response (e.g. Warning) must be passed
+    in, since FastAPI does not merge them into a returned response.
+
+    Attributes:
+        media_type (str): Always application/json
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        content: Mapping[str, Any] | BaseModel,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ):
+        """
+        Validate the content against the model and serialize it.
+
+        Args:
+            model (type[BaseModel]): The response model of the endpoint
+            content (dict | BaseModel): The service output, or an instance of the model
+                                        (used as is)
+            status_code (int, optional): HTTP status code
+            headers (dict, optional): Extra response headers
+
+        Raises:
+            pydantic.ValidationError: If the content does not match the model
+        """
+        instance = content if isinstance(content, model) else model.model_validate(content)
+        super().__init__(
+            instance.__pydantic_serializer__.to_json(instance),
+            status_code=status_code,
+            headers=headers,
+        )
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    Closing Streaming Response Class
+
+    A streaming response that closes its async generator once the body is sent,
+    the client disconnects or sending fails, so the generator's cleanup (e.g.
+    cancelling the chunks still being produced) runs right away.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Outside the cancelled task group, so the cleanup itself is not cancelled
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
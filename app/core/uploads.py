@@ -0,0 +1,45 @@
+"""
+Upload Limits Module
+
+This module provides the request body size check shared by the endpoints that
+accept audio uploads. The declared Content-Length is checked up front, and the
+bytes actually received are counted while the body is read, so a request that
+lies about its length or streams without one is still cut off at the limit.
+
+Dependencies:
+    - FastAPI/Starlette Request and HTTPException
+"""
+
+from fastapi import HTTPException, Request
+
+
+def limit_body(request: Request, limit: int) -> Request:
+    """
+    Wrap a request so that reading more than `limit` body bytes fails with 413.
+
+    Args:
+        request (Request): The incoming request
+        limit (int): Maximum number of body bytes
+
+    Returns:
+        Request: A request reading the same body through the size check
+
+    Raises:
+        HTTPException: (413) If the declared Content-Length is already over the limit
+    """
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail="Audio upload too large")
+
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(status_code=413, detail="Audio upload too large")
+        return message
+
+    return Request(request.scope, receive)
@@ -6,24 +6,81 @@ application, configures middleware, and sets up routing for all API endpoints. T
 translation capabilities along with Text-to-Speech (TTS) and Speech-to-Text (STT) functionalities.
 
 The application is configured with CORS middleware to handle cross-origin requests and provides
-OpenAPI documentation at the /docs endpoint.
+OpenAPI documentation at the /docs endpoint. Upstream service clients are created once per worker
+in the background once the server is listening, so /health answers while the client libraries
+are still loading, and are shared by all requests. Calls to the Google APIs are paced
+within their quotas per tenant; requests that cannot be admitted in time are answered with
+429 and a Retry-After header. Request, payload and upstream call metrics are exposed
+in the Prometheus text format at /metrics. Requests slower than SLOW_REQUEST_THRESHOLD_MS
+are recorded with a per-phase timing breakdown for the admin API.
 
 Environment Variables:
     All configuration is handled through the settings module (see core.config)
 """
 
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.core import metrics
 from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
+from app.core.middleware import MetricsMiddleware, SlowRequestMiddleware, TenantMiddleware
 from app.api.v1.router import api_router
+from app.services.registry import ServiceRegistry
+
+async def start_services(app: FastAPI) -> ServiceRegistry:
+    """
+    Build the shared service registry and publish it as app.state.services.
+    """
+    started = time.monotonic()
+    try:
+        registry = await ServiceRegistry.create()
+    except Exception as e:
+        print(f"Service startup failed: {str(e)}")
+        raise
+    app.state.services = registry
+    print(f"Services ready in {time.monotonic() - started:.2f}s")
+    return registry
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application Lifespan Handler
+    
+    Starts building the shared service registry once per worker in the background
+    and returns at once, so the server binds its port without waiting for the
+    client libraries to load. Requests that need the services wait for them, and
+    the upstream channels are warmed up before they are handed out. The channels
+    are closed on shutdown.
+    """
+    app.state.services = None
+    app.state.services_startup = asyncio.create_task(start_services(app))
+    try:
+        yield
+    finally:
+        startup = app.state.services_startup
+        if not startup.done():
+            startup.cancel()
+        try:
+            await startup
+        except (asyncio.CancelledError, Exception):
+            # Already logged by start_services
+            pass
+        if app.state.services is not None:
+            await app.state.services.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="Translation Service API with Text-to-Speech and Speech-to-Text capabilities",
+    lifespan=lifespan,
 )
 
 # Set CORS middleware
@@ -35,21 +92,85 @@ app.add_middleware(
     allow_headers=["*"],        # Allow all headers
 )
 
+# Identify the tenant of every request for fair quota scheduling
+app.add_middleware(TenantMiddleware)
+
+# Keep the phase breakdown of slow requests for the admin API
+if settings.SLOW_REQUEST_THRESHOLD_MS > 0:
+    app.add_middleware(SlowRequestMiddleware)
+
+# Record request metrics; added last so it also times the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """
     Health Check Endpoint
     
+    Answers as soon as the server is listening, without waiting for the services.
+    
     Returns:
-        dict: A simple response indicating the service is healthy
+        dict: A simple response indicating the service is healthy, and whether the
+              services are 'starting' or 'ready'; answered with 503 and 'failed'
+              when they could not be started
         
     Example:
-        Response: {"status": "healthy"}
+        Response: {"status": "healthy", "services": "ready"}
+    """
+    startup = getattr(request.app.state, "services_startup", None)
+    if getattr(request.app.state, "services", None) is not None:
+        return {"status": "healthy", "services": "ready"}
+    if startup is not None and startup.done():
+        response = JSONResponse({"status": "unhealthy", "services": "failed"}, status_code=503)
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        return response
+    return {"status": "healthy", "services": "starting"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint(request: Request):
+    """
+    Metrics Endpoint
+    
+    Returns:
+        PlainTextResponse: Request, payload and upstream call metrics, followed by the
+                           counters of the caches, batching, quota schedulers, circuit
+                           breakers and retry policies, in the Prometheus text format
     """
-    return {"status": "healthy"}
+    body = metrics.render()
+    services = getattr(request.app.state, "services", None)
+    if services is not None:
+        body += metrics.render_stats(services.stats())
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.exception_handler(QuotaExceededError)
+async def quota_exceeded_handler(request: Request, exc: QuotaExceededError):
+    response = JSONResponse(
+        {"detail": str(exc)},
+        status_code=429,
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+    response = JSONResponse({"detail": str(exc)}, status_code=504)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+@app.exception_handler(UpstreamUnavailableError)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+    response = JSONResponse(
+        {"detail": str(exc)},
+        status_code=503,
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -9,6 +9,8 @@ All models inherit from Pydantic's BaseModel for automatic validation
 and serialization/deserialization functionality.
 """
 
+from typing import Annotated
+
 from pydantic import BaseModel, Field
 
 class TranslateRequest(BaseModel):
@@ -27,6 +29,22 @@ class TranslateRequest(BaseModel):
     sourceLanguage: str | None = Field(None, description="Source language code (auto-detect if not provided)")
     targetLanguage: str = Field(..., description="Target language code (e.g., 'es' for Spanish)")
 
+class BatchTranslateRequest(BaseModel):
+    """
+    Batch Translation Request Model
+    
+    Validates and structures requests for the batch translation endpoint.
+    All segments share the same source and target language.
+    
+    Attributes:
+        texts (list[str]): The segments to translate (each must not be empty)
+        sourceLanguage (str, optional): The source language code (auto-detected per segment if not provided)
+        targetLanguage (str): The language code to translate to (e.g., 'es' for Spanish)
+    """
+    texts: list[Annotated[str, Field(min_length=1)]] = Field(..., min_length=1, max_length=10000, description="Segments to translate")
+    sourceLanguage: str | None = Field(None, description="Source language code (auto-detect if not provided)")
+    targetLanguage: str = Field(..., description="Target language code (e.g., 'es' for Spanish)")
+
 class TTSRequest(BaseModel):
     """
     Text-to-Speech Request Model
@@ -38,10 +56,12 @@ class TTSRequest(BaseModel):
         text (str): The text to convert to speech (must not be empty)
         ttsCode (str): The language code of the text (e.g., 'en-US')
         ttsName (str): The name of the voice to use
+        stream (bool): Synthesize long text in chunks and stream the audio as it is ready
     """
     text: str = Field(..., min_length=1, description="Text to convert to speech")
     ttsCode: str = Field(..., description="Language code of the text (e.g., 'en-US')")
     ttsName: str = Field(..., description="Name of the voice to use")
+    stream: bool = Field(False, description="Stream audio chunk by chunk (for long text)")
 
 class STTRequest(BaseModel):
     """
@@ -61,6 +81,19 @@ class STTRequest(BaseModel):
     audioContent: str = Field(..., description="Base64 encoded audio content")
     languageCode: str = Field(..., description="Language code of the audio (e.g., 'en-US')")
 
+class STTJobRequest(BaseModel):
+    """
+    Speech-to-Text Job Request Model
+    
+    Validates requests to start a batch transcription job.
+    
+    Attributes:
+        audioUri (str): Cloud Storage URI of the recording (gs://bucket/object)
+        languageCode (str): The language code for speech recognition (e.g., 'en-US')
+    """
+    audioUri: str = Field(..., pattern=r"^gs://[^/]+/.+", description="Cloud Storage URI of the recording")
+    languageCode: str = Field(..., description="Language code of the audio (e.g., 'en-US')")
+
 class DetectLanguageRequest(BaseModel):
     """
     Language Detection Request Model
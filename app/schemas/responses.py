@@ -9,6 +9,8 @@ All models inherit from Pydantic's BaseModel for automatic validation
 and serialization/deserialization functionality.
 """
 
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 class TranslateResponse(BaseModel):
@@ -22,10 +24,65 @@ class TranslateResponse(BaseModel):
         translatedText (str): The resulting translated text
         detectedSourceLanguage (str): The language code of the original text (detected or provided)
         targetLanguage (str): The language code the text was translated to
+        memoryMatch (float, optional): Similarity of the translation memory segment that served
+                                       or resembles this text (1.0 for exact matches)
+        stale (bool): Whether the result was served from an expired result while the API is unavailable
     """
     translatedText: str = Field(..., description="Translated text")
     detectedSourceLanguage: str = Field(..., description="Detected or provided source language")
     targetLanguage: str = Field(..., description="Target language")
+    memoryMatch: float | None = Field(None, ge=0.0, le=1.0, description="Similarity of the matching translation memory segment")
+    stale: bool = Field(False, description="True when served from an expired result while the API is unavailable")
+
+class BatchTranslationItem(BaseModel):
+    """
+    Batch Translation Item Model
+    
+    The outcome of translating one segment of a batch. Either the translation
+    fields or the error message are set.
+    
+    Attributes:
+        translatedText (str, optional): The resulting translated text
+        detectedSourceLanguage (str, optional): The language code of the original text (detected or provided)
+        targetLanguage (str): The language code the text was translated to
+        memoryMatch (float, optional): Similarity of the matching translation memory segment
+        stale (bool): Whether the result was served from an expired result while the API is unavailable
+        error (str, optional): Why this segment could not be translated
+    """
+    translatedText: str | None = Field(None, description="Translated text")
+    detectedSourceLanguage: str | None = Field(None, description="Detected or provided source language")
+    targetLanguage: str = Field(..., description="Target language")
+    memoryMatch: float | None = Field(None, ge=0.0, le=1.0, description="Similarity of the matching translation memory segment")
+    stale: bool = Field(False, description="True when served from an expired result while the API is unavailable")
+    error: str | None = Field(None, description="Error message if this segment failed")
+
+class BatchTranslateResponse(BaseModel):
+    """
+    Batch Translation Response Model
+    
+    Structures the response from the batch translation endpoint.
+    
+    Attributes:
+        translations (list[BatchTranslationItem]): One item per input segment, in input order
+    """
+    translations: list[BatchTranslationItem] = Field(..., description="Per-segment results in input order")
+
+class STTSegment(BaseModel):
+    """
+    Speech-to-Text Segment Model
+    
+    One recognized part of the audio.
+    
+    Attributes:
+        text (str): The transcribed text of the segment
+        confidence (float): Confidence score of the segment (0.0 to 1.0)
+        startOffset (float): Seconds from the start of the audio to the start of the segment
+        endOffset (float): Seconds from the start of the audio to the end of the segment
+    """
+    text: str = Field(..., description="Transcribed text of the segment")
+    confidence: float = Field(..., description="Confidence score of the segment")
+    startOffset: float = Field(..., description="Start of the segment in seconds")
+    endOffset: float = Field(..., description="End of the segment in seconds")
 
 class STTResponse(BaseModel):
     """
@@ -38,6 +95,7 @@ class STTResponse(BaseModel):
         text (str): The transcribed text from the audio
         confidence (float): Confidence score of the transcription (0.0 to 1.0)
         languageCode (str): The language code of the transcribed text
+        segments (list[STTSegment]): The recognized parts of the audio, in order
     
     Note:
         The confidence score indicates how certain the model is about the
@@ -46,6 +104,32 @@ class STTResponse(BaseModel):
     text: str = Field(..., description="Transcribed text")
     confidence: float = Field(..., description="Confidence score of the transcription")
     languageCode: str = Field(..., description="Detected language code")
+    segments: list[STTSegment] = Field(default_factory=list, description="Recognized parts of the audio with offsets")
+
+class STTJobResponse(BaseModel):
+    """
+    Speech-to-Text Job Response Model
+    
+    Describes the state of a batch transcription job.
+    
+    Attributes:
+        jobId (str): The job identifier
+        status (str): queued, running, succeeded, failed or cancelled
+        audioUri (str): Cloud Storage URI of the recording
+        languageCode (str): The language code for speech recognition
+        progress (int): Percent complete reported by the API (0 to 100)
+        error (str): Why the job failed, if it did
+        createdAt (datetime): When the job was submitted
+        updatedAt (datetime): When the job last changed
+    """
+    jobId: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    audioUri: str = Field(..., description="Cloud Storage URI of the recording")
+    languageCode: str = Field(..., description="Language code of the audio")
+    progress: int = Field(0, ge=0, le=100, description="Percent complete")
+    error: str | None = Field(None, description="Why the job failed")
+    createdAt: datetime = Field(..., description="When the job was submitted")
+    updatedAt: datetime = Field(..., description="When the job last changed")
 
 class DetectLanguageResponse(BaseModel):
     """
@@ -56,6 +140,49 @@ class DetectLanguageResponse(BaseModel):
     Attributes:
         languageCode (str): Detected language code
         confidence (float): Confidence score of the detection (0.0 to 1.0)
+        stale (bool): Whether the result was served from an expired result while the API is unavailable
     """
     languageCode: str = Field(..., description="Detected language code")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score of the detection")
+    stale: bool = Field(False, description="True when served from an expired result while the API is unavailable")
+
+
+class SlowRequestEntry(BaseModel):
+    """
+    Slow Request Entry Model
+    
+    Describes a request slower than SLOW_REQUEST_THRESHOLD_MS and where its time went.
+    
+    Attributes:
+        method (str): HTTP method
+        path (str): Request path, without the query string
+        route (str): Template of the route that handled the request, if any
+        status (int): Response status code
+        startedAt (datetime): When the request arrived
+        totalMs (float): Time to handle the request, including a streamed body
+        phases (dict): Milliseconds spent receiving the body, parsing it, validating
+                       parameters, in the endpoint (service), serializing the result
+                       and sending the response
+    """
+    method: str = Field(..., description="HTTP method")
+    path: str = Field(..., description="Request path")
+    route: str | None = Field(None, description="Template of the route that handled the request")
+    status: int = Field(..., description="Response status code")
+    startedAt: datetime = Field(..., description="When the request arrived")
+    totalMs: float = Field(..., description="Time to handle the request in milliseconds")
+    phases: dict[str, float] = Field(..., description="Milliseconds spent in each phase")
+
+class SlowRequestsResponse(BaseModel):
+    """
+    Slow Requests Response Model
+    
+    The most recent slow requests, newest first.
+    
+    Attributes:
+        thresholdMs (float): Duration above which requests are recorded
+        recorded (int): Slow requests seen since startup, including those no longer kept
+        requests (list[SlowRequestEntry]): The requests kept
+    """
+    thresholdMs: float = Field(..., description="Duration above which requests are recorded")
+    recorded: int = Field(..., description="Slow requests seen since startup")
+    requests: list[SlowRequestEntry] = Field(..., description="The most recent slow requests, newest first")
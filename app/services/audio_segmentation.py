@@ -0,0 +1,230 @@
+"""
+Audio Segmentation Module
+
+This module decodes PCM WAV audio locally and splits long recordings into chunks
+that can be transcribed independently. Split points are chosen by an
+energy-based voice-activity detector: the audio is cut inside the longest pause
+found near the chunk length limit, or at the quietest moment when there is no
+pause. Chunks without any speech are dropped.
+
+All per-frame work (energy, smoothing, speech detection) is vectorized over the
+whole recording.
+
+Dependencies:
+    - numpy: For sample buffers and vectorized frame energy
+    - wave: For reading and writing WAV containers
+"""
+
+import io
+import wave
+
+import numpy as np
+
+_FRAME_SECONDS = 0.02
+# Window of the moving average applied to frame energies before picking a cut
+_SMOOTHING_SECONDS = 0.3
+# A frame is speech when it is this much louder than the recording's noise floor,
+# or at most this much quieter than its loud parts
+_SPEECH_MARGIN_DB = 10.0
+_DYNAMIC_RANGE_DB = 20.0
+# Frames quieter than this are never speech, even in a silent recording
+_MIN_SPEECH_DB = 30.0
+_NOISE_FLOOR_PERCENTILE = 2
+_LOUD_PERCENTILE = 95
+
+
+class PcmAudio:
+    """
+    PCM Audio Class
+
+    Decoded 16-bit PCM audio.
+
+    Attributes:
+        samples (np.ndarray): int16 samples shaped (frames, channels)
+        sample_rate (int): Samples per second of each channel
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        """
+        Wrap decoded samples.
+
+        Args:
+            samples (np.ndarray): int16 samples shaped (frames, channels)
+            sample_rate (int): Samples per second of each channel
+        """
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def duration(self) -> float:
+        """
+        Length of the audio in seconds.
+        """
+        return len(self.samples) / self.sample_rate
+
+    def to_wav(self, start: int = 0, end: int | None = None) -> bytes:
+        """
+        Encode a range of frames as a WAV file.
+
+        Args:
+            start (int, optional): First frame
+            end (int, optional): Frame after the last one; defaults to the end
+
+        Returns:
+            bytes: A 16-bit PCM WAV file
+        """
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as writer:
+            writer.setnchannels(self.channels)
+            writer.setsampwidth(2)
+            writer.setframerate(self.sample_rate)
+            writer.writeframes(self.samples[start:end].astype("<i2", copy=False).tobytes())
+        return buffer.getvalue()
+
+
+def decode_wav(data: bytes) -> PcmAudio | None:
+    """
+    Decode a 16-bit PCM WAV file.
+
+    Args:
+        data (bytes): The file contents
+
+    Returns:
+        PcmAudio: The decoded audio, or None if the data is not 16-bit PCM WAV
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    try:
+        with wave.open(io.BytesIO(data), "rb") as reader:
+            if reader.getsampwidth() != 2:
+                return None
+            channels = reader.getnchannels()
+            sample_rate = reader.getframerate()
+            frames = reader.readframes(reader.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    samples = np.frombuffer(frames, dtype="<i2")
+    samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    return PcmAudio(samples, sample_rate)
+
+
+def wav_duration(data: bytes) -> float | None:
+    """
+    Read the duration of a 16-bit PCM WAV file from its header, without decoding it.
+
+    Args:
+        data (bytes): The file contents
+
+    Returns:
+        float: The length of the audio in seconds, or None if the data is not 16-bit PCM WAV
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    try:
+        with wave.open(io.BytesIO(data), "rb") as reader:
+            if reader.getsampwidth() != 2:
+                return None
+            return reader.getnframes() / reader.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+def frame_energy(audio: PcmAudio, frame_seconds: float = _FRAME_SECONDS) -> np.ndarray:
+    """
+    Compute the energy of each fixed-length frame in decibels.
+
+    Args:
+        audio (PcmAudio): The audio
+        frame_seconds (float, optional): Frame length
+
+    Returns:
+        np.ndarray: One value per frame; a trailing partial frame is included
+    """
+    width = max(1, int(audio.sample_rate * frame_seconds)) * audio.channels
+    flat = audio.samples.reshape(-1)
+    full = len(flat) // width
+    frames = flat[:full * width].reshape(full, width)
+    power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / width
+    tail = flat[full * width:].astype(np.float64)
+    if len(tail):
+        power = np.append(power, tail @ tail / len(tail))
+    return 10.0 * np.log10(power + 1.0)
+
+
+def voice_activity(energy: np.ndarray) -> np.ndarray:
+    """
+    Classify frames as speech or silence relative to the recording's noise floor.
+
+    A recording without quiet parts (e.g. speech over steady background noise) is
+    treated as speech throughout rather than as silence.
+
+    Args:
+        energy (np.ndarray): Frame energies in decibels
+
+    Returns:
+        np.ndarray: True for frames that contain speech
+    """
+    if not len(energy):
+        return np.zeros(0, dtype=bool)
+    noise_floor, loud = np.percentile(energy, [_NOISE_FLOOR_PERCENTILE, _LOUD_PERCENTILE])
+    threshold = min(noise_floor + _SPEECH_MARGIN_DB, loud - _DYNAMIC_RANGE_DB)
+    return energy > max(threshold, _MIN_SPEECH_DB)
+
+
+def _best_cut(smoothed: np.ndarray, speech: np.ndarray, low: int, high: int) -> int:
+    """
+    Pick the frame to cut at: the middle of the longest pause, else the quietest frame.
+    """
+    silent = ~speech[low:high]
+    if silent.any():
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.astype(np.int8), [0]))))
+        starts, ends = edges[0::2], edges[1::2]
+        longest = int(np.argmax(ends - starts))
+        return low + int(starts[longest] + ends[longest]) // 2
+    return low + int(np.argmin(smoothed[low:high]))
+
+
+def split_on_silence(
+    audio: PcmAudio,
+    max_seconds: float,
+    window_seconds: float,
+) -> list[tuple[int, int]]:
+    """
+    Split audio into chunks of at most max_seconds, cutting at pauses.
+
+    Each cut is placed within the last window_seconds before the length limit.
+    Both lengths are clamped so that every window holds at least one frame and
+    every chunk at least two.
+
+    Args:
+        audio (PcmAudio): The audio to split
+        max_seconds (float): Maximum chunk length
+        window_seconds (float): How far before the limit a cut may be placed
+
+    Returns:
+        list[tuple[int, int]]: (start, end) frame ranges of the chunks that contain
+                               speech, in order
+    """
+    energy = frame_energy(audio)
+    speech = voice_activity(energy)
+    kernel = max(1, int(_SMOOTHING_SECONDS / _FRAME_SECONDS))
+    smoothed = np.convolve(energy, np.ones(kernel) / kernel, mode="same")
+
+    max_frames = max(2, int(max_seconds / _FRAME_SECONDS))
+    window_frames = max(1, min(max_frames - 1, int(window_seconds / _FRAME_SECONDS)))
+    cuts = [0]
+    while len(energy) - cuts[-1] > max_frames:
+        high = cuts[-1] + max_frames
+        cuts.append(_best_cut(smoothed, speech, high - window_frames, high))
+    cuts.append(len(energy))
+
+    frame_length = max(1, int(audio.sample_rate * _FRAME_SECONDS))
+    return [
+        (start * frame_length, min(end * frame_length, len(audio.samples)))
+        for start, end in zip(cuts, cuts[1:])
+        if speech[start:end].any()
+    ]
@@ -0,0 +1,233 @@
+"""
+Audio Store Module
+
+This module provides a content-addressed store for synthesized audio on local disk.
+Each clip is saved under the SHA-256 hash of everything that determines its bytes
+(text, voice and audio configuration), so identical synthesis requests map to the
+same file and the hash doubles as a strong ETag.
+
+Files are written atomically and the store is kept under a size budget by evicting
+the least recently used clips. Several workers may share the same directory. All
+disk access (lookups, writes, directory scans and eviction) runs in worker
+threads, off the event loop.
+
+Dependencies:
+    - os/tempfile: For atomic file writes and directory scans
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+# Fraction of the budget the store shrinks to when it evicts
+_LOW_WATERMARK = 0.9
+
+
+class AudioStore:
+    """
+    Audio Store Class
+
+    A size-bounded, content-addressed directory of audio clips.
+
+    Attributes:
+        root (str): Directory holding the clips
+        max_bytes (int): Size budget for all clips
+        extension (str): File extension of stored clips
+        size_bytes (int): Current estimated size of all clips
+        hits (int): Number of lookups that found a clip
+        misses (int): Number of lookups that found nothing
+        evictions (int): Number of clips deleted to stay within max_bytes
+    """
+
+    def __init__(self, root: str, max_bytes: int, extension: str = ".mp3"):
+        """
+        Initialize the store. The directory is scanned by start().
+
+        Args:
+            root (str): Directory holding the clips
+            max_bytes (int): Size budget for all clips
+            extension (str, optional): File extension of stored clips
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._evicting = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """
+        Build the content address of a clip.
+
+        Args:
+            *parts (str): Everything that determines the audio bytes
+
+        Returns:
+            str: A SHA-256 hex digest
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_key(value: str) -> bool:
+        """
+        Check that a value is a well-formed content address.
+        """
+        return len(value) == 64 and all(c in "0123456789abcdef" for c in value)
+
+    def path(self, key: str) -> str:
+        """
+        Return the file path of a clip, whether or not it exists.
+        """
+        return os.path.join(self.root, key[:2], key + self.extension)
+
+    async def start(self) -> None:
+        """
+        Create the directory and measure the clips already stored.
+        """
+        await asyncio.to_thread(os.makedirs, self.root, exist_ok=True)
+        self.size_bytes = sum(size for _, size, _ in await asyncio.to_thread(self._scan))
+
+    async def get(self, key: str) -> str | None:
+        """
+        Look up a clip and mark it as recently used.
+
+        Args:
+            key (str): The content address of the clip
+
+        Returns:
+            str: The path of the clip, or None if it is not stored
+        """
+        path = self.path(key)
+        if not await asyncio.to_thread(self._touch, path):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    async def put(self, key: str, data: bytes) -> str:
+        """
+        Store a clip atomically, evicting old clips if the store is over budget.
+
+        Args:
+            key (str): The content address of the clip
+            data (bytes): The audio bytes
+
+        Returns:
+            str: The path of the stored clip
+        """
+        return await asyncio.to_thread(self._put, key, data)
+
+    def stats(self) -> dict:
+        """
+        Return the store counters.
+
+        Returns:
+            dict: size_bytes, hits, misses and evictions
+        """
+        return {
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        """
+        Update the last use of a clip, reporting whether it exists.
+        """
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _put(self, key: str, data: bytes) -> str:
+        """
+        Write a clip, then evict in the same thread if the store went over budget.
+
+        Only one thread evicts at a time; writes arriving meanwhile are counted by
+        its rescan.
+        """
+        path = self._write(key, data)
+        with self._lock:
+            self.size_bytes += len(data)
+            evict = self.size_bytes > self.max_bytes and not self._evicting
+            self._evicting = self._evicting or evict
+        if evict:
+            try:
+                self._evict()
+            finally:
+                self._evicting = False
+        return path
+
+    def _write(self, key: str, data: bytes) -> str:
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return path
+
+    def _scan(self) -> list[tuple[str, int, float]]:
+        """
+        List every stored clip as (path, size, last use).
+        """
+        entries = []
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith(self.extension):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """
+        Delete least recently used clips until the store is below its low watermark.
+
+        The directory is rescanned so that clips written by other workers count.
+        """
+        with self._lock:
+            counted = self.size_bytes
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * _LOW_WATERMARK
+        cutoff = time.time() - 1.0
+        for path, size, last_used in entries:
+            if total <= target:
+                break
+            if last_used > cutoff:
+                # Never evict a clip that was just written or served
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+        with self._lock:
+            # Keep the clips this process stored while the eviction ran
+            self.size_bytes = total + self.size_bytes - counted
@@ -1,37 +1,200 @@
+"""
+Authentication Service Module
+
+This module resolves the Google Cloud credentials used by every API client and
+keeps their OAuth access token fresh.
+
+Credentials are loaded once per process and already scoped to cloud-platform, so
+the client libraries use the same object, and the same token, instead of a scoped
+copy each. A token fetched from a server (Application Default Credentials on Google Cloud, user, workload
+identity or impersonated credentials) is prefetched at startup and refreshed by a
+background task AUTH_TOKEN_REFRESH_MARGIN_SECONDS before it expires, so no RPC
+waits for the token endpoint. Service account keys need no refresh task: the
+clients sign their own short-lived tokens locally.
+
+Dependencies:
+    - google-auth: For loading credentials and refreshing access tokens, imported
+      when the credentials are first needed
+    - Settings from core.config for the credentials and refresh timing
+    - core.metrics for the count and latency of token refreshes
+"""
+
+import asyncio
 import json
-from google.oauth2.service_account import Credentials
+import time
+from datetime import datetime, timezone
+
+from app.core import metrics
 from app.core.config import settings
 
+# Scope covering the Translation, Text-to-Speech and Speech-to-Text APIs
+_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+
 class AuthService:
     """
     AuthService is a centralized helper for obtaining Google Cloud credentials.
-    
-    It checks the GOOGLE_APPLICATION_CREDENTIALS value from settings. If it 
-    contains a JSON string, it parses the credentials and returns a Credentials object.
-    Otherwise, it assumes the value is a file path and lets the Google Cloud client libraries
-    load it using Application Default Credentials.
+
+    It checks the GOOGLE_APPLICATION_CREDENTIALS value from settings. If it
+    contains a JSON string, it parses the service account credentials from it.
+    Otherwise, it assumes the value is a file path and loads the credentials using
+    Application Default Credentials. Either way they are loaded once per process.
+
+    Attributes:
+        refreshes (int): Access token refreshes that succeeded
+        refresh_failures (int): Access token refreshes that failed
+        last_refresh_seconds (float): Latency of the last refresh attempt
     """
     _cached_credentials = None
+    _loaded = False
+    _request = None
+    _refresh_task: asyncio.Task | None = None
+    refreshes = 0
+    refresh_failures = 0
+    last_refresh_seconds = 0.0
 
-    @staticmethod
-    def get_credentials():
-        # Return the cached credentials if already loaded
-        if AuthService._cached_credentials is not None:
-            print("Using cached credentials")
-            return AuthService._cached_credentials
+    @classmethod
+    def get_credentials(cls):
+        """
+        Return the process-wide credentials, loading them on first use.
 
-        credentials_str = settings.GOOGLE_APPLICATION_CREDENTIALS.strip()
+        Returns:
+            google.auth.credentials.Credentials: The credentials shared by every client
+
+        Raises:
+            Exception: If the credentials JSON is invalid or no credentials can be found
+        """
+        if cls._loaded:
+            return cls._cached_credentials
 
+        import google.auth
+        from google.oauth2 import service_account
+
+        credentials_str = settings.GOOGLE_APPLICATION_CREDENTIALS.strip()
         if credentials_str.startswith("{"):
             try:
                 credentials_info = json.loads(credentials_str)
-                AuthService._cached_credentials = Credentials.from_service_account_info(credentials_info)
-                print("Loaded credentials from JSON")
-                return AuthService._cached_credentials
+                credentials = service_account.Credentials.from_service_account_info(credentials_info, scopes=_SCOPES)
             except Exception as e:
                 print(f"Error parsing credentials JSON: {e}")
                 raise
+            print("Loaded credentials from JSON")
         else:
-            # If you're using a file path, returning None makes the client libraries fallback to ADC
-            AuthService._cached_credentials = None
-            return None 
\ No newline at end of file
+            credentials, _ = google.auth.default(scopes=_SCOPES)
+            print(f"Loaded Application Default Credentials ({type(credentials).__name__})")
+        cls.use_credentials(credentials)
+        return credentials
+
+    @classmethod
+    def use_credentials(cls, credentials) -> None:
+        """
+        Use the given credentials for every client instead of loading them.
+
+        Args:
+            credentials (google.auth.credentials.Credentials): The credentials to share,
+                                                               e.g. anonymous ones for a local backend
+        """
+        cls._cached_credentials = credentials
+        cls._loaded = True
+
+    @classmethod
+    async def start(cls) -> None:
+        """
+        Prefetch the access token and start refreshing it in the background.
+
+        Does nothing when no service loaded the credentials (e.g. clients built
+        for a local fake backend) or when they sign their own tokens. A failed
+        prefetch is logged and retried; it never prevents the application from starting.
+        """
+        from google.oauth2 import service_account
+
+        credentials = cls._cached_credentials
+        if credentials is None or isinstance(credentials, service_account.Credentials) or cls._refresh_task:
+            return
+        refreshed = await cls._refresh()
+        cls._refresh_task = asyncio.create_task(cls._refresh_loop(refreshed))
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Stop the background refresh task.
+        """
+        task, cls._refresh_task = cls._refresh_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Return the refresh counters.
+
+        Returns:
+            dict: refreshes, refresh failures, the latency of the last refresh (ms)
+                  and the seconds until the current token expires (0 when unknown)
+        """
+        return {
+            "refreshes": cls.refreshes,
+            "refresh_failures": cls.refresh_failures,
+            "last_refresh_ms": cls.last_refresh_seconds * 1000,
+            "token_expires_in": max(0.0, cls._expires_in() or 0.0),
+        }
+
+    @classmethod
+    async def _refresh_loop(cls, refreshed: bool) -> None:
+        """
+        Refresh the token ahead of its expiry for as long as the application runs.
+        """
+        while True:
+            expires_in = cls._expires_in()
+            if refreshed and expires_in is None:
+                # The token does not expire
+                return
+            delay = settings.AUTH_TOKEN_REFRESH_RETRY_SECONDS
+            if refreshed:
+                # Short-lived tokens are refreshed halfway through their lifetime instead
+                delay = max(delay, expires_in - settings.AUTH_TOKEN_REFRESH_MARGIN_SECONDS, expires_in / 2)
+            await asyncio.sleep(delay)
+            refreshed = await cls._refresh()
+
+    @classmethod
+    async def _refresh(cls) -> bool:
+        """
+        Fetch a new access token in a worker thread, recording the outcome.
+
+        Returns:
+            bool: Whether the refresh succeeded
+        """
+        from google.auth.transport.requests import Request
+
+        if cls._request is None:
+            # Reused so refreshes share one HTTP connection pool
+            cls._request = Request()
+        start = time.monotonic()
+        try:
+            await asyncio.to_thread(cls._cached_credentials.refresh, cls._request)
+        except Exception as e:
+            cls.refresh_failures += 1
+            metrics.CREDENTIAL_REFRESHES.labels("error").inc()
+            print(f"Access token refresh failed: {str(e)}")
+            return False
+        finally:
+            cls.last_refresh_seconds = time.monotonic() - start
+            metrics.CREDENTIAL_REFRESH_DURATION.labels().observe(cls.last_refresh_seconds)
+        cls.refreshes += 1
+        metrics.CREDENTIAL_REFRESHES.labels("ok").inc()
+        return True
+
+    @classmethod
+    def _expires_in(cls) -> float | None:
+        """
+        Return the seconds until the current token expires, or None without an expiry.
+        """
+        expiry = getattr(cls._cached_credentials, "expiry", None)
+        if expiry is None:
+            return None
+        # google-auth keeps expiry as a naive UTC datetime
+        return (expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
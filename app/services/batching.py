@@ -0,0 +1,177 @@
+"""
+Request Coalescing Module
+
+This module provides a micro-batcher that merges concurrent single-item calls into
+one upstream request. Calls that share a key (for example a language pair) are
+collected for a short window, or until a size cap is reached, then sent together;
+each caller receives its own item's result.
+
+Batch sizes are recorded in a histogram so the window and size caps can be tuned.
+The coalescer is designed for use from a single event loop and performs no locking.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+# Upper bounds of the batch size histogram buckets
+_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, float("inf"))
+
+
+class _Batch:
+    __slots__ = ("items", "futures", "weight", "timer")
+
+    def __init__(self):
+        self.items: list = []
+        self.futures: list[asyncio.Future] = []
+        self.weight = 0
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class RequestCoalescer:
+    """
+    Request Coalescer Class
+
+    Groups concurrent calls by key and sends each group as one batch.
+
+    Attributes:
+        window (float): Seconds to wait for more calls after the first one in a batch
+        max_items (int): Number of items that triggers an immediate send
+        max_weight (int): Total item weight (e.g. codepoints) that triggers a send
+        batches (int): Number of batches sent
+        items (int): Number of items sent
+        size_histogram (dict): Number of batches per size bucket upper bound
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[Hashable, list], Awaitable[list]],
+        window: float,
+        max_items: int,
+        max_weight: int | None = None,
+        weigh: Callable[[object], int] = len,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            send_batch (callable): Coroutine function called with a key and a list of
+                                   items; returns one result per item, in order. A result
+                                   that is an Exception is raised to that item's caller,
+                                   and a list of the wrong length fails every item with
+                                   RuntimeError.
+            window (float): Seconds to wait for more calls after the first one in a batch
+            max_items (int): Number of items that triggers an immediate send
+            max_weight (int, optional): Total item weight that triggers a send
+            weigh (callable, optional): Returns the weight of an item (default: len)
+        """
+        self.window = window
+        self.max_items = max_items
+        self.max_weight = max_weight
+        self.batches = 0
+        self.items = 0
+        self.size_histogram = {bound: 0 for bound in _SIZE_BUCKETS}
+        self._send_batch = send_batch
+        self._weigh = weigh
+        self._pending: dict[Hashable, _Batch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, item):
+        """
+        Add an item to the open batch for its key and wait for its result.
+
+        Args:
+            key: Items are only batched with items of the same key
+            item: The item to send
+
+        Returns:
+            The result for this item
+
+        Raises:
+            Exception: The error of the batch, or of this item
+        """
+        loop = asyncio.get_running_loop()
+        weight = self._weigh(item)
+
+        batch = self._pending.get(key)
+        if batch is not None and self.max_weight is not None and batch.weight + weight > self.max_weight:
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = _Batch()
+            batch.timer = loop.call_later(self.window, self._flush, key)
+            self._pending[key] = batch
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        batch.weight += weight
+        if len(batch.items) >= self.max_items:
+            self._flush(key)
+
+        return await future
+
+    def stats(self) -> dict:
+        """
+        Return the coalescer counters.
+
+        Returns:
+            dict: batches, items, mean_batch_size and size_histogram
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "size_histogram": dict(self.size_histogram),
+        }
+
+    async def close(self) -> None:
+        """
+        Send every open batch and wait for all batches in flight.
+        """
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self, key: Hashable) -> None:
+        """
+        Close the open batch for a key and send it in the background.
+        """
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+
+        size = len(batch.items)
+        self.batches += 1
+        self.items += size
+        for bound in _SIZE_BUCKETS:
+            if size <= bound:
+                self.size_histogram[bound] += 1
+                break
+
+        task = asyncio.create_task(self._send(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: Hashable, batch: _Batch) -> None:
+        try:
+            results = await self._send_batch(key, batch.items)
+            if len(results) != len(batch.items):
+                # Results cannot be matched to items, and a short list would leave
+                # the trailing callers waiting forever
+                raise RuntimeError(f"Batch of {len(batch.items)} items returned {len(results)} results")
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results):
+            if future.done():
+                # The caller was cancelled while the batch was in flight
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,205 @@
+"""
+Result Cache Module
+
+This module provides a bounded in-memory cache for upstream results. Entries are
+evicted least-recently-used first once the cache exceeds its size budget in bytes,
+and expire after a fixed time-to-live. Expired entries are no longer returned by
+lookups but stay in the cache until they are evicted or replaced, so they can still
+be served, flagged as stale, while the upstream API is down. Hit, miss, eviction
+and expiration counters are kept for observability.
+
+The cache is designed for use from a single event loop and performs no locking.
+"""
+
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for use in a cache key.
+
+    Applies Unicode NFC normalization and strips surrounding whitespace so that
+    visually identical inputs share a cache entry.
+
+    Args:
+        text (str): The raw input text
+
+    Returns:
+        str: The normalized text
+    """
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def _estimate_size(value) -> int:
+    """
+    Approximate the memory held by a cached key or value, in bytes.
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_size(k) + _estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Result Cache Class
+
+    An LRU cache with a per-entry time-to-live and a total size limit in bytes.
+
+    Attributes:
+        max_bytes (int): Size budget for all entries; 0 disables the cache
+        ttl (float): Seconds an entry stays fresh after it is stored
+        size_bytes (int): Current estimated size of all entries
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that found no fresh entry
+        evictions (int): Number of entries dropped to stay within max_bytes
+        expirations (int): Number of lookups that found an entry whose TTL elapsed
+        stale_hits (int): Number of fallback lookups answered by get_stale
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): Size budget for all entries; 0 disables the cache
+            ttl (float): Seconds an entry stays fresh after it is stored
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+        # key -> (value, size in bytes, expiry timestamp)
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key):
+        """
+        Look up a fresh entry and mark it as most recently used.
+
+        Args:
+            key: A hashable cache key
+
+        Returns:
+            The cached value, or None if there is no fresh entry
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, _, expires_at = entry
+        if expires_at <= time.monotonic():
+            # Kept for get_stale until it is evicted or replaced
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key):
+        """
+        Look up an entry whether or not its TTL has elapsed, e.g. as a fallback
+        while the upstream API is down. Does not affect the LRU order.
+
+        Args:
+            key: A hashable cache key
+
+        Returns:
+            The cached value, or None if there is no entry
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.stale_hits += 1
+        return entry[0]
+
+    def set(self, key, value) -> None:
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Values larger than the whole budget are not stored.
+
+        Args:
+            key: A hashable cache key
+            value: The value to cache
+        """
+        if not self.enabled:
+            return
+
+        size = _estimate_size(key) + _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= previous[1]
+
+        self._entries[key] = (value, size, time.monotonic() + self.ttl)
+        self.size_bytes += size
+
+        while self.size_bytes > self.max_bytes:
+            old_key, (_, old_size, _) = next(iter(self._entries.items()))
+            self._remove(old_key, old_size)
+            self.evictions += 1
+
+    def setdefault(self, key, value) -> None:
+        """
+        Store a value only if there is no fresh entry for the key.
+
+        Does not affect the hit and miss counters.
+
+        Args:
+            key: A hashable cache key
+            value: The value to cache
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] > time.monotonic():
+            return
+        self.set(key, value)
+
+    def clear(self) -> None:
+        """
+        Drop every entry without touching the counters.
+        """
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: entries, size_bytes, hits, misses, evictions, expirations and stale hits
+        """
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stale_hits": self.stale_hits,
+        }
+
+    def _remove(self, key, size: int) -> None:
+        del self._entries[key]
+        self.size_bytes -= size
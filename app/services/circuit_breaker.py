@@ -0,0 +1,257 @@
+"""
+Circuit Breaker Module
+
+This module stops the service from sending calls to a Google Cloud API that is
+failing. Every API has a breaker that watches the outcome of its recent calls:
+
+    - closed: calls go through. Once at least CIRCUIT_MIN_CALLS of the last
+      CIRCUIT_WINDOW_CALLS calls are known and the share that failed, or that
+      took longer than the slow-call threshold, reaches its limit, the breaker opens.
+    - open: calls fail immediately with UpstreamUnavailableError, without
+      waiting for a timeout, for CIRCUIT_OPEN_SECONDS.
+    - half-open: up to CIRCUIT_HALF_OPEN_CALLS trial calls go through. If they all
+      succeed the breaker closes again; the first one that fails opens it again.
+
+Only server-side failures count: internal and unavailable errors and missed
+deadlines. Invalid requests and quota rejections say nothing about the health
+of the API and are ignored.
+
+The breaker is designed for use from a single event loop and performs no locking.
+
+Dependencies:
+    - google-api-core: For the server error types raised by the clients, imported on first use
+    - Settings from core.config for the breaker thresholds
+"""
+
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, UpstreamUnavailableError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Retry-After reported while all trial calls of a half-open breaker are in flight
+_HALF_OPEN_RETRY_AFTER_SECONDS = 1.0
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Tell whether an error means the API itself is failing.
+
+    Args:
+        error (BaseException): The error raised by an upstream call
+
+    Returns:
+        bool: True for server errors, missed deadlines and open breakers
+    """
+    from google.api_core.exceptions import ServerError
+
+    return isinstance(error, (ServerError, DeadlineExceededError, UpstreamUnavailableError))
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker Class
+
+    Tracks the health of one upstream API and short-circuits calls to it while it
+    is failing.
+
+    Attributes:
+        name (str): Name of the API, used in error messages
+        enabled (bool): Whether calls are ever short-circuited
+        window_calls (int): Recent calls whose outcome is considered
+        min_calls (int): Calls in the window before the breaker may open
+        failure_rate (float): Share of failed calls that opens the breaker
+        slow_call_rate (float): Share of slow calls that opens the breaker
+        slow_call_seconds (float): Duration above which a call is slow
+        open_seconds (float): Seconds the breaker stays open before trial calls
+        half_open_calls (int): Successful trial calls that close the breaker
+        state (str): 'closed', 'open' or 'half-open'
+        opened (int): Number of times the breaker opened
+        rejected (int): Number of calls failed fast
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool,
+        window_calls: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_rate: float,
+        slow_call_seconds: float,
+        open_seconds: float,
+        half_open_calls: int,
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name (str): Name of the API, used in error messages
+            enabled (bool): Whether calls are ever short-circuited
+            window_calls (int): Recent calls whose outcome is considered
+            min_calls (int): Calls in the window before the breaker may open
+            failure_rate (float): Share of failed calls that opens the breaker
+            slow_call_rate (float): Share of slow calls that opens the breaker
+            slow_call_seconds (float): Duration above which a call is slow
+            open_seconds (float): Seconds the breaker stays open before trial calls
+            half_open_calls (int): Successful trial calls that close the breaker
+        """
+        self.name = name
+        self.enabled = enabled
+        self.window_calls = window_calls
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self.state = CLOSED
+        self.opened = 0
+        self.rejected = 0
+        # (failed, slow) of the most recent calls
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=max(1, window_calls))
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+
+    @classmethod
+    def from_settings(cls, name: str, slow_call_seconds: float | None = None) -> "CircuitBreaker":
+        """
+        Create a breaker with the thresholds from the settings.
+
+        Args:
+            name (str): Name of the API, used in error messages
+            slow_call_seconds (float, optional): Duration above which a call is slow;
+                                                 defaults to CIRCUIT_SLOW_CALL_SECONDS
+
+        Returns:
+            CircuitBreaker: The new breaker
+        """
+        return cls(
+            name,
+            enabled=settings.CIRCUIT_BREAKER_ENABLED,
+            window_calls=settings.CIRCUIT_WINDOW_CALLS,
+            min_calls=settings.CIRCUIT_MIN_CALLS,
+            failure_rate=settings.CIRCUIT_FAILURE_RATE,
+            slow_call_rate=settings.CIRCUIT_SLOW_CALL_RATE,
+            slow_call_seconds=slow_call_seconds or settings.CIRCUIT_SLOW_CALL_SECONDS,
+            open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            half_open_calls=settings.CIRCUIT_HALF_OPEN_CALLS,
+        )
+
+    async def call(self, fn: Callable[[], Awaitable]):
+        """
+        Run an upstream call unless the breaker is open, recording its outcome.
+
+        Args:
+            fn (callable): Coroutine function performing the call
+
+        Returns:
+            The result of fn
+
+        Raises:
+            UpstreamUnavailableError: If the breaker is open, or half-open with all
+                                      trial calls in flight
+        """
+        if not self.enabled:
+            return await fn()
+        trial = self._admit()
+        start = time.monotonic()
+        outcome = None
+        try:
+            result = await fn()
+            outcome = False
+            return result
+        except Exception as e:
+            if is_upstream_failure(e):
+                outcome = True
+            raise
+        finally:
+            # outcome stays None for cancelled calls and errors that do not count
+            self._record(trial, outcome, time.monotonic() - start > self.slow_call_seconds)
+
+    def stats(self) -> dict:
+        """
+        Return the breaker state and counters.
+
+        Returns:
+            dict: state, calls in the window, failed and slow calls among them,
+                  times opened and calls rejected
+        """
+        return {
+            "state": self.state,
+            "calls": len(self._window),
+            "failures": self._failures,
+            "slow": self._slow,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+    def _admit(self) -> bool:
+        """
+        Let a call through or reject it.
+
+        Returns:
+            bool: True if the call is a half-open trial call
+        """
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise UpstreamUnavailableError(f"{self.name} is unavailable", retry_after=remaining)
+            self.state = HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+        if self.state == HALF_OPEN:
+            if self._trials >= self.half_open_calls - self._trial_successes:
+                self.rejected += 1
+                raise UpstreamUnavailableError(
+                    f"{self.name} is unavailable", retry_after=_HALF_OPEN_RETRY_AFTER_SECONDS
+                )
+            self._trials += 1
+            return True
+        return False
+
+    def _record(self, trial: bool, failed: bool | None, slow: bool) -> None:
+        if trial:
+            self._trials -= 1
+            if self.state != HALF_OPEN or failed is None:
+                return
+            if failed or slow:
+                self._open()
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_calls:
+                self.state = CLOSED
+                self._window.clear()
+                self._failures = self._slow = 0
+            return
+
+        # Calls that started before the breaker opened say nothing about now
+        if self.state != CLOSED or failed is None:
+            return
+        if len(self._window) == self._window.maxlen:
+            old_failed, old_slow = self._window[0]
+            self._failures -= old_failed
+            self._slow -= old_slow
+        self._window.append((failed, slow))
+        self._failures += failed
+        self._slow += slow
+        calls = len(self._window)
+        if calls >= self.min_calls and (
+            self._failures >= self.failure_rate * calls or self._slow >= self.slow_call_rate * calls
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = time.monotonic()
+        print(f"{self.name} circuit breaker opened for {self.open_seconds:.0f} s: {self.stats()}")
@@ -0,0 +1,244 @@
+"""
+Concurrency Helpers Module
+
+This module provides asyncio building blocks shared by the service classes.
+
+SingleFlight deduplicates identical in-flight upstream calls: while a call for a
+given payload is running, every identical call waits on the same result instead of
+issuing its own request. Errors propagate to every waiter, and the shared call is
+cancelled only once all of its waiters have gone away.
+
+ordered_map runs a coroutine function over a sequence of items with bounded
+parallelism and yields the results in input order as soon as each is ready, which
+lets streaming endpoints send the head of a response while the tail is still
+being computed. ordered_stream_map does the same for an asynchronous source, so
+stages of a pipeline can be chained and overlapped: each stage starts on an item
+as soon as the previous stage produces it.
+
+The helpers are designed for use from a single event loop and perform no locking.
+"""
+
+import asyncio
+import hashlib
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Hashable, Iterable
+
+
+def payload_key(*parts) -> str:
+    """
+    Hash the parts of a request payload into a compact key.
+
+    Args:
+        *parts: str, bytes or None values identifying the payload
+
+    Returns:
+        str: A hex digest that differs whenever any part differs
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if part is None:
+            digest.update(b"n")
+            continue
+        if isinstance(part, bytes):
+            digest.update(b"b")
+            data = part
+        else:
+            digest.update(b"s")
+            data = str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Single-Flight Class
+
+    Runs at most one call per key at a time and shares its outcome with every
+    caller that asks for the same key while it is running.
+
+    Attributes:
+        calls (int): Number of upstream calls started
+        shared (int): Number of callers that joined a call already in flight
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        Run fn, or join the identical call already in flight.
+
+        Args:
+            key: Identifies the payload; calls with equal keys are deduplicated
+            fn (callable): Coroutine function performing the call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: The error raised by the shared call
+        """
+        call = self._in_flight.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(fn()))
+            self._in_flight[key] = call
+            call.task.add_done_callback(lambda task: self._done(key, call, task))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up: stop the upstream call and let the next
+                # identical request start a fresh one
+                self._forget(key, call)
+                call.task.cancel()
+
+    def stats(self) -> dict:
+        """
+        Return the single-flight counters.
+
+        Returns:
+            dict: calls, shared and in_flight
+        """
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _done(self, key: Hashable, call: _Call, task: asyncio.Task) -> None:
+        self._forget(key, call)
+        if not task.cancelled():
+            # Mark the error as retrieved even if every waiter was cancelled
+            task.exception()
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._in_flight.get(key) is call:
+            del self._in_flight[key]
+
+
+async def ordered_map(
+    fn: Callable[[object], Awaitable],
+    items: Iterable,
+    limit: int,
+) -> AsyncIterator:
+    """
+    Apply a coroutine function to every item concurrently and yield results in order.
+
+    At most `limit` calls are started ahead of the result being yielded. Pending
+    calls are cancelled if the consumer stops iterating or an error is raised.
+
+    Args:
+        fn (callable): Coroutine function applied to each item
+        items (iterable): The inputs
+        limit (int): Maximum number of calls running or awaiting delivery
+
+    Yields:
+        The result of fn for each item, in input order
+
+    Raises:
+        Exception: The first error raised by fn, in input order
+    """
+    iterator = iter(items)
+    pending: deque[asyncio.Task] = deque()
+
+    def start_next() -> None:
+        for item in iterator:
+            pending.append(asyncio.create_task(fn(item)))
+            return
+
+    try:
+        for _ in range(max(1, limit)):
+            start_next()
+        while pending:
+            result = await pending[0]
+            pending.popleft()
+            start_next()
+            yield result
+    finally:
+        for task in pending:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
+
+
+async def ordered_stream_map(
+    fn: Callable[[object], Awaitable],
+    items: AsyncIterable,
+    limit: int,
+) -> AsyncIterator:
+    """
+    Apply a coroutine function to every item of an asynchronous source concurrently
+    and yield results in order.
+
+    Items are pulled from the source as soon as it produces them, while earlier
+    results are still being computed or delivered. At most `limit` calls are
+    started ahead of the result being yielded; the source is not read further
+    until one of them is delivered. Pending calls are cancelled and the source is
+    closed if the consumer stops iterating or an error is raised.
+
+    Args:
+        fn (callable): Coroutine function applied to each item
+        items (async iterable): The inputs
+        limit (int): Maximum number of calls running or awaiting delivery
+
+    Yields:
+        The result of fn for each item, in input order
+
+    Raises:
+        Exception: The first error raised by fn or the source, in input order
+    """
+    slots = asyncio.Semaphore(max(1, limit))
+    # Started calls in input order, then a failed future if the source raised, then None
+    started: asyncio.Queue = asyncio.Queue()
+
+    async def feed() -> None:
+        try:
+            async for item in items:
+                await slots.acquire()
+                started.put_nowait(asyncio.create_task(fn(item)))
+        except Exception as e:
+            failed = asyncio.get_running_loop().create_future()
+            failed.set_exception(e)
+            started.put_nowait(failed)
+        finally:
+            started.put_nowait(None)
+            if hasattr(items, "aclose"):
+                await items.aclose()
+
+    feeder = asyncio.create_task(feed())
+    task = None
+    try:
+        while (task := await started.get()) is not None:
+            result = await task
+            task = None
+            slots.release()
+            yield result
+    finally:
+        feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
+        pending = [task] if task is not None else []
+        while not started.empty():
+            pending.append(started.get_nowait())
+        for task in pending:
+            if task is None:
+                continue
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
@@ -0,0 +1,328 @@
+"""
+Local Language Identification Module
+
+This module provides an in-process language identifier used as a fast path in
+front of the Cloud Translation detectLanguage API.
+
+Texts written in a script used by a single supported language (Japanese kana,
+Hangul, Thai, Greek, Georgian, Armenian) are identified from their characters
+alone. Latin-script texts are scored by a naive Bayes model over hashed character
+trigrams and words whose per-language profiles are precomputed once from small
+embedded seed corpora; scoring is a single vectorized gather-and-sum over the
+profile matrix.
+
+Every answer carries a confidence so callers can fall back to the API whenever
+the local model is unsure. The confidence is a posterior over the covered
+languages and their closest uncovered neighbours, whose profiles are built from
+background corpora, so a text in a related language the model does not cover
+gets a low confidence rather than a confident wrong answer, and an answer must
+beat every neighbour by a minimum margin. Texts that fit no profile well (a
+minimum mean log-likelihood per feature) are not answered. Scripts shared by
+several languages that the model does not cover (Cyrillic, Arabic, Devanagari,
+Han without kana) are never answered locally.
+
+Dependencies:
+    - numpy: For the profile matrix and vectorized scoring
+"""
+
+import zlib
+
+import numpy as np
+
+_BUCKETS = 1 << 14
+_SMOOTHING = 0.1
+# Scales the per-feature mean log-likelihood gap into a posterior; tuned so that
+# a typical sentence in a covered language scores well above 0.9
+_SHARPNESS = 12.0
+_MIN_LATIN_LETTERS = 12
+# Mean log-likelihood per feature below which a text fits none of the profiles
+# well enough to be in a covered language (Polish, Turkish, Finnish, ...)
+_MIN_LOG_LIKELIHOOD = -9.25
+# Mean log-likelihood per feature by which an answer must beat every uncovered
+# neighbour; a close neighbour (Galician against Spanish) can otherwise lose by
+# too little to lower the posterior much
+_MIN_BACKGROUND_MARGIN = 1 / 3
+_SCRIPT_CONFIDENCE = 0.99
+
+# Unicode ranges of scripts that identify a single supported language
+_SCRIPTS = {
+    "ja": ((0x3040, 0x30FF), (0x31F0, 0x31FF)),  # Hiragana, Katakana
+    "ko": ((0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F)),
+    "th": ((0x0E00, 0x0E7F),),
+    "el": ((0x0370, 0x03FF),),
+    "ka": ((0x10A0, 0x10FF),),
+    "hy": ((0x0530, 0x058F),),
+}
+
+_SEED_CORPORA = {
+    "en": (
+        "All human beings are born free and equal in dignity and rights. They are endowed with "
+        "reason and conscience and should act towards one another in a spirit of brotherhood. "
+        "Please check your email and confirm the order before the end of the week. "
+        "We could not find the page you were looking for, but you can go back to the home page. "
+        "This is what they would have wanted, which is why we have been working with them. "
+        "the of and to in is that it for was on are with as be at by this have from or "
+        "one had not but what all were when we there can your which their said if will "
+        "would about out up them then she he many some so these her him into has more "
+        "thank you hello welcome settings account password sign cancel save delete"
+    ),
+    "es": (
+        "Todos los seres humanos nacen libres e iguales en dignidad y derechos y, dotados como "
+        "están de razón y conciencia, deben comportarse fraternalmente los unos con los otros. "
+        "Por favor revise su correo electrónico y confirme el pedido antes del fin de semana. "
+        "No pudimos encontrar la página que buscaba, pero puede volver a la página de inicio. "
+        "Esto es lo que ellos habrían querido, por eso hemos estado trabajando con ellos. "
+        "de la que el en y a los se del las un por con no una su para es al lo como más "
+        "pero sus le ya o este sí porque esta entre cuando muy sin sobre también me hasta "
+        "hay donde quien desde todo nos durante todos uno les ni contra otros ese eso "
+        "gracias hola bienvenido configuración cuenta contraseña cancelar guardar eliminar"
+    ),
+    "fr": (
+        "Tous les êtres humains naissent libres et égaux en dignité et en droits. Ils sont doués "
+        "de raison et de conscience et doivent agir les uns envers les autres dans un esprit de "
+        "fraternité. Veuillez vérifier votre courrier électronique et confirmer la commande avant "
+        "la fin de la semaine. Nous n'avons pas trouvé la page que vous cherchiez, mais vous "
+        "pouvez revenir à la page d'accueil. C'est ce qu'ils auraient voulu, c'est pourquoi nous "
+        "travaillons avec eux. de la le et les des en un du une que est pour qui dans par plus "
+        "pas au sur ne se ce il sont avec son aux ou elle nous vous leur mais comme tout "
+        "merci bonjour bienvenue paramètres compte mot de passe annuler enregistrer supprimer"
+    ),
+    "de": (
+        "Alle Menschen sind frei und gleich an Würde und Rechten geboren. Sie sind mit Vernunft "
+        "und Gewissen begabt und sollen einander im Geist der Brüderlichkeit begegnen. Bitte "
+        "überprüfen Sie Ihre E-Mail und bestätigen Sie die Bestellung vor dem Ende der Woche. "
+        "Wir konnten die gesuchte Seite nicht finden, aber Sie können zur Startseite zurückkehren. "
+        "Das ist es, was sie gewollt hätten, deshalb arbeiten wir mit ihnen zusammen. "
+        "der die und in den von zu das mit sich des auf für ist im dem nicht ein eine als "
+        "auch es an werden aus er hat dass sie nach wird bei einer um am sind noch wie "
+        "danke hallo willkommen einstellungen konto passwort abbrechen speichern löschen"
+    ),
+    "it": (
+        "Tutti gli esseri umani nascono liberi ed eguali in dignità e diritti. Essi sono dotati "
+        "di ragione e di coscienza e devono agire gli uni verso gli altri in spirito di "
+        "fratellanza. Si prega di controllare la posta elettronica e confermare l'ordine prima "
+        "della fine della settimana. Non abbiamo trovato la pagina che cercavi, ma puoi tornare "
+        "alla pagina iniziale. Questo è ciò che avrebbero voluto, per questo lavoriamo con loro. "
+        "di che il la e a per un in non è una sono le si mi con ma ti lo io del della gli "
+        "questo anche come più ci nel se già perché quando tutto molto hanno sul"
+        " grazie ciao benvenuto impostazioni account password annulla salva elimina"
+    ),
+    "pt": (
+        "Todos os seres humanos nascem livres e iguais em dignidade e em direitos. Dotados de "
+        "razão e de consciência, devem agir uns para com os outros em espírito de fraternidade. "
+        "Por favor, verifique o seu e-mail e confirme a encomenda antes do fim da semana. "
+        "Não conseguimos encontrar a página que procurava, mas pode voltar à página inicial. "
+        "Isto é o que eles teriam querido, por isso temos trabalhado com eles. "
+        "de a o que e do da em um para é com não uma os no se na por mais as dos como mas "
+        "foi ao ele das tem à seu sua ou ser quando muito há nos já está também só pelo "
+        "obrigado olá bem-vindo configurações conta senha cancelar salvar excluir você"
+    ),
+    "nl": (
+        "Alle mensen worden vrij en gelijk in waardigheid en rechten geboren. Zij zijn begiftigd "
+        "met verstand en geweten, en behoren zich jegens elkander in een geest van broederschap "
+        "te gedragen. Controleer uw e-mail en bevestig de bestelling voor het einde van de week. "
+        "We konden de pagina die u zocht niet vinden, maar u kunt teruggaan naar de startpagina. "
+        "Dit is wat zij gewild zouden hebben, daarom werken wij met hen samen. "
+        "de en van het een in is dat op te zijn voor met die niet aan er maar om ook als "
+        "dan bij of uit nog wat worden wordt door hij zij naar kan heeft hebben was "
+        "bedankt hallo welkom instellingen account wachtwoord annuleren opslaan verwijderen"
+    ),
+}
+
+# Neighbours of the covered languages that the model must not answer for. They are
+# scored as competing hypotheses only: a text closer to one of them than to every
+# covered language is left to the API instead of being mislabelled (Afrikaans as
+# Dutch, Galician as Spanish, Danish as Dutch, ...)
+_BACKGROUND_CORPORA = {
+    "af": (
+        "Alle menslike wesens word vry, met gelyke waardigheid en regte, gebore. Hulle het rede "
+        "en gewete en behoort in die gees van broederskap teenoor mekaar op te tree. "
+        "Kontroleer asseblief jou e-pos en bevestig die bestelling voor die einde van die week. "
+        "Ons kon nie die bladsy vind wat jy gesoek het nie, maar jy kan terugkeer na die tuisblad. "
+        "Dit is wat hulle sou wou hê, en daarom werk ons al lank saam met hulle. "
+        "die en van in is het nie te dat 'n op vir met wat ek sy hy was om ons hulle jy ook "
+        "maar as by na sal kan word deur aan uit meer baie hierdie daardie wees gaan "
+        "dankie hallo welkom instellings rekening wagwoord kanselleer stoor skrap"
+    ),
+    "gl": (
+        "Tódolos seres humanos nacen libres e iguais en dignidade e dereitos e, dotados como "
+        "están de razón e conciencia, débense comportar fraternalmente uns cos outros. "
+        "Por favor, revisa o teu correo electrónico e confirma o pedido antes da fin de semana. "
+        "Non puidemos atopar a páxina que buscabas, pero podes volver á páxina de inicio. "
+        "Isto é o que eles terían querido, por iso estivemos a traballar con eles. "
+        "de o a que e do da en un para é con non unha os no se na por máis as dos como pero "
+        "foi ao el das ten á seu súa ou ser cando moito hai nos xa está tamén só polo cun "
+        "grazas ola benvido configuración conta contrasinal cancelar gardar eliminar"
+    ),
+    "ca": (
+        "Tots els éssers humans neixen lliures i iguals en dignitat i en drets. Són dotats de raó "
+        "i de consciència, i han de comportar-se fraternalment els uns amb els altres. "
+        "Si us plau, reviseu el vostre correu electrònic i confirmeu la comanda abans de la fi "
+        "de setmana. No hem pogut trobar la pàgina que cercaves, però pots tornar a l'inici. "
+        "Això és el que ells haurien volgut, per això hem estat treballant amb ells. "
+        "de la que el i a les els en un per amb no una es del al com més però seu ho són "
+        "també quan molt hi ja això tot aquest sense fins ha han va ser també nosaltres "
+        "gràcies hola benvingut configuració compte contrasenya cancel·lar desar suprimir"
+    ),
+    "da": (
+        "Alle mennesker er født frie og lige i værdighed og rettigheder. De er udstyret med "
+        "fornuft og samvittighed, og de bør handle mod hverandre i en broderskabets ånd. "
+        "Tjek venligst din e-mail og bekræft ordren inden udgangen af ugen. Vi kunne ikke finde "
+        "den side, du ledte efter, men du kan gå tilbage til forsiden. "
+        "Det er, hvad de ville have ønsket, og derfor har vi arbejdet sammen med dem. "
+        "og i at det er en til på som de med han af for ikke der var jeg den har vi kan "
+        "sig men om hun så eller fra blev efter skal også når have hvad vil meget "
+        "tak hej velkommen indstillinger konto adgangskode annuller gem slet"
+    ),
+    "sv": (
+        "Alla människor är födda fria och lika i värde och rättigheter. De har utrustats med "
+        "förnuft och samvete och bör handla gentemot varandra i en anda av broderskap. "
+        "Kontrollera din e-post och bekräfta beställningen före slutet av veckan. Vi kunde inte "
+        "hitta sidan du letade efter, men du kan gå tillbaka till startsidan. "
+        "Det är vad de skulle ha velat, och därför har vi arbetat tillsammans med dem. "
+        "och i att det som en på är av för med till den har inte om ett var jag men så "
+        "han de vi kan eller från när hon ska också efter bara mycket vad sig "
+        "tack hej välkommen inställningar konto lösenord avbryt spara ta bort"
+    ),
+    "no": (
+        "Alle mennesker er født frie og med samme menneskeverd og menneskerettigheter. De er "
+        "utstyrt med fornuft og samvittighet og bør handle mot hverandre i brorskapets ånd. "
+        "Vennligst sjekk e-posten din og bekreft bestillingen før slutten av uken. Vi fant ikke "
+        "siden du lette etter, men du kan gå tilbake til forsiden. "
+        "Det er dette de ville ha ønsket, og derfor har vi jobbet sammen med dem. "
+        "og i det som er en på til av for med at ikke har den jeg de var vi kan men "
+        "om seg så han hun ble eller fra skal også etter når hva mye bare "
+        "takk hei velkommen innstillinger konto passord avbryt lagre slett"
+    ),
+    "ro": (
+        "Toate ființele umane se nasc libere și egale în demnitate și în drepturi. Ele sunt "
+        "înzestrate cu rațiune și conștiință și trebuie să se comporte unele față de altele în "
+        "spiritul fraternității. Vă rugăm să verificați e-mailul și să confirmați comanda înainte "
+        "de sfârșitul săptămânii. Nu am găsit pagina căutată, dar puteți reveni la pagina "
+        "principală. Asta ar fi vrut ei, de aceea am lucrat împreună cu ei. "
+        "și în de la a cu nu se să pe ce din un o care mai este pentru sunt "
+        "au fost dar sau când foarte acest această prin după lui ei lor "
+        "mulțumesc bună ziua bun venit setări cont parolă anulează salvează șterge"
+    ),
+    "id": (
+        "Semua orang dilahirkan merdeka dan mempunyai martabat dan hak-hak yang sama. Mereka "
+        "dikaruniai akal dan hati nurani dan hendaknya bergaul satu sama lain dalam semangat "
+        "persaudaraan. Silakan periksa email Anda dan konfirmasikan pesanan sebelum akhir pekan. "
+        "Kami tidak dapat menemukan halaman yang Anda cari, tetapi Anda dapat kembali ke beranda. "
+        "Inilah yang mereka inginkan, itulah sebabnya kami telah bekerja sama dengan mereka. "
+        "yang dan di ini itu dengan untuk tidak dari dalam akan pada juga ke karena ada "
+        "saya kami mereka anda bisa sudah atau oleh telah harus lebih tetapi seperti "
+        "terima kasih halo selamat datang pengaturan akun kata sandi batal simpan hapus"
+    ),
+}
+
+
+def _features(text: str) -> list[int]:
+    """
+    Hash the character trigrams and words of a text into profile buckets.
+    """
+    words = "".join(c if c.isalpha() or c == "'" else " " for c in text.lower()).split()
+    features = []
+    for word in words:
+        padded = f" {word} "
+        features.extend(
+            zlib.crc32(padded[i:i + 3].encode("utf-8")) % _BUCKETS
+            for i in range(len(padded) - 2)
+        )
+        features.append(zlib.crc32(b"w:" + word.encode("utf-8")) % _BUCKETS)
+    return features
+
+
+def _script_language(text: str) -> tuple[str | None, int]:
+    """
+    Find a language identified by its script.
+
+    Returns:
+        tuple: The language code (or None) and the number of letters in the text
+    """
+    letters = 0
+    counts = dict.fromkeys(_SCRIPTS, 0)
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        code = ord(char)
+        if code < 0x0370:
+            continue
+        for language, ranges in _SCRIPTS.items():
+            if any(low <= code <= high for low, high in ranges):
+                counts[language] += 1
+                break
+
+    if not letters:
+        return None, 0
+    # Japanese mixes kana with Han characters, so a modest share of kana is enough
+    if counts["ja"] >= 2 and counts["ja"] * 5 >= letters:
+        return "ja", letters
+    for language, count in counts.items():
+        if count >= 2 and count * 2 > letters:
+            return language, letters
+    return None, letters
+
+
+class LanguageIdentifier:
+    """
+    Language Identifier Class
+
+    Identifies the language of short texts without leaving the process.
+
+    Attributes:
+        languages (list[str]): Latin-script languages covered by the n-gram model
+        background (list[str]): Uncovered languages scored as competing hypotheses
+    """
+
+    def __init__(self, corpora: dict[str, str] | None = None, background: dict[str, str] | None = None):
+        """
+        Build the n-gram profiles.
+
+        Args:
+            corpora (dict, optional): Seed text per language code; defaults to the
+                                      embedded corpora
+            background (dict, optional): Seed text per uncovered language code;
+                                         defaults to the embedded background corpora
+        """
+        corpora = corpora or _SEED_CORPORA
+        background = _BACKGROUND_CORPORA if background is None else background
+        self.languages = list(corpora)
+        self.background = [language for language in background if language not in corpora]
+        texts = [corpora[language] for language in self.languages]
+        texts += [background[language] for language in self.background]
+        counts = np.full((len(texts), _BUCKETS), _SMOOTHING, dtype=np.float64)
+        for row, text in enumerate(texts):
+            counts[row] += np.bincount(_features(text), minlength=_BUCKETS)
+        self._log_probs = np.log(counts / counts.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    def detect(self, text: str) -> tuple[str, float] | None:
+        """
+        Identify the language of a text.
+
+        Args:
+            text (str): The text to identify
+
+        Returns:
+            tuple: The language code and a confidence between 0.0 and 1.0, or None if
+                   the text is too short, written in a script the model does not cover,
+                   or not clearly closer to a covered language than to every uncovered one
+        """
+        language, letters = _script_language(text)
+        if language is not None:
+            return language, _SCRIPT_CONFIDENCE
+
+        latin = sum(1 for c in text if c.isalpha() and ord(c) < 0x0250)
+        if latin < _MIN_LATIN_LETTERS or latin * 10 < letters * 9:
+            return None
+
+        features = _features(text)
+        likelihood = self._log_probs[:, features].mean(axis=1)
+        best = int(likelihood.argmax())
+        if best >= len(self.languages) or likelihood[best] < _MIN_LOG_LIKELIHOOD:
+            return None
+        if self.background and likelihood[best] - likelihood[len(self.languages):].max() < _MIN_BACKGROUND_MARGIN:
+            return None
+        scores = np.exp((likelihood - likelihood[best]) * _SHARPNESS)
+        return self.languages[best], float(scores[best] / scores.sum())
@@ -0,0 +1,157 @@
+"""
+Speech Pipeline Service Module
+
+This module chains the speech-to-text, translation and text-to-speech services
+into a single speech-to-speech pipeline that runs in process. The stages overlap:
+each transcript segment is translated as soon as it is recognized, and each
+translated chunk is synthesized as soon as it is translated, so the first audio
+is ready long before the whole recording has been transcribed. The time at which
+every stage produced its first output is recorded for reporting.
+
+Dependencies:
+    - Speech-to-Text, Translation and Text-to-Speech services
+    - Text segmentation and ordered_stream_map for overlapping the stages
+"""
+
+import time
+from contextlib import aclosing
+from typing import AsyncIterable, AsyncIterator
+
+from app.core.config import settings
+from app.services.concurrency import ordered_stream_map
+from app.services.stt_service import STTService
+from app.services.text_segmentation import split_text
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+
+
+class StageTimings:
+    """
+    Stage Timings Class
+
+    Records how long after the start of a pipeline run each stage produced its
+    first output.
+
+    Attributes:
+        started (float): perf_counter() value at the start of the run
+        first (dict): Seconds from the start to the first output, by stage name
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first: dict[str, float] = {}
+
+    async def track(self, stage: str, items: AsyncIterable) -> AsyncIterator:
+        """
+        Pass items through, recording when the first one arrives.
+
+        The source is closed when iteration stops, so closing the last stage of a
+        pipeline cancels the work of every stage before it.
+
+        Args:
+            stage (str): Name of the stage producing the items
+            items (async iterable): The stage's output
+
+        Yields:
+            The items, unchanged
+        """
+        async with aclosing(items):
+            async for item in items:
+                self.first.setdefault(stage, time.perf_counter() - self.started)
+                yield item
+
+
+class SpeechPipelineService:
+    """
+    Speech Pipeline Service Class
+
+    Translates speech into synthesized speech in another language.
+
+    Attributes:
+        stt (STTService): The speech-to-text service
+        translation (TranslationService): The translation service
+        tts (TTSService): The text-to-speech service
+    """
+
+    def __init__(self, stt: STTService, translation: TranslationService, tts: TTSService):
+        """
+        Initialize the pipeline over the shared services.
+
+        Args:
+            stt (STTService): The speech-to-text service
+            translation (TranslationService): The translation service
+            tts (TTSService): The text-to-speech service
+        """
+        self.stt = stt
+        self.translation = translation
+        self.tts = tts
+
+    async def speak_translation(
+        self,
+        audio_content: bytes,
+        source_language: str,
+        target_language: str,
+        tts_language_code: str,
+        voice_name: str,
+        timings: StageTimings | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Transcribe, translate and synthesize speech, yielding the MP3 audio in order.
+
+        Up to PIPELINE_TRANSLATE_CONCURRENCY transcript segments are translated and
+        up to TTS_STREAM_CONCURRENCY translated chunks are synthesized at the same
+        time. Translations are split into chunks like streamed synthesis, with a
+        small first chunk so the first audio is ready quickly.
+
+        Args:
+            audio_content (bytes): Raw audio data
+            source_language (str): The language code of the speech (e.g., 'en-US')
+            target_language (str): The language code to translate to (e.g., 'es')
+            tts_language_code (str): The language code for the voice (e.g., 'es-ES')
+            voice_name (str): The name of the voice to use
+            timings (StageTimings, optional): Receives the first-output time of the
+                                              'stt', 'translate' and 'tts' stages
+
+        Yields:
+            bytes: MP3 audio of each synthesized chunk, in order
+
+        Raises:
+            ValueError: If the target language is not supported
+            Exception: For any upstream API errors
+        """
+        timings = timings or StageTimings()
+
+        async def translate(segment: dict) -> str:
+            result = await self.translation.translate_text(
+                segment["text"], target_language, source_language
+            )
+            return result["translatedText"]
+
+        async def chunks(translations: AsyncIterable[str]) -> AsyncIterator[str]:
+            first = True
+            async with aclosing(translations):
+                async for text in translations:
+                    for chunk in split_text(
+                        text,
+                        max_bytes=settings.TTS_STREAM_CHUNK_BYTES,
+                        first_max_bytes=settings.TTS_STREAM_FIRST_CHUNK_BYTES if first else None,
+                    ):
+                        first = False
+                        yield chunk
+
+        async def synthesize(chunk: str) -> bytes:
+            result = await self.tts.synthesize_speech(chunk, tts_language_code, voice_name)
+            return result["audioContent"]
+
+        segments = timings.track("stt", self.stt.iter_segments(audio_content, source_language))
+        translations = timings.track(
+            "translate",
+            ordered_stream_map(translate, segments, settings.PIPELINE_TRANSLATE_CONCURRENCY),
+        )
+        audio = timings.track(
+            "tts",
+            ordered_stream_map(synthesize, chunks(translations), settings.TTS_STREAM_CONCURRENCY),
+        )
+        async with aclosing(audio):
+            async for clip in audio:
+                yield clip
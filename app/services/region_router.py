@@ -0,0 +1,316 @@
+"""
+Region Router Module
+
+This module spreads the calls of one Google Cloud API over several regional
+endpoints. Each region has its own client and resource parent
+(projects/<project>/locations/<location>), and the router keeps an exponentially
+weighted moving average (EWMA) of the latency and of the error rate of the calls
+sent to it:
+
+    - every call goes to the healthy region with the lowest expected latency,
+      i.e. its latency EWMA inflated by its error rate. A region that has not
+      answered yet is sent one call first, so every region gets measured
+    - a small share of calls (REGION_PROBE_RATIO) goes to another healthy region
+      so the latency of the regions not in use stays up to date
+    - a call failing with a server error (UNAVAILABLE, INTERNAL, ...) is sent
+      again to the next region at once, while the deadline leaves time for it
+    - a region whose error rate EWMA reaches REGION_EJECT_ERROR_RATE is ejected
+      for REGION_EJECT_SECONDS. It then receives calls again on probation: its
+      error rate starts just below the threshold, so a single failure ejects it
+      again while successes bring it back to full health
+
+When every region is ejected, calls are sent to the regions anyway, in the
+order they are due to return, rather than failing without trying.
+
+The router is designed for use from a single event loop and performs no locking.
+
+Dependencies:
+    - google-api-core: For the server error types raised by the clients, imported on first use
+    - Settings from core.config for the project, smoothing and ejection parameters
+    - Resilience helpers for the time remaining until the current deadline
+"""
+
+import math
+import random
+import time
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.services.resilience import time_remaining
+
+# Error rate of a region returning from ejection, as a share of the ejection threshold
+_PROBATION_ERROR_SHARE = 0.75
+# Error rate above which the expected latency of a region stops growing
+_MAX_SCORED_ERROR_RATE = 0.95
+
+
+def parse_regions(spec: str) -> list[tuple[str, str | None]]:
+    """
+    Parse a comma-separated list of regions.
+
+    Each entry is a location, optionally followed by '=' and the API endpoint
+    (host[:port]) serving it, e.g. 'us-central1=us-central1-speech.googleapis.com'.
+
+    Args:
+        spec (str): The list of regions
+
+    Returns:
+        list: (location, endpoint or None) per region, in order; [('global', None)]
+              when the list is empty
+    """
+    regions = []
+    for entry in spec.split(","):
+        location, _, endpoint = entry.strip().partition("=")
+        if location.strip():
+            regions.append((location.strip(), endpoint.strip() or None))
+    return regions or [("global", None)]
+
+
+class Region:
+    """
+    Region Class
+
+    One regional endpoint of an API and the health the router measured for it.
+
+    Attributes:
+        location (str): Location of the region, e.g. 'global' or 'europe-west4'
+        client: The API client connected to the region's endpoint
+        parent (str): Resource parent of the region (projects/<project>/locations/<location>)
+        latency (float): EWMA of the latency of successful calls in seconds, or None
+                         before the first one
+        error_rate (float): EWMA of the share of calls that failed
+        ejected_until (float): time.monotonic() until which the region is ejected
+        calls (int): Number of calls sent to the region
+        failures (int): Number of calls to the region that failed
+        samples (int): Number of latencies measured
+        in_flight (int): Calls to the region not answered yet
+    """
+
+    def __init__(self, location: str, client):
+        """
+        Initialize a region with no measurements.
+
+        Args:
+            location (str): Location of the region
+            client: The API client connected to the region's endpoint
+        """
+        self.location = location
+        self.client = client
+        self.parent = f"projects/{settings.GOOGLE_PROJECT_ID}/locations/{location}"
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.ejected_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.samples = 0
+        self.in_flight = 0
+
+    def score(self) -> float:
+        """
+        Return the expected latency of a call to the region; lower is better.
+        """
+        if self.latency is None:
+            # Measure an unknown region with one call, without sending it a burst
+            return math.inf if self.in_flight else 0.0
+        return self.latency / (1.0 - min(self.error_rate, _MAX_SCORED_ERROR_RATE))
+
+
+class RegionRouter:
+    """
+    Region Router Class
+
+    Sends each call of an API to its best healthy region and fails over to the
+    others when it fails.
+
+    Attributes:
+        name (str): Name of the API, used in log messages
+        regions (list[Region]): The regions, in configuration order
+        alpha (float): Weight of the newest sample in the EWMAs
+        eject_error_rate (float): Error rate EWMA at which a region is ejected
+        eject_seconds (float): Seconds an ejected region receives no calls
+        probe_ratio (float): Share of calls sent to another region to measure it
+        failovers (int): Number of calls sent again to another region
+        ejections (int): Number of times a region was ejected
+    """
+
+    def __init__(
+        self,
+        name: str,
+        regions: list[Region],
+        alpha: float,
+        eject_error_rate: float,
+        eject_seconds: float,
+        probe_ratio: float,
+    ):
+        """
+        Initialize the router with every region healthy.
+
+        Args:
+            name (str): Name of the API, used in log messages
+            regions (list[Region]): The regions, at least one
+            alpha (float): Weight of the newest sample in the EWMAs
+            eject_error_rate (float): Error rate EWMA at which a region is ejected
+            eject_seconds (float): Seconds an ejected region receives no calls
+            probe_ratio (float): Share of calls sent to another region to measure it
+        """
+        if not regions:
+            raise ValueError(f"{name} needs at least one region")
+        self.name = name
+        self.regions = regions
+        self.alpha = alpha
+        self.eject_error_rate = eject_error_rate
+        self.eject_seconds = eject_seconds
+        self.probe_ratio = probe_ratio
+        self.failovers = 0
+        self.ejections = 0
+        self._random = random.Random()
+
+    @classmethod
+    def from_settings(cls, name: str, regions: list[Region]) -> "RegionRouter":
+        """
+        Create a router with the smoothing and ejection parameters from the settings.
+
+        Args:
+            name (str): Name of the API, used in log messages
+            regions (list[Region]): The regions, at least one
+
+        Returns:
+            RegionRouter: The new router
+        """
+        return cls(
+            name,
+            regions,
+            alpha=settings.REGION_EWMA_ALPHA,
+            eject_error_rate=settings.REGION_EJECT_ERROR_RATE,
+            eject_seconds=settings.REGION_EJECT_SECONDS,
+            probe_ratio=settings.REGION_PROBE_RATIO,
+        )
+
+    def ordered(self) -> list[Region]:
+        """
+        Return the regions in the order a call should try them.
+
+        Returns:
+            list[Region]: Healthy regions by expected latency (with the occasional
+                          probe moved first), then ejected regions by the time they return
+        """
+        if len(self.regions) == 1:
+            return self.regions
+        now = time.monotonic()
+        healthy = sorted((r for r in self.regions if r.ejected_until <= now), key=Region.score)
+        ejected = sorted((r for r in self.regions if r.ejected_until > now), key=lambda r: r.ejected_until)
+        if len(healthy) > 1 and self._random.random() < self.probe_ratio:
+            healthy.insert(0, healthy.pop(self._random.randrange(1, len(healthy))))
+        return healthy + ejected
+
+    def choose(self) -> Region:
+        """
+        Return the region a call not routed through call() (e.g. a stream) should use.
+
+        Returns:
+            Region: The first region of ordered()
+        """
+        return self.ordered()[0]
+
+    def region_for(self, resource_name: str) -> Region:
+        """
+        Return the region owning a resource, such as a long-running operation.
+
+        Args:
+            resource_name (str): Name of the resource (projects/.../locations/<location>/...)
+
+        Returns:
+            Region: The region of the resource's location, or the first region
+        """
+        for region in self.regions:
+            if resource_name.startswith(region.parent + "/"):
+                return region
+        return self.regions[0]
+
+    async def call(self, fn: Callable[[Region, float | None], Awaitable]):
+        """
+        Send a call to the best region, failing over to the next ones on server errors.
+
+        Args:
+            fn (callable): Coroutine function performing the call in a region; it
+                           receives the region and the gRPC timeout in seconds (None
+                           without a deadline)
+
+        Returns:
+            The result of the first region that answered
+
+        Raises:
+            Exception: The error of the last region tried, if no region answered
+                       or the error is not a server error
+        """
+        from google.api_core.exceptions import ServerError
+
+        regions = self.ordered()
+        for index, region in enumerate(regions):
+            timeout = time_remaining()
+            start = time.monotonic()
+            region.calls += 1
+            region.in_flight += 1
+            try:
+                result = await fn(region, timeout)
+            except ServerError:
+                region.in_flight -= 1
+                self._record(region, None)
+                remaining = time_remaining()
+                if index + 1 == len(regions) or (remaining is not None and remaining <= 0):
+                    raise
+                self.failovers += 1
+                continue
+            except BaseException:
+                region.in_flight -= 1
+                raise
+            region.in_flight -= 1
+            self._record(region, time.monotonic() - start)
+            return result
+
+    def stats(self) -> dict:
+        """
+        Return the router counters and the health of every region.
+
+        Returns:
+            dict: failovers, ejections, the preferred region and, per region, its
+                  calls, failures, latency EWMA (ms), error rate EWMA and whether it is healthy
+        """
+        now = time.monotonic()
+        stats = {
+            "failovers": self.failovers,
+            "ejections": self.ejections,
+            "preferred": min(
+                (r for r in self.regions if r.ejected_until <= now), key=Region.score, default=self.regions[0]
+            ).location,
+        }
+        for region in self.regions:
+            key = region.location.replace("-", "_")
+            stats[f"{key}_calls"] = region.calls
+            stats[f"{key}_failures"] = region.failures
+            stats[f"{key}_latency_ms"] = region.latency * 1000 if region.latency is not None else 0.0
+            stats[f"{key}_error_rate"] = region.error_rate
+            stats[f"{key}_healthy"] = region.ejected_until <= now
+        return stats
+
+    def _record(self, region: Region, latency: float | None) -> None:
+        """
+        Update a region's EWMAs with the outcome of a call; latency is None for a failure.
+        """
+        failed = latency is None
+        region.error_rate += self.alpha * (float(failed) - region.error_rate)
+        if not failed:
+            region.samples += 1
+            # Average the first samples plainly, so a slow first call (e.g. on a cold
+            # connection) does not outweigh the ones after it for long
+            alpha = max(self.alpha, 1.0 / region.samples)
+            region.latency = latency if region.latency is None else region.latency + alpha * (latency - region.latency)
+            return
+
+        region.failures += 1
+        if region.error_rate >= self.eject_error_rate and len(self.regions) > 1 and region.ejected_until <= time.monotonic():
+            region.ejected_until = time.monotonic() + self.eject_seconds
+            # On its return the region is on probation: one more failure ejects it again
+            region.error_rate = self.eject_error_rate * _PROBATION_ERROR_SHARE
+            self.ejections += 1
+            print(f"{self.name} region {region.location} ejected for {self.eject_seconds:g}s")
@@ -0,0 +1,231 @@
+"""
+Service Registry Module
+
+This module owns the process-wide instances of the Google Cloud backed services.
+Each service (and therefore each gRPC client, channel and set of credentials) is
+created once per worker when the application starts, shared by every request
+through the FastAPI dependency hooks, and closed when the application shuts down.
+
+The service modules import the Google client libraries (and grpc, protobuf and
+numpy with them) only when they build their clients, which takes most of a second
+of CPU. The application therefore starts the registry in the background with
+ServiceRegistry.create(): the libraries are imported in a worker thread while the
+server is already accepting connections, and requests arriving meanwhile wait for
+the registry through get_services().
+
+Dependencies:
+    - Translation, Text-to-Speech and Speech-to-Text services
+    - Speech pipeline service chaining the three
+    - Settings from core.config for warm-up configuration
+    - The process-wide retry budget, for reporting its counters
+    - AuthService for prefetching and refreshing the shared access token
+"""
+
+import asyncio
+import importlib
+
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+from app.services.auth_service import AuthService
+from app.services.pipeline_service import SpeechPipelineService
+from app.services.resilience import retry_budget
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+
+# Modules the services import on first use, loaded ahead of building them
+_PRELOADED_MODULES = (
+    "google.cloud.translate_v3",
+    "google.cloud.texttospeech",
+    "google.cloud.speech_v2",
+    "google.rpc.code_pb2",
+    "app.services.language_id",
+    "app.services.audio_segmentation",
+)
+
+
+def preload() -> None:
+    """
+    Import the client libraries and numpy, which the service modules defer.
+
+    Safe to run in a worker thread: the import system serializes concurrent
+    imports of the same module.
+    """
+    for name in _PRELOADED_MODULES:
+        importlib.import_module(name)
+
+
+async def get_services(connection: HTTPConnection) -> "ServiceRegistry":
+    """
+    Return the application's service registry, waiting for it while the application starts.
+
+    Args:
+        connection (HTTPConnection): The request or WebSocket being served
+
+    Returns:
+        ServiceRegistry: The registry of app.state.services
+
+    Raises:
+        Exception: The error that made the background startup fail
+    """
+    services = getattr(connection.app.state, "services", None)
+    if services is None:
+        # Shielded so a client disconnecting does not cancel the startup for everyone
+        services = await asyncio.shield(connection.app.state.services_startup)
+    return services
+
+
+class ServiceRegistry:
+    """
+    Service Registry Class
+
+    Holds a single instance of each service for the lifetime of the application.
+
+    Attributes:
+        translation: The shared translation service
+        tts: The shared text-to-speech service
+        stt: The shared speech-to-text service
+        pipeline: The speech-to-speech pipeline over the shared services
+    """
+
+    def __init__(
+        self,
+        translation: TranslationService | None = None,
+        tts: TTSService | None = None,
+        stt: STTService | None = None,
+    ):
+        """
+        Create every service, resolving credentials and building the clients once.
+        
+        Must be called inside the running event loop, since the asyncio gRPC
+        channels bind to it.
+        
+        Args:
+            translation (TranslationService, optional): Pre-built translation service
+            tts (TTSService, optional): Pre-built text-to-speech service
+            stt (STTService, optional): Pre-built speech-to-text service
+        """
+        self.translation = translation or TranslationService()
+        self.tts = tts or TTSService()
+        self.stt = stt or STTService()
+        self.pipeline = SpeechPipelineService(self.stt, self.translation, self.tts)
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Collect the counters of every layer in front of the upstream APIs.
+
+        Returns:
+            dict: stats() of each cache, coalescer, single-flight group, quota
+                  scheduler, circuit breaker, retry policy, region router, job
+                  manager and the access token refresher, by component name
+        """
+        translation, tts, stt = self.translation, self.tts, self.stt
+        stats = {
+            "translation_cache": translation.translation_cache.stats(),
+            "detection_cache": translation.detection_cache.stats(),
+            "translation_single_flight": translation.in_flight.stats(),
+            "translation_quota": translation.quota.stats(),
+            "translation_breaker": translation.breaker.stats(),
+            "translate_text_rpc": translation.translate_rpc.stats(),
+            "detect_language_rpc": translation.detect_rpc.stats(),
+            "tts_single_flight": tts.in_flight.stats(),
+            "tts_quota": tts.quota.stats(),
+            "tts_breaker": tts.breaker.stats(),
+            "synthesize_speech_rpc": tts.synthesize_rpc.stats(),
+            "stt_single_flight": stt.in_flight.stats(),
+            "stt_quota": stt.quota.stats(),
+            "stt_breaker": stt.breaker.stats(),
+            "recognize_rpc": stt.recognize_rpc.stats(),
+            "translation_regions": translation.router.stats(),
+            "stt_regions": stt.router.stats(),
+            "retry_budget": retry_budget.stats(),
+            "auth": AuthService.stats(),
+        }
+        if translation.memory is not None:
+            stats["translation_memory"] = translation.memory.stats()
+        if translation.coalescer is not None:
+            stats["translation_coalescer"] = translation.coalescer.stats()
+        if tts.audio_store is not None:
+            stats["tts_audio_store"] = tts.audio_store.stats()
+        if stt.jobs is not None:
+            stats["stt_jobs"] = stt.jobs.stats()
+        return stats
+
+    def _clients(self) -> list:
+        """
+        Return the upstream clients owned by the registered services, one per region.
+        """
+        return [
+            *(region.client for region in self.translation.router.regions),
+            self.tts.client,
+            *(region.client for region in self.stt.router.regions),
+        ]
+
+    @classmethod
+    async def create(cls) -> "ServiceRegistry":
+        """
+        Build and start a registry without blocking the event loop on imports.
+
+        The client libraries are imported in a worker thread first, so the event
+        loop keeps serving requests (e.g. health checks) meanwhile; the clients
+        themselves are then built in the loop, which their channels bind to.
+
+        Returns:
+            ServiceRegistry: The started registry
+
+        Raises:
+            Exception: If a service cannot be built or started, e.g. without credentials
+        """
+        await asyncio.to_thread(preload)
+        registry = cls()
+        try:
+            await registry.start()
+        except BaseException:
+            await registry.close()
+            raise
+        return registry
+
+    async def start(self) -> None:
+        """
+        Open the services' local stores, prefetch the access token and warm up
+        every upstream channel so the first request does not pay for the token
+        round trip, DNS resolution, the TCP/TLS handshake and HTTP/2 setup.
+
+        A channel that fails to connect in time is logged and left to connect
+        lazily; it never prevents the application from starting.
+        """
+        await self.translation.start()
+        await self.tts.start()
+        await self.stt.start()
+        await asyncio.gather(
+            AuthService.start(),
+            *(self._warm_up(client) for client in self._clients())
+        )
+
+    async def close(self) -> None:
+        """
+        Close the translation memory, the transcription jobs, the token refresh
+        task and every upstream channel.
+        """
+        await self.translation.close()
+        await self.stt.close()
+        await AuthService.close()
+        for client in self._clients():
+            try:
+                await client.transport.close()
+            except Exception as e:
+                print(f"Error closing {type(client).__name__}: {str(e)}")
+
+    @staticmethod
+    async def _warm_up(client) -> None:
+        """
+        Wait until the client's channel is ready.
+        """
+        try:
+            await asyncio.wait_for(
+                client.transport.grpc_channel.channel_ready(),
+                timeout=settings.CLIENT_WARMUP_TIMEOUT,
+            )
+        except Exception as e:
+            print(f"Warm-up of {type(client).__name__} failed: {str(e)}")
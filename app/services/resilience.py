@@ -0,0 +1,371 @@
+"""
+Upstream Resilience Module
+
+This module bounds how long upstream calls can hold a request and how much
+extra load the service sends when the Google Cloud APIs misbehave.
+
+Deadlines: every endpoint runs under a deadline (see deadline()) that is stored
+in a context variable, so it follows the request into the tasks it starts. Each
+RPC is sent with the time remaining as its gRPC timeout, and a request whose
+deadline has passed fails with DeadlineExceededError instead of waiting for the
+client library's much longer default timeouts.
+
+Retries: calls failing with a transient error (UNAVAILABLE, ABORTED) are retried
+with fully jittered exponential backoff, as long as the deadline leaves time for
+it. Every retry is paid for from a process-wide RetryBudget that grows with the
+number of calls made, so an outage of an API cannot multiply the traffic sent to it.
+
+Hedging: when enabled, an idempotent call that has not answered within the
+recent latency percentile (p95 by default) of its method is sent a second time
+and the first reply wins; the other copy is cancelled. Hedges are paid for from
+the same budget, so at most a small share of calls is ever duplicated.
+
+The helpers are designed for use from a single event loop and perform no locking.
+
+Dependencies:
+    - google-api-core: For the transient error types raised by the clients,
+      imported on first use to keep it (and grpc) out of application startup
+    - Settings from core.config for deadlines, retry and hedging parameters
+    - core.metrics for per-method call latency and status counters
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError
+
+# Successful calls per method whose latency is kept to derive the hedging delay
+_LATENCY_WINDOW = 200
+# Hedging starts once this many latencies of a method are known
+_MIN_LATENCY_SAMPLES = 20
+# The retry budget saves up at most this many seconds' worth of its minimum rate
+_BUDGET_WINDOW_SECONDS = 10.0
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+def _status(error: BaseException) -> str:
+    """
+    Return the gRPC status name of a failed call, for metrics labels.
+    """
+    if isinstance(error, asyncio.CancelledError):
+        return "CANCELLED"
+    code = getattr(error, "grpc_status_code", None)
+    return code.name if code is not None else "UNKNOWN"
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Run the enclosed code, and the tasks it starts, under a deadline.
+
+    A deadline already in effect is only ever shortened, never extended.
+
+    Args:
+        seconds (float): Time allowed from now; 0 or less leaves the deadline unchanged
+    """
+    if seconds <= 0:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """
+    Return the seconds left until the current deadline.
+
+    Returns:
+        float: Seconds left, negative once the deadline has passed, or None
+               outside of any deadline
+    """
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+class RetryBudget:
+    """
+    Retry Budget Class
+
+    Limits retries and hedges to a share of the calls made. Every call deposits
+    `ratio` tokens, every retry or hedge withdraws one, and a floor of
+    `min_per_second` tokens per second keeps retries possible at low traffic.
+
+    Attributes:
+        ratio (float): Tokens deposited per call
+        min_per_second (float): Tokens added per second regardless of traffic
+        max_balance (float): Most tokens the budget can save up
+        spent (int): Number of retries and hedges allowed
+        refused (int): Number of retries and hedges refused for lack of budget
+    """
+
+    def __init__(self, ratio: float, min_per_second: float):
+        """
+        Initialize a full budget.
+
+        Args:
+            ratio (float): Tokens deposited per call
+            min_per_second (float): Tokens added per second regardless of traffic
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max(1.0, min_per_second * _BUDGET_WINDOW_SECONDS)
+        self.spent = 0
+        self.refused = 0
+        self._balance = self.max_balance
+        self._updated = time.monotonic()
+
+    def deposit(self) -> None:
+        """
+        Record a call, adding `ratio` tokens.
+        """
+        self._balance = min(self._balance + self.ratio, self.max_balance)
+
+    def withdraw(self) -> bool:
+        """
+        Take a token for a retry or hedge.
+
+        Returns:
+            bool: True if the retry or hedge may be sent
+        """
+        now = time.monotonic()
+        self._balance = min(self._balance + (now - self._updated) * self.min_per_second, self.max_balance)
+        self._updated = now
+        if self._balance < 1.0:
+            self.refused += 1
+            return False
+        self._balance -= 1.0
+        self.spent += 1
+        return True
+
+    def stats(self) -> dict:
+        """
+        Return the budget counters.
+
+        Returns:
+            dict: spent, refused and the current balance
+        """
+        return {"spent": self.spent, "refused": self.refused, "balance": self._balance}
+
+
+retry_budget = RetryBudget(settings.RETRY_BUDGET_RATIO, settings.RETRY_BUDGET_MIN_PER_SECOND)
+
+
+class RpcPolicy:
+    """
+    RPC Policy Class
+
+    Sends the calls of one upstream method under the current deadline, retrying
+    transient errors and hedging slow calls within the shared retry budget.
+
+    Attributes:
+        name (str): Name of the upstream method, used in error messages
+        budget (RetryBudget): Budget paying for retries and hedges
+        max_attempts (int): Attempts of a call failing with a transient error
+        base_delay (float): Backoff before the first retry, in seconds
+        max_delay (float): Upper bound of the backoff, in seconds
+        hedge (bool): Whether slow calls are hedged; only for idempotent methods
+        hedge_percentile (float): Latency percentile after which a hedge is sent
+        min_hedge_delay (float): Lower bound of the hedging delay, in seconds
+        calls (int): Number of calls made
+        retries (int): Number of retries sent
+        hedges (int): Number of hedges sent
+        hedge_wins (int): Number of hedges that answered first
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget: RetryBudget,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        min_hedge_delay: float = 0.0,
+    ):
+        """
+        Initialize the policy with no latency history.
+
+        Args:
+            name (str): Name of the upstream method, used in error messages
+            budget (RetryBudget): Budget paying for retries and hedges
+            max_attempts (int): Attempts of a call failing with a transient error
+            base_delay (float): Backoff before the first retry, in seconds
+            max_delay (float): Upper bound of the backoff, in seconds
+            hedge (bool, optional): Whether slow calls are hedged; only for idempotent methods
+            hedge_percentile (float, optional): Latency percentile after which a hedge is sent
+            min_hedge_delay (float, optional): Lower bound of the hedging delay, in seconds
+        """
+        self.name = name
+        self.budget = budget
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    @classmethod
+    def from_settings(cls, name: str, idempotent: bool = False) -> "RpcPolicy":
+        """
+        Create a policy with the retry and hedging parameters from the settings.
+
+        Args:
+            name (str): Name of the upstream method, used in error messages
+            idempotent (bool, optional): Whether the method may be hedged
+
+        Returns:
+            RpcPolicy: The new policy, sharing the process-wide retry budget
+        """
+        return cls(
+            name,
+            budget=retry_budget,
+            max_attempts=settings.RPC_MAX_ATTEMPTS,
+            base_delay=settings.RPC_RETRY_BASE_DELAY_MS / 1000,
+            max_delay=settings.RPC_RETRY_MAX_DELAY_MS / 1000,
+            hedge=idempotent and settings.RPC_HEDGING_ENABLED,
+            hedge_percentile=settings.RPC_HEDGE_PERCENTILE,
+            min_hedge_delay=settings.RPC_HEDGE_MIN_DELAY_MS / 1000,
+        )
+
+    async def call(self, fn: Callable[[float | None], Awaitable]):
+        """
+        Send a call, retrying transient errors and hedging it when slow.
+
+        Args:
+            fn (callable): Coroutine function performing one attempt; it receives the
+                           gRPC timeout in seconds (None without a deadline) and should
+                           disable the client library's own retries
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before an attempt succeeds
+            Exception: The error of the last attempt, if it is not transient or no
+                       attempts or budget are left
+        """
+        from google.api_core import exceptions as google_exceptions
+
+        self.calls += 1
+        self.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                if self.hedge:
+                    return await self._hedged(fn)
+                return await self._attempt(fn)
+            # Errors after which the same request may succeed when sent again
+            except (google_exceptions.ServiceUnavailable, google_exceptions.Aborted):
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                remaining = time_remaining()
+                if (
+                    attempt >= self.max_attempts
+                    or (remaining is not None and remaining <= delay)
+                    or not self.budget.withdraw()
+                ):
+                    raise
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """
+        Return the policy counters.
+
+        Returns:
+            dict: calls, retries, hedges, hedge wins and the current hedging delay
+        """
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay": self._hedge_delay(),
+        }
+
+    async def _attempt(self, fn: Callable[[float | None], Awaitable]):
+        """
+        Send one attempt with the time remaining as its timeout, recording its latency.
+        """
+        remaining = time_remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"{self.name} deadline exceeded")
+        start = time.monotonic()
+        try:
+            result = await fn(remaining)
+        except BaseException as e:
+            from google.api_core import exceptions as google_exceptions
+
+            metrics.UPSTREAM_RPCS.labels(self.name, _status(e)).inc()
+            metrics.UPSTREAM_RPC_DURATION.labels(self.name).observe(time.monotonic() - start)
+            if isinstance(e, google_exceptions.DeadlineExceeded) and remaining is not None:
+                raise DeadlineExceededError(f"{self.name} deadline exceeded") from e
+            raise
+        latency = time.monotonic() - start
+        self._latencies.append(latency)
+        metrics.UPSTREAM_RPCS.labels(self.name, "OK").inc()
+        metrics.UPSTREAM_RPC_DURATION.labels(self.name).observe(latency)
+        return result
+
+    def _hedge_delay(self) -> float | None:
+        """
+        Return how long to wait for an attempt before hedging it, or None while
+        too few latencies are known.
+        """
+        if len(self._latencies) < _MIN_LATENCY_SAMPLES:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))
+        return max(latencies[index], self.min_hedge_delay)
+
+    async def _hedged(self, fn: Callable[[float | None], Awaitable]):
+        """
+        Send an attempt and, if it is slower than the hedging delay, a second one;
+        return the first successful reply.
+        """
+        delay = self._hedge_delay()
+        remaining = time_remaining()
+        if delay is None or (remaining is not None and remaining <= delay):
+            return await self._attempt(fn)
+
+        tasks = [asyncio.ensure_future(self._attempt(fn))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.budget.withdraw():
+                return await tasks[0]
+            self.hedges += 1
+            tasks.append(asyncio.ensure_future(self._attempt(fn)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,309 @@
+"""
+Quota Scheduler Module
+
+This module paces upstream calls so they stay within a Google Cloud API's
+per-minute quota instead of failing once it is exceeded. Each API gets a token
+bucket sized to its quota (characters per minute for translation and synthesis,
+audio seconds per minute for recognition) that refills continuously.
+
+Calls that find the bucket empty wait in a queue served in weighted fair order
+across tenants, so a tenant sending a burst of large requests delays its own
+requests rather than everyone's. Queues are bounded overall, per tenant and by
+the expected wait, which may exceed neither QUOTA_MAX_WAIT_SECONDS nor the time
+left before the request's deadline: a call that would exceed any bound fails
+immediately with QuotaExceededError carrying a Retry-After estimate. RESOURCE_EXHAUSTED errors
+from the API itself are reported the same way and drain the bucket, so queued
+calls back off too.
+
+The scheduler is designed for use from a single event loop and performs no locking.
+
+Dependencies:
+    - google-api-core: For the RESOURCE_EXHAUSTED exception type, imported on first use
+    - Settings from core.config for queue limits and tenant weights
+    - current_tenant from core.middleware for identifying the caller
+    - time_remaining from services.resilience for the request's deadline
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.exceptions import QuotaExceededError
+from app.core.middleware import current_tenant
+from app.services.resilience import time_remaining
+
+if TYPE_CHECKING:
+    from google.api_core.exceptions import ResourceExhausted
+
+# Retry-After reported for RESOURCE_EXHAUSTED errors when no local quota is configured;
+# per-minute quotas are replenished within this time
+_UPSTREAM_RETRY_AFTER_SECONDS = 60.0
+
+
+class _Waiter:
+    __slots__ = ("tag", "seq", "cost", "tenant", "future", "queued")
+
+    def __init__(self, tag: float, seq: int, cost: float, tenant: str, future: asyncio.Future):
+        self.tag = tag
+        self.seq = seq
+        self.cost = cost
+        self.tenant = tenant
+        self.future = future
+        self.queued = True
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.tag, self.seq) < (other.tag, other.seq)
+
+
+class QuotaScheduler:
+    """
+    Quota Scheduler Class
+
+    Admits upstream calls against a per-minute quota, queueing them fairly across
+    tenants when the quota is used up.
+
+    Attributes:
+        name (str): Name of the API, used in error messages
+        per_minute (float): Quota units per minute; 0 disables local pacing
+        max_queue (int): Calls that may wait at the same time
+        max_queue_per_tenant (int): Calls of one tenant that may wait at the same time
+        max_wait (float): Longest expected wait, in seconds, before a call is rejected
+        weights (dict): Share of the quota of each tenant relative to others (default 1)
+        admitted (int): Number of calls admitted
+        delayed (int): Number of admitted calls that had to wait
+        rejected (int): Number of calls rejected
+    """
+
+    def __init__(
+        self,
+        name: str,
+        per_minute: float,
+        max_queue: int,
+        max_queue_per_tenant: int,
+        max_wait: float,
+        weights: dict[str, float] | None = None,
+    ):
+        """
+        Initialize the scheduler with a full bucket.
+
+        Args:
+            name (str): Name of the API, used in error messages
+            per_minute (float): Quota units per minute; 0 disables local pacing
+            max_queue (int): Calls that may wait at the same time
+            max_queue_per_tenant (int): Calls of one tenant that may wait at the same time
+            max_wait (float): Longest expected wait, in seconds, before a call is rejected
+            weights (dict, optional): Share of the quota of each tenant relative to others
+        """
+        self.name = name
+        self.per_minute = per_minute
+        self.max_queue = max_queue
+        self.max_queue_per_tenant = max_queue_per_tenant
+        self.max_wait = max_wait
+        self.weights = weights or {}
+        self.admitted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self._rate = per_minute / 60.0
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._queue: list[_Waiter] = []
+        self._queued_cost = 0.0
+        self._queued_per_tenant: dict[str, int] = {}
+        # Weighted fair queuing: every waiter is tagged with the virtual time at
+        # which it would finish if each tenant were served at its weighted rate
+        self._virtual_time = 0.0
+        self._last_tag: dict[str, float] = {}
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @classmethod
+    def from_settings(cls, name: str, per_minute: float) -> "QuotaScheduler":
+        """
+        Create a scheduler with the queue limits and tenant weights from the settings.
+
+        Args:
+            name (str): Name of the API, used in error messages
+            per_minute (float): Quota units per minute; 0 disables local pacing
+
+        Returns:
+            QuotaScheduler: The new scheduler
+        """
+        return cls(
+            name,
+            per_minute=per_minute,
+            max_queue=settings.QUOTA_MAX_QUEUE,
+            max_queue_per_tenant=settings.QUOTA_MAX_QUEUE_PER_TENANT,
+            max_wait=settings.QUOTA_MAX_WAIT_SECONDS,
+            weights=settings.QUOTA_TENANT_WEIGHTS,
+        )
+
+    async def acquire(self, cost: float, tenant: str | None = None) -> None:
+        """
+        Wait until `cost` quota units are available and take them.
+
+        Args:
+            cost (float): Quota units the call consumes (e.g. characters)
+            tenant (str, optional): The caller; defaults to the current request's tenant
+
+        Raises:
+            QuotaExceededError: If the queue is full or the expected wait is too long,
+                                including longer than the time left before the deadline
+        """
+        if self._rate <= 0:
+            self.admitted += 1
+            return
+        tenant = tenant or current_tenant.get()
+        # A call larger than the whole bucket would never be admitted
+        cost = min(float(cost), self.per_minute)
+        self._refill()
+        if not self._queue and self._tokens >= cost:
+            self._tokens -= cost
+            self.admitted += 1
+            return
+
+        tag = max(self._virtual_time, self._last_tag.get(tenant, 0.0)) + cost / self.weights.get(tenant, 1.0)
+        # Only the calls served before this one delay it
+        ahead = sum(waiter.cost for waiter in self._queue if waiter.tag <= tag)
+        wait = (ahead + cost - self._tokens) / self._rate
+        remaining = time_remaining()
+        if (
+            len(self._queue) >= self.max_queue
+            or self._queued_per_tenant.get(tenant, 0) >= self.max_queue_per_tenant
+            or wait > self.max_wait
+            or (remaining is not None and wait > remaining)
+        ):
+            self.rejected += 1
+            raise QuotaExceededError(f"{self.name} quota exceeded", retry_after=wait)
+
+        self._last_tag[tenant] = tag
+        waiter = _Waiter(tag, next(self._seq), cost, tenant, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        self._queued_cost += cost
+        self._queued_per_tenant[tenant] = self._queued_per_tenant.get(tenant, 0) + 1
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just before being cancelled: return the units
+                self._tokens = min(self._tokens + cost, self.per_minute)
+            elif waiter.queued:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                self._forget(waiter)
+            self._dispatch()
+            raise
+        self.admitted += 1
+        self.delayed += 1
+
+    def charge(self, cost: float) -> None:
+        """
+        Take quota units without waiting, e.g. for live audio that cannot be delayed.
+
+        The bucket may go into debt, which delays the calls that follow.
+
+        Args:
+            cost (float): Quota units consumed
+        """
+        if self._rate <= 0:
+            return
+        self._refill()
+        self._tokens = max(self._tokens - cost, -float(self.per_minute))
+
+    async def call(self, cost: float, fn: Callable[[], Awaitable]):
+        """
+        Run an upstream call once its quota units have been acquired.
+
+        Args:
+            cost (float): Quota units the call consumes
+            fn (callable): Coroutine function performing the call
+
+        Returns:
+            The result of fn
+
+        Raises:
+            QuotaExceededError: If the call is rejected locally, or by the API with
+                                RESOURCE_EXHAUSTED
+        """
+        from google.api_core.exceptions import ResourceExhausted
+
+        await self.acquire(cost)
+        try:
+            return await fn()
+        except ResourceExhausted as e:
+            raise self.exhausted(e, cost)
+
+    def exhausted(self, error: "ResourceExhausted", cost: float = 0.0) -> QuotaExceededError:
+        """
+        Drain the bucket after the API rejected a call with RESOURCE_EXHAUSTED.
+
+        Args:
+            error (ResourceExhausted): The error raised by the client
+            cost (float, optional): Quota units of the rejected call
+
+        Returns:
+            QuotaExceededError: The error to raise in its place
+        """
+        print(f"{self.name} quota exhausted upstream: {str(error)}")
+        if self._rate <= 0:
+            retry_after = _UPSTREAM_RETRY_AFTER_SECONDS
+        else:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            retry_after = (self._queued_cost + cost) / self._rate
+        return QuotaExceededError(f"{self.name} quota exceeded", retry_after=retry_after)
+
+    def stats(self) -> dict:
+        """
+        Return the scheduler counters.
+
+        Returns:
+            dict: admitted, delayed, rejected, queued and available quota units
+        """
+        self._refill()
+        return {
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "queued": len(self._queue),
+            "available": self._tokens,
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self._rate, float(self.per_minute))
+        self._updated = now
+
+    def _forget(self, waiter: _Waiter) -> None:
+        waiter.queued = False
+        self._queued_cost -= waiter.cost
+        self._queued_per_tenant[waiter.tenant] -= 1
+        if not self._queued_per_tenant[waiter.tenant]:
+            # An idle tenant starts again from the current virtual time
+            del self._queued_per_tenant[waiter.tenant]
+            self._last_tag.pop(waiter.tenant, None)
+
+    def _dispatch(self) -> None:
+        """
+        Admit queued calls in fair order while the bucket allows, then schedule
+        the next attempt for when the head of the queue can be admitted.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        while self._queue and (self._queue[0].future.done() or self._tokens >= self._queue[0].cost):
+            waiter = heapq.heappop(self._queue)
+            self._forget(waiter)
+            if waiter.future.done():
+                # Cancelled while waiting
+                continue
+            self._tokens -= waiter.cost
+            self._virtual_time = waiter.tag
+            waiter.future.set_result(None)
+        if self._queue:
+            delay = (self._queue[0].cost - self._tokens) / self._rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
@@ -3,16 +3,109 @@ Speech-to-Text Service Module
 
 This module provides speech-to-text transcription capabilities using Google Cloud Speech-to-Text API.
 It converts audio input into text with support for multiple languages and audio formats.
+Upstream calls use the asyncio gRPC client so they never block the event loop, and
+identical requests in flight at the same time share a single upstream call.
+Audio is passed to the recognizer as raw bytes. Long PCM recordings are decoded and split at
+pauses in a worker thread and their chunks transcribed concurrently. Live audio is recognized over a
+bidirectional stream that is transparently restarted before the API's stream
+duration cap. Recordings in Cloud Storage can be transcribed by asynchronous
+batch jobs. Calls can be spread over several regional endpoints, each sent to the
+region answering fastest and failed over when a region errors.
 
 Dependencies:
-    - google-cloud-speech: Google Cloud Speech-to-Text API client library
-    - base64: For decoding audio content
+    - google-cloud-speech: Google Cloud Speech-to-Text API client library, imported
+      when the clients are built so importing this module stays cheap
+    - SingleFlight for deduplicating identical in-flight requests
+    - Audio segmentation for splitting long recordings at pauses
+    - TranscriptionJobs for tracking batch transcription operations
+    - QuotaScheduler for pacing upstream calls within the API quota
+    - RpcPolicy for deadlines and retries of upstream calls
+    - CircuitBreaker for failing fast while the API is failing
+    - RegionRouter for latency-aware routing and failover between regions
 """
 
-from google.cloud.speech_v2 import SpeechClient
-from google.cloud.speech_v2.types import cloud_speech
+import asyncio
+from contextlib import aclosing
+from typing import TYPE_CHECKING, AsyncIterator
+
 from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
 from app.services.auth_service import AuthService
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.concurrency import SingleFlight, ordered_map, payload_key
+from app.services.region_router import Region, RegionRouter, parse_regions
+from app.services.resilience import RpcPolicy
+from app.services.scheduler import QuotaScheduler
+from app.services.transcription_jobs import TranscriptionJobs
+
+if TYPE_CHECKING:
+    from google.cloud.speech_v2 import SpeechAsyncClient
+    from app.services.audio_segmentation import PcmAudio
+
+# Bytes per sample of the headerless encodings accepted for streaming
+_STREAM_SAMPLE_WIDTHS = {"LINEAR16": 2, "MULAW": 1, "ALAW": 1}
+# Largest audio payload the API accepts in one streaming request
+_MAX_STREAM_CHUNK_BYTES = 25600
+# Byte rate assumed when the duration of an upload cannot be read (16 kHz 16-bit mono)
+_ASSUMED_BYTES_PER_SECOND = 32000
+
+
+def _regional_endpoint(location: str) -> str | None:
+    """
+    Return the API endpoint serving a location; regional recognizers are only
+    served by their regional endpoint.
+    """
+    return None if location == "global" else f"{location}-speech.googleapis.com"
+
+
+def _audio_seconds(audio_content: bytes) -> float:
+    """
+    Return the duration of audio for quota accounting: exact for 16-bit PCM WAV, estimated otherwise.
+    """
+    from app.services.audio_segmentation import wav_duration
+
+    duration = wav_duration(audio_content)
+    if duration is not None:
+        return duration
+    return len(audio_content) / _ASSUMED_BYTES_PER_SECOND
+
+
+def _segments(results) -> list[dict]:
+    """
+    Convert recognition results, each covering the audio after the previous one, to segments.
+    """
+    segments = []
+    start = 0.0
+    for result in results:
+        end = max(start, result.result_end_offset.total_seconds())
+        if result.alternatives and result.alternatives[0].transcript.strip():
+            alternative = result.alternatives[0]
+            segments.append({
+                "text": alternative.transcript.strip(),
+                "confidence": alternative.confidence,
+                "startOffset": start,
+                "endOffset": end,
+            })
+        start = end
+    return segments
+
+
+def _combine(segments: list[dict], language_code: str) -> dict:
+    """
+    Build a transcription result from its segments, weighting confidence by duration.
+    """
+    durations = [max(segment["endOffset"] - segment["startOffset"], 1e-3) for segment in segments]
+    confidence = (
+        sum(segment["confidence"] * duration for segment, duration in zip(segments, durations)) / sum(durations)
+        if segments else 0.0
+    )
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "confidence": confidence,
+        "languageCode": language_code,
+        "segments": segments,
+    }
+
 
 class STTService:
     """
@@ -22,36 +115,93 @@ class STTService:
     allowing conversion of audio content to text with various configuration options.
     
     Attributes:
-        client: An instance of the Google Cloud Speech-to-Text client
+        client: The Google Cloud Speech-to-Text async client of the first region
+        router (RegionRouter): Routes calls between the regions of the API
+        in_flight (SingleFlight): Deduplicates identical transcription calls in flight
+        quota (QuotaScheduler): Paces upstream calls within the audio-seconds-per-minute quota
+        recognize_rpc (RpcPolicy): Deadline and retry policy of Recognize
+        breaker (CircuitBreaker): Short-circuits upstream calls while the API is failing
+        jobs (TranscriptionJobs): Batch transcription jobs, or None when disabled
     """
     
-    def __init__(self):
+    def __init__(self, client: "SpeechAsyncClient | None" = None, regions: list[Region] | None = None):
         """
-        Initialize the Speech-to-Text Service with Google Cloud STT client.
+        Initialize the Speech-to-Text Service with Google Cloud STT clients.
+        
+        Args:
+            client (SpeechAsyncClient, optional): A pre-built client for the global location,
+                                                e.g. one pointed at a local fake backend.
+                                                Must be created inside the running event loop.
+            regions (list[Region], optional): Pre-built regions, instead of client; by default one
+                                              client is built per location of STT_REGIONS
         """
-        # Use AuthService to obtain credentials
-        credentials = AuthService.get_credentials()
-        self.client = SpeechClient(credentials=credentials)
+        if regions is None and client is not None:
+            regions = [Region("global", client)]
+        if regions is None:
+            from google.cloud.speech_v2 import SpeechAsyncClient
+
+            # Use AuthService to obtain credentials
+            credentials = AuthService.get_credentials()
+            regions = [
+                Region(location, SpeechAsyncClient(
+                    credentials=credentials,
+                    client_options={"api_endpoint": endpoint or _regional_endpoint(location)}
+                ))
+                for location, endpoint in parse_regions(settings.STT_REGIONS)
+            ]
+        self.router = RegionRouter.from_settings("Speech-to-Text", regions)
+        self.client = regions[0].client
+        self.in_flight = SingleFlight()
+        self.quota = QuotaScheduler.from_settings("Speech-to-Text", settings.STT_QUOTA_AUDIO_SECONDS_PER_MINUTE)
+        # Recognition is billed per audio second, so it is retried but never hedged
+        self.recognize_rpc = RpcPolicy.from_settings("Recognize")
+        self.breaker = CircuitBreaker.from_settings("Speech-to-Text", settings.STT_CIRCUIT_SLOW_CALL_SECONDS)
+        self.jobs = (
+            TranscriptionJobs(
+                settings.STT_JOBS_DB_PATH,
+                self,
+                max_concurrency=settings.STT_JOBS_MAX_CONCURRENCY,
+                max_per_project=settings.STT_JOBS_MAX_PER_PROJECT,
+                lease_seconds=settings.STT_JOBS_LEASE_SECONDS,
+            )
+            if settings.STT_JOBS_DB_PATH else None
+        )
+
+    async def start(self) -> None:
+        """
+        Open the job table and resume unfinished jobs, if jobs are enabled.
+        """
+        if self.jobs is not None:
+            await self.jobs.start()
+
+    async def close(self) -> None:
+        """
+        Stop tracking batch transcription jobs.
+        """
+        if self.jobs is not None:
+            await self.jobs.close()
 
     async def transcribe_audio(
         self,
-        audio_content: str,
+        audio_content: bytes,
         language_code: str,
     ) -> dict:
         """
         Transcribe audio content to text with specified language and encoding.
         
+        16-bit PCM WAV recordings longer than STT_LONG_AUDIO_CHUNK_SECONDS are
+        transcribed with transcribe_pcm; everything else in a single request.
+        
         Args:
-            audio_content (str): Base64 encoded audio data
+            audio_content (bytes): Raw audio data
             language_code (str): The language code for transcription (e.g., 'en-US')
-            audio_encoding (str, optional): Audio encoding format (default: 'LINEAR16')
-                                        Supported formats: LINEAR16, FLAC, MULAW, AMR, AMR_WB
         
         Returns:
             dict: A dictionary containing:
-                - text: The transcribed text
+                - text: The transcribed text of all results, in order
                 - confidence: Confidence score of the transcription (0.0 to 1.0)
-                - language_code: The language code used for transcription
+                - languageCode: The language code used for transcription
+                - segments: text, confidence, startOffset and endOffset (seconds) of each result
         
         Raises:
             Exception: For any speech-to-text API errors
@@ -60,6 +210,226 @@ class STTService:
             The audio is expected to be 16kHz sample rate. For best results,
             ensure the audio is in the correct format and sample rate before sending.
         """
+        from app.services.audio_segmentation import decode_wav
+
+        audio = await asyncio.to_thread(decode_wav, audio_content)
+        if audio is not None and audio.duration > settings.STT_LONG_AUDIO_CHUNK_SECONDS:
+            return await self.transcribe_pcm(audio, language_code)
+        return await self._recognize(audio_content, language_code)
+
+    async def transcribe_pcm(
+        self,
+        audio: "PcmAudio",
+        language_code: str,
+    ) -> dict:
+        """
+        Transcribe decoded audio of any length as concurrently recognized chunks.
+        
+        The audio is split at pauses into chunks of at most
+        STT_LONG_AUDIO_CHUNK_SECONDS, chunks without speech are skipped, and up to
+        STT_LONG_AUDIO_CONCURRENCY chunks are recognized at the same time. The
+        results are stitched together in order, with offsets measured from the
+        start of the recording.
+        
+        Args:
+            audio (PcmAudio): The decoded audio
+            language_code (str): The language code for transcription (e.g., 'en-US')
+        
+        Returns:
+            dict: The same fields as transcribe_audio
+        
+        Raises:
+            Exception: For any speech-to-text API errors
+        """
+        segments = [segment async for segment in self._pcm_segments(audio, language_code)]
+        return _combine(segments, language_code)
+
+    async def iter_segments(
+        self,
+        audio_content: bytes,
+        language_code: str,
+    ) -> AsyncIterator[dict]:
+        """
+        Transcribe audio content, yielding its segments as soon as each is recognized.
+        
+        Long 16-bit PCM WAV recordings are recognized chunk by chunk as in
+        transcribe_pcm, so the segments of the first chunk are yielded while the
+        later chunks are still being recognized. Other audio is recognized in a
+        single request.
+        
+        Args:
+            audio_content (bytes): Raw audio data
+            language_code (str): The language code for transcription (e.g., 'en-US')
+        
+        Yields:
+            dict: text, confidence, startOffset and endOffset (seconds) of each segment, in order
+        
+        Raises:
+            Exception: For any speech-to-text API errors
+        """
+        from app.services.audio_segmentation import decode_wav
+
+        audio = await asyncio.to_thread(decode_wav, audio_content)
+        if audio is not None and audio.duration > settings.STT_LONG_AUDIO_CHUNK_SECONDS:
+            async with aclosing(self._pcm_segments(audio, language_code)) as segments:
+                async for segment in segments:
+                    yield segment
+            return
+        result = await self._recognize(audio_content, language_code)
+        for segment in result["segments"]:
+            yield segment
+
+    async def _pcm_segments(
+        self,
+        audio: "PcmAudio",
+        language_code: str,
+    ) -> AsyncIterator[dict]:
+        """
+        Recognize the chunks of decoded audio concurrently and yield their segments in order.
+        """
+        from app.services.audio_segmentation import split_on_silence
+
+        # The vectorized frame analysis runs in a worker thread, off the event loop
+        spans = await asyncio.to_thread(
+            split_on_silence,
+            audio,
+            max_seconds=settings.STT_LONG_AUDIO_CHUNK_SECONDS,
+            window_seconds=settings.STT_LONG_AUDIO_SPLIT_WINDOW_SECONDS,
+        )
+
+        async def transcribe_chunk(span: tuple[int, int]) -> tuple[float, dict]:
+            start, end = span
+            result = await self._recognize(audio.to_wav(start, end), language_code)
+            return start / audio.sample_rate, result
+
+        async for offset, result in ordered_map(transcribe_chunk, spans, settings.STT_LONG_AUDIO_CONCURRENCY):
+            for segment in result["segments"]:
+                yield {
+                    **segment,
+                    "startOffset": offset + segment["startOffset"],
+                    "endOffset": offset + segment["endOffset"],
+                }
+
+    async def start_batch_recognize(
+        self,
+        audio_uri: str,
+        language_code: str,
+    ) -> str:
+        """
+        Start a long-running BatchRecognize operation for a recording in Cloud Storage.
+        
+        Args:
+            audio_uri (str): Cloud Storage URI of the recording (gs://...)
+            language_code (str): The language code for transcription (e.g., 'en-US')
+        
+        Returns:
+            str: The name of the operation
+        
+        Raises:
+            Exception: For any speech-to-text API errors
+        """
+        from google.cloud.speech_v2.types import cloud_speech
+
+        region = self.router.choose()
+        request = cloud_speech.BatchRecognizeRequest(
+            recognizer=f"{region.parent}/recognizers/_",
+            config=cloud_speech.RecognitionConfig(
+                auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
+                language_codes=[language_code],
+                model="long",
+            ),
+            files=[cloud_speech.BatchRecognizeFileMetadata(uri=audio_uri)],
+            recognition_output_config=cloud_speech.RecognitionOutputConfig(
+                inline_response_config=cloud_speech.InlineOutputConfig(),
+            ),
+        )
+        operation = await region.client.batch_recognize(request=request)
+        return operation.operation.name
+
+    async def get_batch_operation(
+        self,
+        name: str,
+        language_code: str,
+    ) -> dict:
+        """
+        Fetch the state of a BatchRecognize operation.
+        
+        Args:
+            name (str): The name of the operation
+            language_code (str): The language code the operation was started with
+        
+        Returns:
+            dict: A dictionary containing:
+                - done: Whether the operation has finished
+                - progress: Percent complete (0 to 100)
+                - cancelled: Whether the operation was cancelled (when done)
+                - error: The error message of a failed operation (when done)
+                - result: The transcription, with the fields of transcribe_audio (when done)
+        
+        Raises:
+            Exception: For any speech-to-text API errors
+        """
+        from google.cloud.speech_v2.types import cloud_speech
+        from google.rpc import code_pb2
+
+        operation = await self.router.region_for(name).client.get_operation(request={"name": name})
+        progress = 0
+        if operation.metadata.value:
+            progress = cloud_speech.OperationMetadata.deserialize(operation.metadata.value).progress_percent
+        if not operation.done:
+            return {"done": False, "progress": progress}
+        if operation.HasField("error"):
+            return {
+                "done": True,
+                "progress": progress,
+                "cancelled": operation.error.code == code_pb2.CANCELLED,
+                "error": operation.error.message,
+            }
+
+        response = cloud_speech.BatchRecognizeResponse.deserialize(operation.response.value)
+        segments = []
+        for file_result in response.results.values():
+            if file_result.error.code:
+                return {"done": True, "progress": 100, "error": file_result.error.message}
+            segments.extend(_segments(file_result.inline_result.transcript.results))
+        return {"done": True, "progress": 100, "result": _combine(segments, language_code)}
+
+    async def cancel_batch_operation(self, name: str) -> None:
+        """
+        Ask the API to cancel a BatchRecognize operation.
+        
+        Args:
+            name (str): The name of the operation
+        
+        Raises:
+            Exception: For any speech-to-text API errors
+        """
+        await self.router.region_for(name).client.cancel_operation(request={"name": name})
+
+    async def _recognize(
+        self,
+        audio_content: bytes,
+        language_code: str,
+    ) -> dict:
+        """
+        Transcribe audio in one request, sharing identical requests in flight.
+        """
+        result = await self.in_flight.do(
+            payload_key("recognize", audio_content, language_code),
+            lambda: self._transcribe_fresh(audio_content, language_code),
+        )
+        return dict(result)
+
+    async def _transcribe_fresh(
+        self,
+        audio_content: bytes,
+        language_code: str,
+    ) -> dict:
+        """
+        Transcribe audio content upstream.
+        """
+        from google.cloud.speech_v2.types import cloud_speech
+
         try:
             
             # Configure the recognition settings
@@ -69,83 +439,152 @@ class STTService:
                 model="long",
             )
 
-            # build the request
-            request = cloud_speech.RecognizeRequest(
-                recognizer=f"projects/{settings.GOOGLE_PROJECT_ID}/locations/global/recognizers/_",
-                config=config, 
-                content=audio_content
-                )
+            # build the request for the region it is sent to
+            async def send(region: Region, timeout: float | None):
+                request = cloud_speech.RecognizeRequest(
+                    recognizer=f"{region.parent}/recognizers/_",
+                    config=config, 
+                    content=audio_content
+                    )
+                return await region.client.recognize(request=request, retry=None, timeout=timeout)
             
             # Perform the transcription
-            response = self.client.recognize(request=request)
-            
-            if not response.results:
-                return {
-                    "text": "",
-                    "confidence": 0.0,
-                    "language_code": language_code
-                }
-            
-            result = response.results[0]
-            alternative = result.alternatives[0]
+            response = await self.quota.call(
+                _audio_seconds(audio_content),
+                lambda: self.breaker.call(lambda: self.recognize_rpc.call(lambda _: self.router.call(send))),
+            )
             
-            return {
-                "text": alternative.transcript,
-                "confidence": alternative.confidence,
-                "languageCode": language_code
-            }
+            return _combine(_segments(response.results), language_code)
             
+        except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+            raise
         except Exception as e:
             print(f"STT error: {str(e)}")
             raise 
 
-    async def transcibe_streaming(
+    async def stream_recognize(
         self,
-        stream_file: str,
+        audio: asyncio.Queue,
         language_code: str,
-        audio_encoding: str = "LINEAR16"
-    ) -> dict:
+        encoding: str = "LINEAR16",
+        sample_rate_hertz: int = 16000,
+        audio_channel_count: int = 1,
+        interim_results: bool = True,
+    ) -> AsyncIterator[dict]:
         """
-        Transcribes audio from a audio file stream using Google Cloud STT.
-
+        Recognize live audio, yielding interim and final results as they arrive.
+        
+        Audio chunks are taken from the queue until it yields None. The upstream
+        stream is restarted every STT_STREAM_ROLLOVER_SECONDS, before the API's
+        per-stream duration cap: the old stream is half-closed and drained first so
+        no audio is lost, and result offsets stay relative to the start of the
+        session. Only headerless encodings are accepted, since a restarted stream
+        picks up in the middle of the audio.
+        
         Args:
-            stream_file (str): The path to the audio file to transcribe
+            audio (asyncio.Queue): Audio chunks (bytes), ended by None
             language_code (str): The language code for transcription (e.g., 'en-US')
-            audio_encoding (str, optional): Audio encoding format (default: 'LINEAR16')
-                                        Supported formats: LINEAR16, FLAC, MULAW, AMR, AMR_WB
+            encoding (str, optional): Audio encoding: LINEAR16, MULAW or ALAW
+            sample_rate_hertz (int, optional): Sample rate of the audio
+            audio_channel_count (int, optional): Number of interleaved channels
+            interim_results (bool, optional): Also yield results that may still change
         
-        Returns:
+        Yields:
             dict: A dictionary containing:
                 - text: The transcribed text
+                - isFinal: Whether the result will no longer change
+                - stability: Likelihood that an interim result will not change
+                - confidence: Confidence score of a final result (0.0 to 1.0)
+                - languageCode: The language code of the result
+                - resultEndOffset: Seconds from the start of the session to the end of the result
+        
+        Raises:
+            ValueError: For an unsupported encoding
+            Exception: For any speech-to-text API errors
         """
+        if encoding not in _STREAM_SAMPLE_WIDTHS:
+            raise ValueError(f"Unsupported streaming audio encoding: {encoding}")
+        from google.api_core.exceptions import ResourceExhausted
+        from google.cloud.speech_v2.types import cloud_speech
+
+        bytes_per_second = _STREAM_SAMPLE_WIDTHS[encoding] * sample_rate_hertz * audio_channel_count
+
+        streaming_config = cloud_speech.StreamingRecognitionConfig(
+            config=cloud_speech.RecognitionConfig(
+                explicit_decoding_config=cloud_speech.ExplicitDecodingConfig(
+                    encoding=cloud_speech.ExplicitDecodingConfig.AudioEncoding[encoding],
+                    sample_rate_hertz=sample_rate_hertz,
+                    audio_channel_count=audio_channel_count,
+                ),
+                language_codes=[language_code],
+                model="long",
+            ),
+            streaming_features=cloud_speech.StreamingRecognitionFeatures(
+                interim_results=interim_results,
+            ),
+        )
+        loop = asyncio.get_running_loop()
+        session_offset = 0.0
+        ended = False
         try:
-            # create the audio input object
-            audio = cloud_speech.RecognitionAudio(uri=stream_file)
-            
-            # configure the recognition settings
-            config = cloud_speech.RecognitionConfig(
-                encoding=getattr(cloud_speech.RecognitionConfig.AudioEncoding, audio_encoding),
-                sample_rate_hertz=16000,
-                language_code=language_code,
-                enable_automatic_punctuation=True
-            )
-            
-            # build the request
-            request = cloud_speech.StreamingRecognizeRequest(config=config, audio=audio)
-            
-            # create the streaming client
-            client = self.client.streaming_recognize()
-            
-            # send the request
-            client.send_message(request)
-            
-            # get the response
-            response = client.receive_message()
-            
-            return {
-                "text": response.results[0].alternatives[0].transcript
-            }
-        
+            while not ended:
+                # Open the next stream only once there is audio to send
+                first = await audio.get()
+                if first is None:
+                    break
+                # Live audio cannot wait for quota once a stream is open: the first
+                # chunk is admitted by the scheduler and the rest is charged as sent
+                await self.quota.acquire(len(first) / bytes_per_second)
+                # Every stream, including one rolled over to, goes to the best region at the time
+                region = self.router.choose()
+                config_request = cloud_speech.StreamingRecognizeRequest(
+                    recognizer=f"{region.parent}/recognizers/_",
+                    streaming_config=streaming_config,
+                )
+                rollover_at = loop.time() + settings.STT_STREAM_ROLLOVER_SECONDS
+                sent = 0
+
+                async def requests(chunk: bytes):
+                    nonlocal ended, sent
+                    yield config_request
+                    while True:
+                        for start in range(0, len(chunk), _MAX_STREAM_CHUNK_BYTES):
+                            piece = chunk[start:start + _MAX_STREAM_CHUNK_BYTES]
+                            sent += len(piece)
+                            yield cloud_speech.StreamingRecognizeRequest(audio=piece)
+                        try:
+                            chunk = await asyncio.wait_for(audio.get(), rollover_at - loop.time())
+                        except asyncio.TimeoutError:
+                            return
+                        if chunk is None:
+                            ended = True
+                            return
+                        self.quota.charge(len(chunk) / bytes_per_second)
+
+                # Returning from requests() half-closes the stream; the API then sends
+                # the final results for all audio received before the stream ends
+                call = await region.client.streaming_recognize(requests=requests(first))
+                try:
+                    async for response in call:
+                        for result in response.results:
+                            if not result.alternatives:
+                                continue
+                            alternative = result.alternatives[0]
+                            yield {
+                                "text": alternative.transcript,
+                                "isFinal": result.is_final,
+                                "stability": result.stability,
+                                "confidence": alternative.confidence,
+                                "languageCode": result.language_code or language_code,
+                                "resultEndOffset": session_offset + result.result_end_offset.total_seconds(),
+                            }
+                finally:
+                    call.cancel()
+                session_offset += sent / bytes_per_second
+        except ResourceExhausted as e:
+            raise self.quota.exhausted(e)
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Speech-to-Text streaming error: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,125 @@
+"""
+Text Segmentation Module
+
+This module splits long text into chunks that can be sent to the upstream APIs
+independently. Text is cut at sentence boundaries where possible, then at clause
+boundaries, then at whitespace, and only as a last resort inside a word. Chunk
+sizes are measured in UTF-8 bytes, which is how the Text-to-Speech API limits
+its input.
+"""
+
+import re
+
+# Every boundary is a capture group, so splitting keeps the separators and the
+# pieces can be put back together without adding or losing characters
+_SENTENCE_BOUNDARY = re.compile(r"((?<=[.!?…])\s+|(?<=[。！？])\s*)")
+_CLAUSE_BOUNDARY = re.compile(r"((?<=[,;:，；：、])\s*)")
+_WHITESPACE = re.compile(r"(\s+)")
+
+
+def _size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _split_keeping(boundary: re.Pattern, text: str) -> list[str]:
+    """
+    Split text at a boundary, keeping each separator at the end of the piece before it.
+    """
+    parts = boundary.split(text)
+    pieces = [part + separator for part, separator in zip(parts[::2], parts[1::2] + [""])]
+    return [piece for piece in pieces if piece]
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split text into sentences.
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        list[str]: The non-empty sentences, in order
+    """
+    return [sentence.strip() for sentence in _split_keeping(_SENTENCE_BOUNDARY, text) if sentence.strip()]
+
+
+def _hard_split(text: str, max_bytes: int) -> list[str]:
+    pieces, current, size = [], [], 0
+    for char in text:
+        char_size = _size(char)
+        if current and size + char_size > max_bytes:
+            pieces.append("".join(current))
+            current, size = [], 0
+        current.append(char)
+        size += char_size
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def _split_piece(text: str, max_bytes: int) -> list[str]:
+    """
+    Split one sentence that is too long at ever finer boundaries.
+
+    Trailing whitespace is not counted against the limit and stays on the last piece.
+    """
+    content = text.rstrip()
+    if _size(content) <= max_bytes:
+        return [text]
+    pieces = None
+    for boundary in (_CLAUSE_BOUNDARY, _WHITESPACE):
+        parts = _split_keeping(boundary, content)
+        if len(parts) > 1:
+            pieces = [piece for part in parts for piece in _split_piece(part, max_bytes)]
+            break
+    else:
+        pieces = _hard_split(content, max_bytes)
+    pieces[-1] += text[len(content):]
+    return pieces
+
+
+def _pack(pieces: list[str], first_max_bytes: int, max_bytes: int) -> list[str]:
+    """
+    Greedily merge consecutive pieces into chunks within the byte limits.
+
+    The pieces carry their own separators, so they are concatenated as they are and
+    only the chunks are stripped.
+    """
+    chunks: list[str] = []
+    current = ""
+    for piece in pieces:
+        limit = first_max_bytes if not chunks else max_bytes
+        candidate = current + piece
+        if current.strip() and _size(candidate.strip()) > limit:
+            chunks.append(current.strip())
+            current = piece
+        else:
+            current = candidate
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+def split_text(text: str, max_bytes: int, first_max_bytes: int | None = None) -> list[str]:
+    """
+    Split text into chunks of whole sentences within a byte limit.
+
+    Args:
+        text (str): The text to split
+        max_bytes (int): Maximum UTF-8 size of every chunk
+        first_max_bytes (int, optional): Smaller limit for the first chunk, so the
+                                         first result is ready sooner
+
+    Returns:
+        list[str]: The chunks, in order
+    """
+    first_max_bytes = min(first_max_bytes or max_bytes, max_bytes)
+    sentences = _split_keeping(_SENTENCE_BOUNDARY, text.strip())
+    if not sentences:
+        return []
+
+    # The head sentence is split against the smaller limit so it can form the first chunk
+    pieces = _split_piece(sentences[0], first_max_bytes)
+    for sentence in sentences[1:]:
+        pieces.extend(_split_piece(sentence, max_bytes))
+    return _pack(pieces, first_max_bytes, max_bytes)
@@ -0,0 +1,409 @@
+"""
+Transcription Jobs Module
+
+This module runs asynchronous batch transcription jobs for recordings too long to
+transcribe while an HTTP request is held open. Each job starts a BatchRecognize
+long-running operation, which is then polled with exponential backoff until it
+finishes, fails or is cancelled.
+
+Jobs are kept in a local SQLite table, so their status and results survive
+restarts: jobs that were queued or running when the process stopped are picked
+up again on the next start. At most STT_JOBS_MAX_CONCURRENCY jobs run at the same
+time, and at most STT_JOBS_MAX_PER_PROJECT of them against the same project.
+
+Several processes (e.g. uvicorn workers) can share the table. A process drives a
+job only while it holds the job's lease, which it claims atomically and renews
+before every poll; leases are released on shutdown and otherwise expire after
+STT_JOBS_LEASE_SECONDS, so every job is polled by one process at a time. A job
+whose operation cannot be polled STT_JOBS_MAX_POLL_ERRORS times in a row is
+marked failed.
+
+Dependencies:
+    - sqlite3: Storage engine for the job table
+    - Speech-to-Text service for starting, polling and cancelling operations
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from app.core.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    audio_uri TEXT NOT NULL,
+    language_code TEXT NOT NULL,
+    status TEXT NOT NULL,
+    operation TEXT,
+    progress INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+# Columns added since the first version of the table, with their definitions
+_MIGRATIONS = {
+    "lease_owner": "TEXT",
+    "lease_expires": "REAL NOT NULL DEFAULT 0",
+}
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+_ACTIVE = (QUEUED, RUNNING)
+
+_COLUMNS = (
+    "id, project, audio_uri, language_code, status, operation, progress, "
+    "result, error, created_at, updated_at"
+)
+
+
+def _row_to_job(row: tuple) -> dict:
+    return {
+        "jobId": row[0],
+        "project": row[1],
+        "audioUri": row[2],
+        "languageCode": row[3],
+        "status": row[4],
+        "operation": row[5],
+        "progress": row[6],
+        "result": json.loads(row[7]) if row[7] else None,
+        "error": row[8],
+        "createdAt": row[9],
+        "updatedAt": row[10],
+    }
+
+
+class TranscriptionJobs:
+    """
+    Transcription Jobs Class
+
+    Submits, tracks and cancels batch transcription jobs.
+
+    Attributes:
+        path (str): Location of the SQLite database file
+        service: The speech-to-text service running the operations
+        max_concurrency (int): Jobs running at the same time
+        max_per_project (int): Jobs running at the same time against one project
+        lease_seconds (float): How long a claimed job stays owned by this process
+                               without being renewed
+        worker_id (str): Identifies this process as the owner of job leases
+    """
+
+    def __init__(
+        self,
+        path: str,
+        service,
+        max_concurrency: int,
+        max_per_project: int,
+        lease_seconds: float = 180.0,
+    ):
+        """
+        Initialize the job manager. The job table is opened by start().
+
+        Args:
+            path (str): Location of the SQLite database file
+            service (STTService): The speech-to-text service running the operations
+            max_concurrency (int): Jobs running at the same time
+            max_per_project (int): Jobs running at the same time against one project
+            lease_seconds (float, optional): How long a claimed job stays owned without
+                                             being renewed; raised to twice
+                                             STT_JOBS_POLL_MAX_SECONDS if shorter, so a
+                                             lease never expires between two polls
+        """
+        self.path = path
+        self.service = service
+        self.max_concurrency = max_concurrency
+        self.max_per_project = max_per_project
+        self.lease_seconds = max(lease_seconds, 2 * settings.STT_JOBS_POLL_MAX_SECONDS)
+        self.worker_id = uuid.uuid4().hex
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._project_slots: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(max_per_project)
+        )
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._starting: set[str] = set()
+
+    async def start(self) -> None:
+        """
+        Open the job table and resume every job that was queued or running.
+        """
+        await asyncio.to_thread(self._open)
+        for job in await self._query(
+            f"SELECT {_COLUMNS} FROM jobs WHERE status IN (?, ?) ORDER BY created_at", _ACTIVE
+        ):
+            self._schedule(job["jobId"], job["project"])
+
+    async def close(self) -> None:
+        """
+        Stop tracking jobs and close the job table.
+
+        Jobs still queued or running stay so in the table and resume on the next
+        start. Their leases are released, so another process may take them over at once.
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._connection is not None:
+            await self._execute(
+                "UPDATE jobs SET lease_owner = NULL, lease_expires = 0 WHERE lease_owner = ?",
+                (self.worker_id,),
+            )
+            self._connection.close()
+            self._connection = None
+
+    async def submit(self, audio_uri: str, language_code: str, project: str | None = None) -> dict:
+        """
+        Queue a new transcription job.
+
+        Args:
+            audio_uri (str): Cloud Storage URI of the recording (gs://...)
+            language_code (str): The language code for transcription (e.g., 'en-US')
+            project (str, optional): Project the job counts against; defaults to
+                                     GOOGLE_PROJECT_ID
+
+        Returns:
+            dict: The new job
+        """
+        project = project or settings.GOOGLE_PROJECT_ID
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        await self._execute(
+            "INSERT INTO jobs (id, project, audio_uri, language_code, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, project, audio_uri, language_code, QUEUED, now, now),
+        )
+        self._schedule(job_id, project)
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> dict | None:
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): The job identifier
+
+        Returns:
+            dict: The job, including its result once it has succeeded, or None if unknown
+        """
+        rows = await self._query(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    async def cancel(self, job_id: str) -> dict | None:
+        """
+        Cancel a job that has not finished yet.
+
+        Finished jobs are left unchanged.
+
+        Args:
+            job_id (str): The job identifier
+
+        Returns:
+            dict: The job after cancellation, or None if unknown
+        """
+        job = await self.get(job_id)
+        if job is None or job["status"] not in _ACTIVE:
+            return job
+        await self._update(job_id, status=CANCELLED, only_active=True)
+        if job["operation"]:
+            await self._cancel_operation(job["operation"])
+        elif job["status"] == QUEUED:
+            # The job has not reached the API yet; a job that is starting its
+            # operation right now cancels it as soon as it is recorded
+            task = self._tasks.get(job_id)
+            if task is not None and not task.done() and job_id not in self._starting:
+                task.cancel()
+        return await self.get(job_id)
+
+    def stats(self) -> dict:
+        """
+        Return the job manager counters.
+
+        Returns:
+            dict: active jobs tracked by this process
+        """
+        return {"active": len(self._tasks)}
+
+    def _schedule(self, job_id: str, project: str) -> None:
+        if job_id in self._tasks:
+            return
+        task = asyncio.create_task(self._run(job_id, project))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: str, project: str) -> None:
+        """
+        Drive one job to completion within the concurrency limits.
+        """
+        try:
+            async with self._project_slots[project], self._slots:
+                job = await self._claim(job_id)
+                if job is None:
+                    return
+                operation = job["operation"]
+                if operation is None:
+                    operation = await self._start_operation(job)
+                    if operation is None:
+                        return
+                await self._poll(job, operation)
+        except Exception as e:
+            print(f"Transcription job {job_id} error: {str(e)}")
+
+    async def _start_operation(self, job: dict) -> str | None:
+        """
+        Start the upstream operation of a queued job and record it.
+
+        Returns:
+            str: The operation name, or None if the job failed or was cancelled meanwhile
+        """
+        job_id = job["jobId"]
+        self._starting.add(job_id)
+        try:
+            try:
+                operation = await self.service.start_batch_recognize(job["audioUri"], job["languageCode"])
+            except Exception as e:
+                print(f"Transcription job {job_id} failed to start: {str(e)}")
+                await self._update(job_id, status=FAILED, error=str(e), only_active=True)
+                return None
+            await self._update(job_id, status=RUNNING, operation=operation, only_active=True)
+        finally:
+            self._starting.discard(job_id)
+
+        current = await self.get(job_id)
+        if current is None or current["status"] == CANCELLED:
+            await self._cancel_operation(operation)
+            return None
+        return operation
+
+    async def _poll(self, job: dict, operation: str) -> None:
+        """
+        Poll an operation with jittered exponential backoff until it is done.
+        """
+        job_id = job["jobId"]
+        interval = settings.STT_JOBS_POLL_INITIAL_SECONDS
+        errors = 0
+        while True:
+            await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+            interval = min(interval * 2, settings.STT_JOBS_POLL_MAX_SECONDS)
+
+            # Renewing the lease also stops polling once the job was cancelled or
+            # taken over by another process
+            current = await self._claim(job_id)
+            if current is None:
+                return
+            try:
+                state = await self.service.get_batch_operation(operation, job["languageCode"])
+            except Exception as e:
+                # Keep polling through transient errors; the operation runs upstream regardless
+                errors += 1
+                print(f"Transcription job {job_id} poll error: {str(e)}")
+                if errors >= settings.STT_JOBS_MAX_POLL_ERRORS:
+                    await self._update(
+                        job_id, status=FAILED, only_active=True,
+                        error=f"Polling the operation failed {errors} times in a row: {str(e)}",
+                    )
+                    await self._cancel_operation(operation)
+                    return
+                continue
+            errors = 0
+
+            if not state["done"]:
+                if state["progress"] != current["progress"]:
+                    await self._update(job_id, progress=state["progress"], only_active=True)
+                continue
+            if state.get("cancelled"):
+                await self._update(job_id, status=CANCELLED, only_active=True)
+            elif state.get("error"):
+                await self._update(job_id, status=FAILED, error=state["error"], only_active=True)
+            else:
+                await self._update(
+                    job_id, status=SUCCEEDED, progress=100,
+                    result=json.dumps(state["result"]), only_active=True,
+                )
+            return
+
+    async def _cancel_operation(self, operation: str) -> None:
+        try:
+            await self.service.cancel_batch_operation(operation)
+        except Exception as e:
+            print(f"Error cancelling operation {operation}: {str(e)}")
+
+    async def _claim(self, job_id: str) -> dict | None:
+        """
+        Take or renew the lease of a job that is still queued or running.
+
+        Returns:
+            dict: The job, or None if it is finished, unknown or leased by another process
+        """
+        now = time.time()
+
+        def claim():
+            with self._lock, self._connection:
+                return self._connection.execute(
+                    "UPDATE jobs SET lease_owner = ?, lease_expires = ? "
+                    "WHERE id = ? AND status IN (?, ?) "
+                    "AND (lease_owner IS NULL OR lease_owner = ? OR lease_expires < ?) "
+                    f"RETURNING {_COLUMNS}",
+                    (self.worker_id, now + self.lease_seconds, job_id, *_ACTIVE, self.worker_id, now),
+                ).fetchall()
+
+        rows = await asyncio.to_thread(claim)
+        return _row_to_job(rows[0]) if rows else None
+
+    async def _update(self, job_id: str, only_active: bool = False, **fields) -> None:
+        """
+        Update columns of a job, optionally only while it is still queued or running.
+        """
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        sql = f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?"
+        parameters = (*fields.values(), time.time(), job_id)
+        if only_active:
+            sql += " AND status IN (?, ?)"
+            parameters += _ACTIVE
+        await self._execute(sql, parameters)
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for column, definition in _MIGRATIONS.items():
+            if column not in columns:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        connection.commit()
+        self._connection = connection
+
+    async def _execute(self, sql: str, parameters: tuple) -> None:
+        def execute():
+            with self._lock, self._connection:
+                self._connection.execute(sql, parameters)
+
+        await asyncio.to_thread(execute)
+
+    async def _query(self, sql: str, parameters: tuple) -> list[dict]:
+        def query():
+            with self._lock:
+                return self._connection.execute(sql, parameters).fetchall()
+
+        return [_row_to_job(row) for row in await asyncio.to_thread(query)]
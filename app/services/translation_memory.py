@@ -0,0 +1,354 @@
+"""
+Translation Memory Module
+
+This module provides a persistent translation memory backed by SQLite. Segments
+translated by the upstream API are stored on local disk, survive restarts, and are
+shared by every worker on the node through SQLite's write-ahead log.
+
+Lookups first try an exact match on the normalized segment and language pair. When
+a similarity threshold is configured, near-duplicates are found through a MinHash
+locality-sensitive index over character trigrams and ranked by their exact Jaccard
+similarity. New segments are written back in batches by a background task so that
+requests never wait on disk writes.
+
+Dependencies:
+    - sqlite3: Storage engine for the segment table and the MinHash band index
+    - ResultCache helpers for text normalization
+"""
+
+import asyncio
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+from app.services.cache import normalize_text
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    source_language TEXT NOT NULL,
+    target_language TEXT NOT NULL,
+    mime_type TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    detected_source_language TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segment_bands (
+    band TEXT NOT NULL,
+    segment_id INTEGER NOT NULL REFERENCES segments(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS segment_bands_band ON segment_bands (band);
+CREATE INDEX IF NOT EXISTS segment_bands_segment ON segment_bands (segment_id);
+"""
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_NUM_PERMUTATIONS = 32
+_BANDS = 8
+_ROWS_PER_BAND = _NUM_PERMUTATIONS // _BANDS
+_MAX_CANDIDATES = 50
+_WRITE_BATCH_SIZE = 256
+_WRITE_QUEUE_SIZE = 10000
+
+# Fixed seed so every worker and every restart produce the same signatures
+_rng = random.Random(0x7E57AB1E)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(_NUM_PERMUTATIONS)
+]
+
+
+def _shingles(text: str) -> set[str]:
+    """
+    Split text into the set of its lower-cased character trigrams.
+    """
+    text = " ".join(text.lower().split())
+    if len(text) < 3:
+        return {text}
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _signature(shingles: set[str]) -> list[int]:
+    """
+    Compute the MinHash signature of a shingle set.
+    """
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TranslationMemory:
+    """
+    Translation Memory Class
+
+    A disk-backed store of previously translated segments with exact and fuzzy lookup.
+
+    Attributes:
+        path (str): Location of the SQLite database file
+        fuzzy_threshold (float): Minimum Jaccard similarity for a fuzzy match; 0 disables fuzzy lookup
+        exact_hits (int): Number of lookups answered by an exact match
+        fuzzy_hits (int): Number of lookups answered by a near-duplicate
+        misses (int): Number of lookups with no match
+        writes (int): Number of segments written back
+        dropped_writes (int): Number of segments dropped because the write queue was full
+    """
+
+    def __init__(self, path: str, fuzzy_threshold: float = 0.0):
+        """
+        Initialize the translation memory. The database is opened by start().
+
+        Args:
+            path (str): Location of the SQLite database file
+            fuzzy_threshold (float, optional): Minimum Jaccard similarity for a fuzzy match
+        """
+        self.path = path
+        self.fuzzy_threshold = fuzzy_threshold
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.dropped_writes = 0
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._queue: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+
+    @staticmethod
+    def segment_key(text: str, source_language: str | None, target_language: str, mime_type: str) -> str:
+        """
+        Build the exact-match key of a segment.
+
+        Args:
+            text (str): The normalized source text
+            source_language (str, optional): The source language code, None when auto-detected
+            target_language (str): The target language code
+            mime_type (str): Format of the text
+
+        Returns:
+            str: A hex digest identifying the segment and language pair
+        """
+        material = "\x1f".join((source_language or "", target_language, mime_type, text))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def start(self) -> None:
+        """
+        Create the schema if needed and start the background writer.
+        """
+        await asyncio.to_thread(self._connection)
+        self._queue = asyncio.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self) -> None:
+        """
+        Flush pending writes, stop the background writer and close the database.
+        """
+        if self._writer is not None:
+            await self._queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    async def lookup(
+        self,
+        text: str,
+        source_language: str | None,
+        target_language: str,
+        mime_type: str,
+    ) -> dict | None:
+        """
+        Find a stored translation for a segment.
+
+        Args:
+            text (str): The source text
+            source_language (str, optional): The source language code, None when auto-detected
+            target_language (str): The target language code
+            mime_type (str): Format of the text
+
+        Returns:
+            dict: translatedText, detectedSourceLanguage, score (1.0 for exact matches) and
+                  exact, or None if nothing is similar enough
+        """
+        try:
+            match = await asyncio.to_thread(
+                self._lookup, normalize_text(text), source_language, target_language, mime_type
+            )
+        except Exception as e:
+            # A broken memory must never fail a translation; fall through to the API
+            print(f"Translation memory lookup error: {str(e)}")
+            match = None
+        if match is None:
+            self.misses += 1
+        elif match["exact"]:
+            self.exact_hits += 1
+        else:
+            self.fuzzy_hits += 1
+        return match
+
+    def record(
+        self,
+        text: str,
+        source_language: str | None,
+        target_language: str,
+        mime_type: str,
+        translated_text: str,
+        detected_source_language: str | None,
+    ) -> None:
+        """
+        Queue a fresh upstream translation for asynchronous write-back.
+
+        Never blocks; the segment is dropped if the write queue is full.
+
+        Args:
+            text (str): The source text
+            source_language (str, optional): The source language code, None when auto-detected
+            target_language (str): The target language code
+            mime_type (str): Format of the text
+            translated_text (str): The translation returned by the upstream API
+            detected_source_language (str, optional): The source language reported by the API
+        """
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait((
+                normalize_text(text), source_language, target_language, mime_type,
+                translated_text, detected_source_language,
+            ))
+        except asyncio.QueueFull:
+            self.dropped_writes += 1
+
+    def stats(self) -> dict:
+        """
+        Return the translation memory counters.
+
+        Returns:
+            dict: exact_hits, fuzzy_hits, misses, writes, dropped_writes and pending_writes
+        """
+        return {
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "dropped_writes": self.dropped_writes,
+            "pending_writes": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Return the calling thread's connection, opening it on first use.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    @staticmethod
+    def _band_keys(signature: list[int], source_language: str | None, target_language: str, mime_type: str) -> list[str]:
+        scope = f"{source_language or ''}|{target_language}|{mime_type}"
+        keys = []
+        for band in range(_BANDS):
+            rows = signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND]
+            digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).hexdigest()
+            keys.append(f"{scope}|{band}:{digest}")
+        return keys
+
+    def _lookup(self, text: str, source_language: str | None, target_language: str, mime_type: str) -> dict | None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT translated_text, detected_source_language FROM segments WHERE key = ?",
+            (self.segment_key(text, source_language, target_language, mime_type),),
+        ).fetchone()
+        if row is not None:
+            return {"translatedText": row[0], "detectedSourceLanguage": row[1], "score": 1.0, "exact": True}
+
+        if self.fuzzy_threshold <= 0:
+            return None
+
+        shingles = _shingles(text)
+        bands = self._band_keys(_signature(shingles), source_language, target_language, mime_type)
+        candidates = connection.execute(
+            f"""
+            SELECT source_text, translated_text, detected_source_language FROM segments
+            WHERE id IN (
+                SELECT DISTINCT segment_id FROM segment_bands
+                WHERE band IN ({",".join("?" * len(bands))})
+                LIMIT {_MAX_CANDIDATES}
+            )
+            """,
+            bands,
+        ).fetchall()
+
+        best = None
+        best_score = self.fuzzy_threshold
+        for source_text, translated_text, detected in candidates:
+            score = _jaccard(shingles, _shingles(source_text))
+            if score >= best_score:
+                best, best_score = (translated_text, detected), score
+        if best is None:
+            return None
+        return {"translatedText": best[0], "detectedSourceLanguage": best[1], "score": best_score, "exact": False}
+
+    def _write(self, rows: list[tuple]) -> None:
+        connection = self._connection()
+        now = time.time()
+        with connection:
+            for text, source, target, mime_type, translated, detected in rows:
+                key = self.segment_key(text, source, target, mime_type)
+                connection.execute("DELETE FROM segments WHERE key = ?", (key,))
+                cursor = connection.execute(
+                    """
+                    INSERT INTO segments (key, source_language, target_language, mime_type,
+                                          source_text, translated_text, detected_source_language, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, source or "", target, mime_type, text, translated, detected, now),
+                )
+                bands = self._band_keys(_signature(_shingles(text)), source, target, mime_type)
+                connection.executemany(
+                    "INSERT INTO segment_bands (band, segment_id) VALUES (?, ?)",
+                    [(band, cursor.lastrowid) for band in bands],
+                )
+
+    async def _write_loop(self) -> None:
+        """
+        Drain the write queue in batches until cancelled.
+        """
+        while True:
+            rows = [await self._queue.get()]
+            while len(rows) < _WRITE_BATCH_SIZE and not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write, rows)
+                self.writes += len(rows)
+            except Exception as e:
+                print(f"Translation memory write error: {str(e)}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
@@ -3,16 +3,49 @@ Translation Service Module
 
 This module provides translation capabilities using Google Cloud Translation API.
 It handles text translation between different languages while providing error handling
-and logging functionality.
+and logging functionality. Upstream calls use the asyncio gRPC client so they never block
+the event loop, repeated translations and detections are answered from an in-memory
+result cache, and previously translated segments are reused from a persistent translation
+memory. Large sets of segments are deduplicated and packed into as few concurrent
+upstream requests as the API limits allow, and concurrent single translations can
+optionally be coalesced into shared requests. Language detection is answered in-process
+when the local identifier is confident enough. While the API is failing, a circuit breaker
+fails calls fast and expired cache entries or translation memory near-duplicates are
+served instead, flagged as stale. Calls can be spread over several regional endpoints,
+each sent to the region answering fastest and failed over when a region errors.
 
 Dependencies:
-    - google-cloud-translate: Google Cloud Translation API client library
+    - google-cloud-translate: Google Cloud Translation API client library, imported
+      when the clients are built so importing this module stays cheap
     - Settings from core.config for supported language configuration
+    - ResultCache for caching translation and detection results
+    - TranslationMemory for exact and fuzzy reuse of stored segments
+    - RequestCoalescer for micro-batching concurrent translations
+    - SingleFlight for deduplicating identical in-flight requests
+    - LanguageIdentifier for local language detection
+    - QuotaScheduler for pacing upstream calls within the API quota
+    - RpcPolicy for deadlines, retries and hedging of upstream calls
+    - CircuitBreaker for failing fast while the API is failing
+    - RegionRouter for latency-aware routing and failover between regions
 """
 
-from google.cloud import translate_v3
+import asyncio
+from typing import TYPE_CHECKING
+
 from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, TranslationError, UpstreamUnavailableError
 from app.services.auth_service import AuthService
+from app.services.batching import RequestCoalescer
+from app.services.cache import ResultCache, normalize_text
+from app.services.circuit_breaker import CircuitBreaker, is_upstream_failure
+from app.services.concurrency import SingleFlight, payload_key
+from app.services.region_router import Region, RegionRouter, parse_regions
+from app.services.resilience import RpcPolicy
+from app.services.scheduler import QuotaScheduler
+from app.services.translation_memory import TranslationMemory
+
+if TYPE_CHECKING:
+    from google.cloud import translate_v3
 
 
 class TranslationService:
@@ -23,23 +56,108 @@ class TranslationService:
     handling text translation between different languages.
     
     Attributes:
-        client: An instance of the Google Cloud Translation client
+        client: The Google Cloud Translation async client of the first region
+        router (RegionRouter): Routes calls between the regions of the API
+        translation_cache (ResultCache): Cache of translate_text results
+        detection_cache (ResultCache): Cache of detect_language results
+        memory (TranslationMemory): Persistent translation memory, or None when disabled
+        coalescer (RequestCoalescer): Micro-batcher for translate_text, or None when disabled
+        in_flight (SingleFlight): Deduplicates identical translate and detect calls in flight
+        quota (QuotaScheduler): Paces upstream calls within the characters-per-minute quota
+        translate_rpc (RpcPolicy): Deadline, retry and hedging policy of TranslateText
+        detect_rpc (RpcPolicy): Deadline, retry and hedging policy of DetectLanguage
+        breaker (CircuitBreaker): Short-circuits upstream calls while the API is failing
+        language_id (LanguageIdentifier): Local language identifier, or None when disabled
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        client: "translate_v3.TranslationServiceAsyncClient | None" = None,
+        regions: list[Region] | None = None
+    ):
+        """
+        Initialize the Translation Service with Google Cloud Translation clients.
+        
+        Args:
+            client (TranslationServiceAsyncClient, optional): A pre-built client for the global
+                                                            location, e.g. one pointed at a local
+                                                            fake backend.
+                                                            Must be created inside the running event loop.
+            regions (list[Region], optional): Pre-built regions, instead of client; by default one
+                                              client is built per location of TRANSLATION_REGIONS
+        """
+        if regions is None and client is not None:
+            regions = [Region("global", client)]
+        if regions is None:
+            from google.cloud import translate_v3
+
+            # Use AuthService to obtain credentials
+            credentials = AuthService.get_credentials()
+            regions = [
+                Region(location, translate_v3.TranslationServiceAsyncClient(
+                    credentials=credentials,
+                    client_options={"api_endpoint": endpoint} if endpoint else None
+                ))
+                for location, endpoint in parse_regions(settings.TRANSLATION_REGIONS)
+            ]
+        self.router = RegionRouter.from_settings("Translation", regions)
+        self.client = regions[0].client
+        self.translation_cache = ResultCache(
+            max_bytes=settings.TRANSLATION_CACHE_MAX_BYTES,
+            ttl=settings.RESULT_CACHE_TTL_SECONDS,
+        )
+        self.detection_cache = ResultCache(
+            max_bytes=settings.DETECTION_CACHE_MAX_BYTES,
+            ttl=settings.RESULT_CACHE_TTL_SECONDS,
+        )
+        self.memory = None
+        if settings.TRANSLATION_MEMORY_PATH:
+            self.memory = TranslationMemory(
+                path=settings.TRANSLATION_MEMORY_PATH,
+                fuzzy_threshold=settings.TRANSLATION_MEMORY_FUZZY_THRESHOLD,
+            )
+        self.in_flight = SingleFlight()
+        self.quota = QuotaScheduler.from_settings("Translation", settings.TRANSLATION_QUOTA_CHARS_PER_MINUTE)
+        self.translate_rpc = RpcPolicy.from_settings("TranslateText", idempotent=True)
+        self.detect_rpc = RpcPolicy.from_settings("DetectLanguage", idempotent=True)
+        self.breaker = CircuitBreaker.from_settings("Translation")
+        self.language_id = None
+        if settings.LOCAL_LANGUAGE_ID_ENABLED or settings.LOCAL_LANGUAGE_ID_FOR_TRANSLATE:
+            # Imported here since it loads numpy, which application startup does not need
+            from app.services.language_id import LanguageIdentifier
+
+            self.language_id = LanguageIdentifier()
+        self.coalescer = None
+        if settings.TRANSLATION_COALESCE_ENABLED:
+            self.coalescer = RequestCoalescer(
+                send_batch=self._send_coalesced,
+                window=settings.TRANSLATION_COALESCE_WINDOW_MS / 1000,
+                max_items=settings.TRANSLATION_COALESCE_MAX_SEGMENTS,
+                max_weight=settings.TRANSLATION_BATCH_MAX_CODEPOINTS,
+            )
+
+    async def start(self) -> None:
+        """
+        Open the translation memory, if configured.
         """
-        Initialize the Translation Service with Google Cloud Translation client.
+        if self.memory is not None:
+            await self.memory.start()
+
+    async def close(self) -> None:
         """
-        # Use AuthService to obtain credentials
-        credentials = AuthService.get_credentials()
-        self.client = translate_v3.TranslationServiceClient(credentials=credentials)
-        self.parent = f"projects/{settings.GOOGLE_PROJECT_ID}/locations/global"
+        Send any coalesced batches and flush and close the translation memory.
+        """
+        if self.coalescer is not None:
+            await self.coalescer.close()
+        if self.memory is not None:
+            await self.memory.close()
     
     async def translate_text(
         self,
         text: str,
         target_language: str,
-        source_language: str | None = None
+        source_language: str | None = None,
+        mime_type: str = "text/plain"
     ) -> dict:
         """
         Translate text from source language to target language.
@@ -48,59 +166,410 @@ class TranslationService:
             text (str): The text to translate
             target_language (str): The language code to translate to (e.g., 'es' for Spanish)
             source_language (str, optional): The language code of the source text.
-                                          If None, the API will attempt to detect the language.
+                                          If None, the local identifier or the API will
+                                          attempt to detect the language.
+            mime_type (str, optional): Format of the text, 'text/plain' or 'text/html'
         
         Returns:
             dict: A dictionary containing:
                 - translated_text: The translated text
                 - source_language: The detected or provided source language
                 - target_language: The target language code
+                - memoryMatch: Similarity of the translation memory segment, when one matched
+                - stale: True when served from an expired result while the API is unavailable
         
         Raises:
             ValueError: If the target language is not supported
             Exception: For any translation API errors
         """
-        try:
-            
-            response = self.client.translate_text(
-                contents=[text],
-                target_language_code=target_language,
-                parent=self.parent,
-                mime_type="text/plain",
-                source_language_code=source_language
-            )
+        if source_language is None and settings.LOCAL_LANGUAGE_ID_FOR_TRANSLATE:
+            detected = self._detect_locally(text)
+            if detected is not None:
+                source_language = detected["languageCode"]
+
+        stored, memory_match = await self._lookup_stored(text, target_language, source_language, mime_type)
+        if stored is not None:
+            return stored
+
+        key = payload_key("translate", normalize_text(text), target_language, source_language, mime_type)
+        result = await self.in_flight.do(
+            key, lambda: self._translate_fresh(text, target_language, source_language, mime_type, memory_match)
+        )
+        return dict(result)
+
+    async def translate_many(
+        self,
+        texts: list[str],
+        target_language: str,
+        source_language: str | None = None,
+        mime_type: str = "text/plain"
+    ) -> list[dict]:
+        """
+        Translate many segments with as few upstream requests as possible.
+        
+        Duplicate segments are translated once, segments already in the cache or the
+        translation memory are not sent upstream, and the rest are packed into
+        requests that respect the per-request segment and codepoint limits. Those
+        requests are issued concurrently.
+        
+        Args:
+            texts (list[str]): The segments to translate
+            target_language (str): The language code to translate to (e.g., 'es' for Spanish)
+            source_language (str, optional): The language code of the source text.
+                                          If None, the API detects it per segment.
+            mime_type (str, optional): Format of the text, 'text/plain' or 'text/html'
+        
+        Returns:
+            list[dict]: One entry per input segment, in input order, containing either the
+                        same fields as translate_text or an 'error' message
+        """
+        # Group the input positions of every distinct segment
+        positions: dict[str, list[int]] = {}
+        originals: dict[str, str] = {}
+        for index, text in enumerate(texts):
+            normalized = normalize_text(text)
+            positions.setdefault(normalized, []).append(index)
+            originals.setdefault(normalized, text)
 
-            if response.translations[0].translated_text:
-                return {
-                    "translatedText": response.translations[0].translated_text,
-                    "detectedSourceLanguage": response.translations[0].detected_language_code or source_language,
+        results: dict[str, dict] = {}
+        memory_matches: dict[str, dict | None] = {}
+        pending: list[str] = []
+        lookups = await asyncio.gather(*(
+            self._lookup_stored(originals[key], target_language, source_language, mime_type)
+            for key in positions
+        ))
+        for key, (stored, memory_match) in zip(positions, lookups):
+            if stored is not None:
+                results[key] = stored
+            elif len(originals[key]) > settings.TRANSLATION_BATCH_MAX_CODEPOINTS:
+                results[key] = {
+                    "error": f"Segment exceeds {settings.TRANSLATION_BATCH_MAX_CODEPOINTS} codepoints",
                     "targetLanguage": target_language
                 }
             else:
-                raise Exception("No translation result")
+                memory_matches[key] = memory_match
+                pending.append(key)
+
+        semaphore = asyncio.Semaphore(settings.TRANSLATION_BATCH_CONCURRENCY)
+
+        async def translate_chunk(chunk: list[str]) -> None:
+            async with semaphore:
+                try:
+                    translations = await self._translate_contents(
+                        [originals[key] for key in chunk], target_language, source_language, mime_type
+                    )
+                except (ValueError, QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError) as e:
+                    error = str(e)
+                    translations = None
+                    upstream_failed = is_upstream_failure(e)
+                except Exception as e:
+                    print(f"Batch translation error: {str(e)}")
+                    error = "Translation service error"
+                    translations = None
+                    upstream_failed = is_upstream_failure(e)
+
+            for position, key in enumerate(chunk):
+                if translations is None:
+                    stale = None
+                    if upstream_failed:
+                        stale = self._stale_result(
+                            originals[key], target_language, source_language, mime_type, memory_matches[key]
+                        )
+                    results[key] = stale or {"error": error, "targetLanguage": target_language}
+                elif not translations[position].translated_text:
+                    results[key] = {"error": "No translation result", "targetLanguage": target_language}
+                else:
+                    results[key] = self._store_result(
+                        originals[key], target_language, source_language, mime_type,
+                        translations[position], memory_matches[key]
+                    )
+
+        await asyncio.gather(*(
+            translate_chunk(chunk) for chunk in self._pack([originals[key] for key in pending], pending)
+        ))
+
+        output = [None] * len(texts)
+        for key, indices in positions.items():
+            for index in indices:
+                output[index] = dict(results[key])
+        return output
+
+    @staticmethod
+    def _pack(contents: list[str], keys: list[str]) -> list[list[str]]:
+        """
+        Split segments into request-sized chunks.
         
+        Each chunk holds at most TRANSLATION_BATCH_MAX_SEGMENTS segments totalling at
+        most TRANSLATION_BATCH_MAX_CODEPOINTS codepoints.
+        """
+        chunks: list[list[str]] = []
+        chunk: list[str] = []
+        codepoints = 0
+        for content, key in zip(contents, keys):
+            if chunk and (
+                len(chunk) >= settings.TRANSLATION_BATCH_MAX_SEGMENTS
+                or codepoints + len(content) > settings.TRANSLATION_BATCH_MAX_CODEPOINTS
+            ):
+                chunks.append(chunk)
+                chunk, codepoints = [], 0
+            chunk.append(key)
+            codepoints += len(content)
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _lookup_stored(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str | None,
+        mime_type: str
+    ) -> tuple[dict | None, dict | None]:
+        """
+        Look a segment up in the result cache and the translation memory.
+        
+        Returns:
+            tuple: The result to serve (or None), and the translation memory match
+                   that was not served, if any
+        """
+        cache_key = (normalize_text(text), source_language, target_language, mime_type)
+        cached = self.translation_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached), None
+
+        if self.memory is None:
+            return None, None
+
+        memory_match = await self.memory.lookup(text, source_language, target_language, mime_type)
+        if memory_match is not None:
+            if memory_match["exact"] or settings.TRANSLATION_MEMORY_SERVE_FUZZY:
+                result = {
+                    "translatedText": memory_match["translatedText"],
+                    "detectedSourceLanguage": memory_match["detectedSourceLanguage"] or source_language,
+                    "targetLanguage": target_language,
+                    "memoryMatch": memory_match["score"]
+                }
+                if memory_match["exact"]:
+                    self.translation_cache.set(cache_key, result)
+                return dict(result), None
+        return None, memory_match
+
+    async def _translate_fresh(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str | None,
+        mime_type: str,
+        memory_match: dict | None
+    ) -> dict:
+        """
+        Translate a segment upstream and record the result.
+        """
+        try:
+            if self.coalescer is not None:
+                translation = await self.coalescer.submit(
+                    (target_language, source_language, mime_type), text
+                )
+            else:
+                translation = (await self._translate_contents(
+                    [text], target_language, source_language, mime_type
+                ))[0]
+            if not translation.translated_text:
+                raise Exception("No translation result")
+        except QuotaExceededError:
+            # Counted by the scheduler; logging every rejection would add to the overload
+            raise
         except Exception as e:
-            print(f"Translation error: {str(e)}")
+            if is_upstream_failure(e):
+                stale = self._stale_result(text, target_language, source_language, mime_type, memory_match)
+                if stale is not None:
+                    return stale
+            if not isinstance(e, UpstreamUnavailableError):
+                # An open breaker is logged once, when it opens
+                print(f"Translation error: {str(e)}")
             raise
 
+        return self._store_result(text, target_language, source_language, mime_type, translation, memory_match)
+
+    def _stale_result(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str | None,
+        mime_type: str,
+        memory_match: dict | None
+    ) -> dict | None:
+        """
+        Find a result to serve, flagged as stale, while the API is failing: an expired
+        cache entry or else the translation memory near-duplicate that was not similar
+        enough to be served.
+        """
+        cached = self.translation_cache.get_stale((normalize_text(text), source_language, target_language, mime_type))
+        if cached is not None:
+            return {**cached, "stale": True}
+        if memory_match is not None:
+            return {
+                "translatedText": memory_match["translatedText"],
+                "detectedSourceLanguage": memory_match["detectedSourceLanguage"] or source_language,
+                "targetLanguage": target_language,
+                "memoryMatch": memory_match["score"],
+                "stale": True
+            }
+        return None
+
+    async def _translate_contents(
+        self,
+        contents: list[str],
+        target_language: str,
+        source_language: str | None,
+        mime_type: str
+    ) -> list:
+        """
+        Send one TranslateText request and return its translations, in input order.
+
+        Raises:
+            TranslationError: If the response does not hold one translation per content
+        """
+        async def send(region: Region, timeout: float | None):
+            return await region.client.translate_text(
+                contents=contents,
+                target_language_code=target_language,
+                parent=region.parent,
+                mime_type=mime_type,
+                source_language_code=source_language,
+                retry=None,
+                timeout=timeout
+            )
+
+        # The router derives the timeout of each region it tries from the deadline
+        response = await self.quota.call(
+            sum(len(content) for content in contents),
+            lambda: self.breaker.call(lambda: self.translate_rpc.call(lambda _: self.router.call(send))),
+        )
+        if len(response.translations) != len(contents):
+            raise TranslationError(
+                f"Request of {len(contents)} segments returned {len(response.translations)} translations"
+            )
+        return list(response.translations)
+
+    async def _send_coalesced(self, key: tuple, contents: list[str]) -> list:
+        """
+        Send a batch of coalesced translate_text calls as one request.
+        """
+        target_language, source_language, mime_type = key
+        return await self._translate_contents(contents, target_language, source_language, mime_type)
+
+    def _store_result(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str | None,
+        mime_type: str,
+        translation,
+        memory_match: dict | None
+    ) -> dict:
+        """
+        Build the result of a fresh upstream translation and record it in the
+        result cache, the detection cache and the translation memory.
+        """
+        normalized = normalize_text(text)
+        detected = translation.detected_language_code
+        result = {
+            "translatedText": translation.translated_text,
+            "detectedSourceLanguage": detected or source_language,
+            "targetLanguage": target_language
+        }
+        if memory_match is not None:
+            # Flag the near-duplicate that was not similar enough to be served
+            result["memoryMatch"] = memory_match["score"]
+
+        self.translation_cache.set((normalized, source_language, target_language, mime_type), result)
+        if self.memory is not None:
+            self.memory.record(
+                text, source_language, target_language, mime_type,
+                translation.translated_text, detected or None
+            )
+        if source_language is None and detected:
+            # TranslateText reports the detected language without a score, so the
+            # detection is cached as certain.
+            self.detection_cache.setdefault(normalized, {
+                "languageCode": detected,
+                "confidence": 1.0
+            })
+        return dict(result)
+
     async def detect_language(self, text: str) -> dict:
         """
         Detect the language of the given text.
+        
+        Confident answers from the local identifier are returned without calling the API.
+        """
+        normalized = normalize_text(text)
+        cached = self.detection_cache.get(normalized)
+        if cached is not None:
+            return dict(cached)
+
+        if settings.LOCAL_LANGUAGE_ID_ENABLED:
+            result = self._detect_locally(text)
+            if result is not None:
+                self.detection_cache.set(normalized, result)
+                return dict(result)
+
+        result = await self.in_flight.do(
+            payload_key("detect", normalized), lambda: self._detect_fresh(text)
+        )
+        return dict(result)
+
+    async def _detect_fresh(self, text: str) -> dict:
+        """
+        Detect the language of a text upstream and cache the result.
         """
         try:
-            response = self.client.detect_language(
-                contents=text,
-                parent=self.parent,
-                mime_type="text/plain"
+            async def send(region: Region, timeout: float | None):
+                return await region.client.detect_language(
+                    content=text,
+                    parent=region.parent,
+                    mime_type="text/plain",
+                    retry=None,
+                    timeout=timeout
+                )
+
+            response = await self.quota.call(
+                len(text), lambda: self.breaker.call(lambda: self.detect_rpc.call(lambda _: self.router.call(send)))
             )
 
             if response.languages[0].language_code:
-                return {
+                result = {
                     "languageCode": response.languages[0].language_code,
                     "confidence": response.languages[0].confidence
                 }
             else:
                 raise Exception("No language detection result")
+        except QuotaExceededError:
+            raise
         except Exception as e:
-            print(f"Language detection error: {str(e)}")
-            raise
\ No newline at end of file
+            if is_upstream_failure(e):
+                stale = self.detection_cache.get_stale(normalize_text(text))
+                if stale is not None:
+                    return {**stale, "stale": True}
+            if not isinstance(e, UpstreamUnavailableError):
+                print(f"Language detection error: {str(e)}")
+            raise
+
+        self.detection_cache.set(normalize_text(text), result)
+        return result
+
+    def _detect_locally(self, text: str) -> dict | None:
+        """
+        Identify the language in-process.
+        
+        Returns:
+            dict: languageCode and confidence, or None if the local identifier is
+                  not confident enough
+        """
+        if self.language_id is None:
+            return None
+        detected = self.language_id.detect(text)
+        if detected is None or detected[1] < settings.LOCAL_LANGUAGE_ID_THRESHOLD:
+            return None
+        return {"languageCode": detected[0], "confidence": detected[1]}
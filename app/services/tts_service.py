@@ -3,13 +3,39 @@ Text-to-Speech Service Module
 
 This module provides text-to-speech synthesis capabilities using Google Cloud Text-to-Speech API.
 It converts text input into natural-sounding speech with customizable voice parameters.
+Upstream calls use the asyncio gRPC client so they never block the event loop, and
+identical requests in flight at the same time share a single upstream call. Synthesized
+audio can be kept in a content-addressed store on local disk so repeated requests are
+served without calling the API. Long text can be streamed: it is split at sentence
+boundaries, the chunks are synthesized concurrently and their audio is yielded in
+order as soon as the head chunk is ready.
 
 Dependencies:
-    - google-cloud-texttospeech: Google Cloud Text-to-Speech API client library
+    - google-cloud-texttospeech: Google Cloud Text-to-Speech API client library, imported
+      when the client is built so importing this module stays cheap
+    - SingleFlight for deduplicating identical in-flight requests
+    - AudioStore for caching synthesized audio on disk
+    - Text segmentation and ordered_map for streaming synthesis
+    - QuotaScheduler for pacing upstream calls within the API quota
+    - RpcPolicy for deadlines, retries and hedging of upstream calls
+    - CircuitBreaker for failing fast while the API is failing
 """
 
-from google.cloud import texttospeech
+from contextlib import aclosing
+from typing import TYPE_CHECKING, AsyncIterator
+
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, QuotaExceededError, UpstreamUnavailableError
+from app.services.audio_store import AudioStore
 from app.services.auth_service import AuthService
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.concurrency import SingleFlight, ordered_map, payload_key
+from app.services.resilience import RpcPolicy
+from app.services.scheduler import QuotaScheduler
+from app.services.text_segmentation import split_text
+
+if TYPE_CHECKING:
+    from google.cloud import texttospeech
 
 class TTSService:
     """
@@ -20,16 +46,47 @@ class TTSService:
     and parameters.
     
     Attributes:
-        client: An instance of the Google Cloud Text-to-Speech client
+        client: An instance of the Google Cloud Text-to-Speech async client
+        in_flight (SingleFlight): Deduplicates identical synthesis calls in flight
+        quota (QuotaScheduler): Paces upstream calls within the characters-per-minute quota
+        synthesize_rpc (RpcPolicy): Deadline, retry and hedging policy of SynthesizeSpeech
+        breaker (CircuitBreaker): Short-circuits upstream calls while the API is failing
+        audio_store (AudioStore): On-disk store of synthesized audio, or None when disabled
     """
     
-    def __init__(self):
+    def __init__(self, client: "texttospeech.TextToSpeechAsyncClient | None" = None):
         """
         Initialize the Text-to-Speech Service with Google Cloud TTS client.
+        
+        Args:
+            client (TextToSpeechAsyncClient, optional): A pre-built client, e.g. one
+                                                      pointed at a local fake backend.
+                                                      Must be created inside the running event loop.
+        """
+        if client is None:
+            from google.cloud import texttospeech
+
+            # Obtain credentials through AuthService
+            credentials = AuthService.get_credentials()
+            client = texttospeech.TextToSpeechAsyncClient(credentials=credentials)
+        self.client = client
+        self.in_flight = SingleFlight()
+        self.quota = QuotaScheduler.from_settings("Text-to-Speech", settings.TTS_QUOTA_CHARS_PER_MINUTE)
+        self.synthesize_rpc = RpcPolicy.from_settings("SynthesizeSpeech", idempotent=True)
+        self.breaker = CircuitBreaker.from_settings("Text-to-Speech")
+        self.audio_store = None
+        if settings.TTS_AUDIO_CACHE_DIR:
+            self.audio_store = AudioStore(
+                root=settings.TTS_AUDIO_CACHE_DIR,
+                max_bytes=settings.TTS_AUDIO_CACHE_MAX_BYTES,
+            )
+
+    async def start(self) -> None:
+        """
+        Prepare the audio store, if configured.
         """
-        # Obtain credentials through AuthService
-        credentials = AuthService.get_credentials()
-        self.client = texttospeech.TextToSpeechClient(credentials=credentials)
+        if self.audio_store is not None:
+            await self.audio_store.start()
     
     async def synthesize_speech(
         self,
@@ -52,6 +109,114 @@ class TTSService:
         Raises:
             Exception: For any text-to-speech API errors
         """
+        result = await self.in_flight.do(
+            payload_key("synthesize", text, tts_language_code, voice_name),
+            lambda: self._synthesize_fresh(text, tts_language_code, voice_name),
+        )
+        return dict(result)
+
+    async def stream_speech(
+        self,
+        text: str,
+        tts_language_code: str,
+        voice_name: str,
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize long text chunk by chunk and yield the MP3 audio in order.
+        
+        The text is split at sentence and clause boundaries into chunks within the
+        API input limit, with a small head chunk so the first audio is ready quickly.
+        Up to TTS_STREAM_CONCURRENCY chunks are synthesized at the same time. Each
+        chunk is a complete MP3 stream; MP3 players decode the concatenation as one.
+        
+        Args:
+            text (str): The text to convert to speech
+            tts_language_code (str): The language code for the voice (e.g., 'en-US')
+            voice_name (str): The name of the voice to use
+        
+        Yields:
+            bytes: MP3 audio of each chunk, in order
+        
+        Raises:
+            Exception: For any text-to-speech API errors
+        """
+        chunks = split_text(
+            text,
+            max_bytes=settings.TTS_STREAM_CHUNK_BYTES,
+            first_max_bytes=settings.TTS_STREAM_FIRST_CHUNK_BYTES,
+        )
+
+        async def synthesize_chunk(chunk: str) -> bytes:
+            result = await self.synthesize_speech(chunk, tts_language_code, voice_name)
+            return result["audioContent"]
+
+        # Closing the stream cancels the chunks still being synthesized
+        async with aclosing(ordered_map(synthesize_chunk, chunks, settings.TTS_STREAM_CONCURRENCY)) as audio:
+            async for chunk in audio:
+                yield chunk
+
+    async def synthesize_to_store(
+        self,
+        text: str,
+        tts_language_code: str,
+        voice_name: str,
+    ) -> dict:
+        """
+        Synthesize text into speech, reusing the stored audio when it exists.
+        
+        Args:
+            text (str): The text to convert to speech
+            tts_language_code (str): The language code for the voice (e.g., 'en-US')
+            voice_name (str): The name of the voice to use
+        Returns:
+            dict: A dictionary containing:
+                - audioId: Content address of the audio, usable as a strong ETag
+                - path: Location of the MP3 file on local disk
+        
+        Raises:
+            RuntimeError: If the audio store is disabled
+            Exception: For any text-to-speech API errors
+        """
+        if self.audio_store is None:
+            raise RuntimeError("TTS audio store is disabled")
+        from google.cloud import texttospeech
+
+        audio_id = AudioStore.key(
+            text, tts_language_code, voice_name,
+            texttospeech.SsmlVoiceGender.FEMALE.name, texttospeech.AudioEncoding.MP3.name
+        )
+        path = await self.audio_store.get(audio_id)
+        if path is None:
+            path = await self.in_flight.do(
+                payload_key("store", audio_id),
+                lambda: self._synthesize_and_store(audio_id, text, tts_language_code, voice_name),
+            )
+        return {"audioId": audio_id, "path": path}
+
+    async def _synthesize_and_store(
+        self,
+        audio_id: str,
+        text: str,
+        tts_language_code: str,
+        voice_name: str,
+    ) -> str:
+        """
+        Synthesize text upstream and write the audio to the store.
+        """
+        result = await self.synthesize_speech(text, tts_language_code, voice_name)
+        return await self.audio_store.put(audio_id, result["audioContent"])
+
+    async def _synthesize_fresh(
+        self,
+        text: str,
+        tts_language_code: str,
+        voice_name: str,
+    ) -> dict:
+        """
+        Synthesize text upstream.
+        """
+        from google.cloud import texttospeech
+
         try:
             # Set the text input to be synthesized
             synthesis_input = texttospeech.SynthesisInput(text=text)
@@ -69,16 +234,25 @@ class TTSService:
             )
 
             # Perform the text-to-speech request
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
+            async def send(timeout: float | None):
+                return await self.client.synthesize_speech(
+                    input=synthesis_input,
+                    voice=voice,
+                    audio_config=audio_config,
+                    retry=None,
+                    timeout=timeout
+                )
+
+            response = await self.quota.call(
+                len(text), lambda: self.breaker.call(lambda: self.synthesize_rpc.call(send))
             )
             
             return {
                 "audioContent": response.audio_content,
             }
 
+        except (QuotaExceededError, DeadlineExceededError, UpstreamUnavailableError):
+            raise
         except Exception as e:
             print(f"TTS error: {str(e)}")
             raise 
\ No newline at end of file
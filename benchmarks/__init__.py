@@ -0,0 +1,6 @@
+"""
+Benchmarks
+
+Standalone scripts for measuring the performance of the service layer.
+Each module can be run with ``python -m benchmarks.<module>``.
+"""
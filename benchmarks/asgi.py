@@ -0,0 +1,88 @@
+"""
+In-Process ASGI Client
+
+Sends a single HTTP request straight into the ASGI application, without a
+server or sockets, so benchmarks measure only the application. The request body
+is delivered in chunks the way an ASGI server hands it over.
+"""
+
+import asyncio
+
+_CHUNK_SIZE = 64 * 1024
+
+
+async def request(
+    app,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    headers: dict[str, str] | None = None,
+    chunk_size: int = _CHUNK_SIZE,
+) -> tuple[int, dict[str, str], bytes]:
+    """
+    Send one request to an ASGI application.
+
+    Args:
+        app: The ASGI application
+        method (str): HTTP method
+        path (str): Path, optionally with a query string
+        body (bytes, optional): Request body
+        headers (dict, optional): Request headers
+        chunk_size (int, optional): Size of each body message
+
+    Returns:
+        tuple: The status code, the response headers and the response body
+    """
+    path, _, query = path.partition("?")
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    raw_headers.append((b"content-length", str(len(body)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 80),
+    }
+
+    view = memoryview(body)
+    offset = 0
+    more_body = True
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal offset, more_body
+        if not more_body:
+            # The body has been delivered; the client stays connected until the response ends
+            await done.wait()
+            return {"type": "http.disconnect"}
+        # Chunks are copied out on demand so the benchmark holds only one extra copy
+        chunk = bytes(view[offset:offset + chunk_size])
+        offset += chunk_size
+        more_body = offset < len(body)
+        return {"type": "http.request", "body": chunk, "more_body": more_body}
+
+    status = 0
+    response_headers: dict[str, str] = {}
+    response_body = bytearray()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.update(
+                (name.decode(), value.decode()) for name, value in message["headers"]
+            )
+        elif message["type"] == "http.response.body":
+            response_body.extend(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    return status, response_headers, bytes(response_body)
@@ -0,0 +1,64 @@
+"""
+Service Construction Benchmark
+
+Measures the per-request overhead of the dependency hooks before and after the
+service registry: building a fresh service (credentials, gRPC client and channel)
+for every request versus returning the instance shared by the registry.
+
+Anonymous credentials are used so the benchmark runs without a Google Cloud
+project; GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must still be set
+for the settings to load.
+
+Usage:
+    python -m benchmarks.client_pool --iterations 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from google.auth.credentials import AnonymousCredentials
+
+from app.services.auth_service import AuthService
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+
+
+def _measure(fn, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} mean={statistics.mean(samples):8.3f} ms  "
+          f"p50={statistics.median(samples):8.3f} ms  p95={p95:8.3f} ms")
+
+
+async def main(iterations: int) -> None:
+    AuthService.use_credentials(AnonymousCredentials())
+
+    # Before: every request constructed its own services
+    for cls in (TranslationService, TTSService, STTService):
+        _report(f"per-request {cls.__name__}", _measure(cls, iterations))
+
+    # After: the dependency hooks return the shared instances
+    registry = ServiceRegistry()
+    try:
+        _report("registry lookup", _measure(lambda: registry.translation, iterations))
+    finally:
+        await registry.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(main(parser.parse_args().iterations))
@@ -0,0 +1,165 @@
+"""
+Cold Start Report
+
+Measures what a new scale-to-zero instance pays before it answers requests.
+
+    1. imports: imports the application in a fresh interpreter under
+       `python -X importtime` and reports the import time by top-level package
+       and the slowest modules. Then does the same for the modules the services
+       load in the background once the server listens (the Google client
+       libraries, grpc, protobuf, numpy), and times building the Settings
+    2. server: starts uvicorn in a fresh process and polls /health, reporting
+       when the port first answers and when the services stopped 'starting'.
+       Without Google Cloud credentials the services end up 'failed', which
+       still shows how long the background startup ran
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load.
+
+Usage:
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+# Code run in the child interpreter for each import report
+_IMPORT_APP = "import app.main"
+_IMPORT_DEFERRED = "import app.main; from app.services.registry import preload; preload()"
+_TIME_SETTINGS = (
+    "import time; from app.core.config import Settings; start = time.perf_counter(); Settings(); "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _importtime(code: str) -> list[tuple[int, int, str]]:
+    """
+    Run code in a fresh interpreter under -X importtime.
+
+    Returns:
+        list: (self microseconds, cumulative microseconds, dotted module name) per module
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+    return modules
+
+
+def _package(name: str) -> str:
+    """
+    Return the package a module is reported under: google.<library> for the
+    Google libraries, the top-level package otherwise.
+    """
+    parts = name.split(".")
+    return ".".join(parts[:2]) if parts[0] in ("google", "app") and len(parts) > 1 else parts[0]
+
+
+def _report(label: str, modules: list[tuple[int, int, str]], top: int, exclude: set[str] = frozenset()) -> set[str]:
+    """
+    Print the import time of the modules not in exclude, by package and slowest first.
+
+    Returns:
+        set[str]: The names of all the modules imported
+    """
+    packages: dict[str, int] = {}
+    for self_us, _, name in modules:
+        if name not in exclude:
+            packages[_package(name)] = packages.get(_package(name), 0) + self_us
+    total = sum(packages.values())
+    print(f"{label}: {total / 1000:.0f} ms")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<32} {self_us / 1000:7.1f} ms")
+    return {name for _, _, name in modules}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _health(port: int) -> tuple[int, dict] | None:
+    """
+    GET /health, or None while the server is not listening yet.
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    except OSError:
+        return None
+    finally:
+        connection.close()
+
+
+def _server_run(timeout: float) -> tuple[float, float, str]:
+    """
+    Start the server in a fresh process and poll /health.
+
+    Returns:
+        tuple: Seconds until /health answered, seconds until the services were no
+               longer starting, and their final state
+    """
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        listening = None
+        while time.perf_counter() - start < timeout:
+            answer = _health(port)
+            if answer is None:
+                time.sleep(0.002)
+                continue
+            if listening is None:
+                listening = time.perf_counter() - start
+            state = answer[1].get("services", "ready")
+            if state != "starting":
+                return listening, time.perf_counter() - start, state
+            time.sleep(0.005)
+        raise TimeoutError(f"the server did not start within {timeout:g}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(args: argparse.Namespace) -> None:
+    app_modules = _report("import app.main", _importtime(_IMPORT_APP), args.top)
+    _report("deferred to the background startup", _importtime(_IMPORT_DEFERRED), args.top, exclude=app_modules)
+    settings_seconds = float(subprocess.run(
+        [sys.executable, "-c", _TIME_SETTINGS], capture_output=True, text=True, check=True
+    ).stdout.split()[-1])
+    print(f"Settings(): {settings_seconds * 1000:.1f} ms")
+
+    listening, services, states = [], [], set()
+    for _ in range(args.runs):
+        first, last, state = _server_run(args.timeout)
+        listening.append(first)
+        services.append(last)
+        states.add(state)
+    print(f"server ({args.runs} runs, median): /health answered after {statistics.median(listening) * 1000:.0f} ms, "
+          f"services {'/'.join(sorted(states))} after {statistics.median(services) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="Server cold starts to time")
+    parser.add_argument("--top", type=int, default=10, help="Packages listed per report")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds allowed per server start")
+    main(parser.parse_args())
@@ -0,0 +1,85 @@
+"""
+Load Test Comparison
+
+Compares two result files of benchmarks.load, endpoint by endpoint, and exits
+with status 1 when the candidate regressed: throughput fell, or the p50, p95 or
+p99 latency rose, by more than the tolerance, or the error rate grew.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --tolerance 10
+"""
+
+import argparse
+import json
+import sys
+
+# Metric, whether a higher value is better
+_METRICS = (
+    ("throughput", True),
+    ("p50_ms", False),
+    ("p95_ms", False),
+    ("p99_ms", False),
+)
+# Error rates differing by less than this are considered equal
+_ERROR_RATE_SLACK = 0.001
+
+
+def compare(baseline: dict, candidate: dict, tolerance: float) -> list[str]:
+    """
+    Print the change of every metric and return the regressions.
+
+    Args:
+        baseline (dict): Report of the reference run
+        candidate (dict): Report of the run under test
+        tolerance (float): Change in percent allowed before a metric counts as regressed
+
+    Returns:
+        list[str]: One description per regressed metric
+    """
+    regressions = []
+    print(f"baseline  {baseline.get('commit') or '?'}  {baseline['timestamp']}")
+    print(f"candidate {candidate.get('commit') or '?'}  {candidate['timestamp']}")
+    differing = sorted(
+        key for key in baseline["options"].keys() | candidate["options"].keys()
+        if key != "output" and baseline["options"].get(key) != candidate["options"].get(key)
+    )
+    if differing:
+        print(f"warning: the runs used different options: {', '.join(differing)}")
+    if baseline.get("stores") != candidate.get("stores"):
+        print(f"warning: the runs used different persistent stores: "
+              f"{baseline.get('stores')} and {candidate.get('stores')}")
+    for name, base in baseline["results"].items():
+        result = candidate["results"].get(name)
+        if result is None:
+            print(f"{name}: missing from candidate")
+            continue
+        print(name)
+        for metric, higher_is_better in _METRICS:
+            before, after = base[metric], result[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > tolerance else ""
+            print(f"  {metric:<11} {before:10.1f} -> {after:10.1f}  {change:+6.1f}%{flag}")
+            if flag:
+                regressions.append(f"{name} {metric} {change:+.1f}%")
+        if result["error_rate"] > base["error_rate"] + _ERROR_RATE_SLACK:
+            print(f"  error_rate  {base['error_rate']:10.4f} -> {result['error_rate']:10.4f}  REGRESSION")
+            regressions.append(f"{name} error_rate {result['error_rate']:.4f}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Allowed change in percent")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    regressions = compare(baseline, candidate, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("no regressions")
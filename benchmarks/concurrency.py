@@ -0,0 +1,94 @@
+"""
+Upstream Concurrency Check
+
+Fires N concurrent calls at each service method against the local fake backends
+and reports the wall time and the peak number of RPCs the fake served at once.
+With non-blocking upstream calls the wall time stays close to a single RPC's
+latency and the peak equals N; a blocking client would serialize them. The
+check fails, exiting with status 1, when a method's peak is below N or its calls
+take more than half as long as they would one after another.
+
+Every call sends a payload no earlier call of the run (or of an earlier run) has
+sent, so none is answered from a result cache, the translation memory or another
+call in flight. Each method gets an untimed warm-up round first.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.concurrency --requests 200 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.fake_backends import FakeBackends
+
+
+async def _run(label: str, backends: FakeBackends, make_call, requests: int, latency: float) -> list[str]:
+    """
+    Time one round of concurrent calls and return what the check found wrong with it.
+    """
+    await asyncio.gather(*(make_call(i) for i in range(requests, 2 * requests)))
+    backends.max_in_flight = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(make_call(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    failures = []
+    if backends.max_in_flight < requests:
+        failures.append(f"{label}: peak in flight {backends.max_in_flight}, expected {requests}")
+    if elapsed > requests * latency / 2:
+        failures.append(f"{label}: {requests} calls took {elapsed:.3f}s, "
+                        f"at most {requests * latency / 2:.3f}s expected")
+    print(f"{label:<20} {requests} calls in {elapsed:6.3f}s  "
+          f"peak in flight={backends.max_in_flight:<4} "
+          f"{'SERIALIZED' if failures else 'OK'}")
+    return failures
+
+
+async def main(requests: int, latency: float) -> list[str]:
+    backends = FakeBackends(latency=latency)
+    await backends.start()
+    registry = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    # Translations also seed the detection cache, so each method gets its own texts
+    run = uuid.uuid4().hex[:8]
+    try:
+        await registry.start()
+        calls = {
+            "translate_text": lambda i: registry.translation.translate_text(
+                text=f"hello {run} {i}", target_language="es"),
+            "detect_language": lambda i: registry.translation.detect_language(
+                text=f"bonjour {run} {i}"),
+            "synthesize_speech": lambda i: registry.tts.synthesize_speech(
+                text=f"hello {run} {i}", tts_language_code="en-US", voice_name="en-US-Standard-A"),
+            "transcribe_audio": lambda i: registry.stt.transcribe_audio(
+                audio_content=b"\0" * (i + 1), language_code="en-US"),
+        }
+        failures = []
+        for label, make_call in calls.items():
+            failures += await _run(label, backends, make_call, requests, latency)
+    finally:
+        await registry.close()
+        await backends.stop()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+    failures = asyncio.run(main(args.requests, args.latency))
+    if failures:
+        raise SystemExit("upstream calls did not overlap:\n" + "\n".join(failures))
@@ -0,0 +1,337 @@
+"""
+Fake Google Backends
+
+In-process asyncio gRPC servers that speak the Cloud Translation v3,
+Text-to-Speech v1 and Speech-to-Text v2 wire protocols (including the
+long-running operations interface behind BatchRecognize) closely enough for the
+service layer, plus helpers that build the real async clients pointed at them.
+
+Each fake sleeps for a configurable latency before answering, which makes it
+easy to see whether concurrent upstream calls overlap or are serialized. The
+latency can be drawn from a log-normal distribution around that median, a share
+of the calls can be made much slower, to reproduce tail latency, or fail with
+UNAVAILABLE, to reproduce transient errors, and the size of the synthesized
+audio can be set per character of text.
+"""
+
+import asyncio
+import random
+import time
+from datetime import timedelta
+
+import grpc
+from google.cloud import texttospeech, translate_v3
+from google.cloud.speech_v2 import SpeechAsyncClient
+from google.cloud.speech_v2.services.speech.transports import SpeechGrpcAsyncIOTransport
+from google.cloud.speech_v2.types import cloud_speech
+from google.longrunning import operations_pb2
+from google.protobuf import empty_pb2
+from google.rpc import code_pb2
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import (
+    TextToSpeechGrpcAsyncIOTransport,
+)
+from google.cloud.translate_v3.services.translation_service.transports import (
+    TranslationServiceGrpcAsyncIOTransport,
+)
+
+
+def _unary(handler, request_type, response_type):
+    return grpc.unary_unary_rpc_method_handler(
+        handler,
+        request_deserializer=request_type.deserialize,
+        response_serializer=response_type.serialize,
+    )
+
+
+class FakeBackends:
+    """
+    A single gRPC server hosting fake Translation, Text-to-Speech and Speech services.
+
+    Attributes:
+        latency (float): Seconds every RPC sleeps before answering (the median when
+                         latency_sigma is set)
+        latency_sigma (float): Shape of the log-normal latency distribution; 0 for a fixed latency
+        realtime_factor (float): Extra seconds Recognize sleeps per second of audio
+        slow_fraction (float): Share of unary RPCs that take slow_latency instead of latency
+        slow_latency (float): Seconds a slow RPC sleeps before answering
+        failure_rate (float): Share of unary RPCs that fail with UNAVAILABLE
+        audio_bytes_per_char (int): Bytes of audio SynthesizeSpeech returns per character;
+                                    0 returns the text itself
+        operation_seconds (float): Seconds a BatchRecognize operation runs before it is done
+        operations (dict): State of every BatchRecognize operation by name
+        address (str): host:port the server listens on once started
+        calls (dict): Number of RPCs received per method name
+        in_flight (int): RPCs currently being served
+        max_in_flight (int): Highest number of RPCs served at the same time
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        realtime_factor: float = 0.0,
+        operation_seconds: float = 1.0,
+        slow_fraction: float = 0.0,
+        slow_latency: float = 1.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        latency_sigma: float = 0.0,
+        audio_bytes_per_char: int = 0,
+    ):
+        self.latency = latency
+        self.realtime_factor = realtime_factor
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.failure_rate = failure_rate
+        self.latency_sigma = latency_sigma
+        self.audio_bytes_per_char = audio_bytes_per_char
+        self._random = random.Random(seed)
+        self.operation_seconds = operation_seconds
+        self.operations = {}
+        self.address = None
+        self.calls = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = None
+
+    async def start(self) -> str:
+        # Like the real APIs, accept messages above gRPC's 4 MB default
+        self._server = grpc.aio.server(options=[("grpc.max_receive_message_length", -1)])
+        self._server.add_generic_rpc_handlers((
+            grpc.method_handlers_generic_handler(
+                "google.cloud.translation.v3.TranslationService",
+                {
+                    "TranslateText": _unary(
+                        self._translate_text,
+                        translate_v3.TranslateTextRequest,
+                        translate_v3.TranslateTextResponse,
+                    ),
+                    "DetectLanguage": _unary(
+                        self._detect_language,
+                        translate_v3.DetectLanguageRequest,
+                        translate_v3.DetectLanguageResponse,
+                    ),
+                },
+            ),
+            grpc.method_handlers_generic_handler(
+                "google.cloud.texttospeech.v1.TextToSpeech",
+                {
+                    "SynthesizeSpeech": _unary(
+                        self._synthesize_speech,
+                        texttospeech.SynthesizeSpeechRequest,
+                        texttospeech.SynthesizeSpeechResponse,
+                    ),
+                },
+            ),
+            grpc.method_handlers_generic_handler(
+                "google.cloud.speech.v2.Speech",
+                {
+                    "Recognize": _unary(
+                        self._recognize,
+                        cloud_speech.RecognizeRequest,
+                        cloud_speech.RecognizeResponse,
+                    ),
+                    "BatchRecognize": grpc.unary_unary_rpc_method_handler(
+                        self._batch_recognize,
+                        request_deserializer=cloud_speech.BatchRecognizeRequest.deserialize,
+                        response_serializer=operations_pb2.Operation.SerializeToString,
+                    ),
+                    "StreamingRecognize": grpc.stream_stream_rpc_method_handler(
+                        self._streaming_recognize,
+                        request_deserializer=cloud_speech.StreamingRecognizeRequest.deserialize,
+                        response_serializer=cloud_speech.StreamingRecognizeResponse.serialize,
+                    ),
+                },
+            ),
+            grpc.method_handlers_generic_handler(
+                "google.longrunning.Operations",
+                {
+                    "GetOperation": grpc.unary_unary_rpc_method_handler(
+                        self._get_operation,
+                        request_deserializer=operations_pb2.GetOperationRequest.FromString,
+                        response_serializer=operations_pb2.Operation.SerializeToString,
+                    ),
+                    "CancelOperation": grpc.unary_unary_rpc_method_handler(
+                        self._cancel_operation,
+                        request_deserializer=operations_pb2.CancelOperationRequest.FromString,
+                        response_serializer=empty_pb2.Empty.SerializeToString,
+                    ),
+                },
+            ),
+        ))
+        port = self._server.add_insecure_port("127.0.0.1:0")
+        await self._server.start()
+        self.address = f"127.0.0.1:{port}"
+        return self.address
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            await self._server.stop(grace=None)
+
+    async def _serve(self, method: str, extra: float = 0.0, context=None):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        latency = self.latency
+        if context is not None:
+            if self._random.random() < self.failure_rate:
+                await context.abort(grpc.StatusCode.UNAVAILABLE, "injected failure")
+            if self._random.random() < self.slow_fraction:
+                latency = self.slow_latency
+        if self.latency_sigma > 0:
+            latency *= self._random.lognormvariate(0.0, self.latency_sigma)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(latency + extra)
+        finally:
+            self.in_flight -= 1
+
+    async def _translate_text(self, request, context):
+        await self._serve("TranslateText", context=context)
+        return translate_v3.TranslateTextResponse(
+            translations=[
+                translate_v3.Translation(
+                    translated_text=f"[{request.target_language_code}] {content}",
+                    detected_language_code="" if request.source_language_code else "en",
+                )
+                for content in request.contents
+            ]
+        )
+
+    async def _detect_language(self, request, context):
+        await self._serve("DetectLanguage", context=context)
+        return translate_v3.DetectLanguageResponse(
+            languages=[translate_v3.DetectedLanguage(language_code="en", confidence=0.99)]
+        )
+
+    async def _synthesize_speech(self, request, context):
+        await self._serve("SynthesizeSpeech", context=context)
+        if self.audio_bytes_per_char:
+            audio = bytes(len(request.input.text) * self.audio_bytes_per_char)
+        else:
+            audio = request.input.text.encode("utf-8")
+        return texttospeech.SynthesizeSpeechResponse(audio_content=audio)
+
+    async def _recognize(self, request, context):
+        # Audio is assumed to be 16 kHz mono LINEAR16
+        seconds = len(request.content) / 32000
+        await self._serve("Recognize", extra=self.realtime_factor * seconds, context=context)
+        return cloud_speech.RecognizeResponse(
+            results=[
+                cloud_speech.SpeechRecognitionResult(
+                    alternatives=[
+                        cloud_speech.SpeechRecognitionAlternative(
+                            transcript=f"{len(request.content)} bytes", confidence=0.9
+                        )
+                    ],
+                    result_end_offset=timedelta(seconds=seconds),
+                )
+            ]
+        )
+
+    async def _streaming_recognize(self, request_iterator, context):
+        """
+        Answer every audio chunk with an interim result and the end of the stream
+        with a final one, each reporting the bytes received so far.
+        """
+        received = 0
+        bytes_per_second = 32000
+        async for request in request_iterator:
+            if request.streaming_config.config.explicit_decoding_config.sample_rate_hertz:
+                decoding = request.streaming_config.config.explicit_decoding_config
+                bytes_per_second = 2 * decoding.sample_rate_hertz * max(1, decoding.audio_channel_count)
+            if not request.audio:
+                continue
+            received += len(request.audio)
+            yield self._streaming_response(received, bytes_per_second, is_final=False)
+        await self._serve("StreamingRecognize")
+        yield self._streaming_response(received, bytes_per_second, is_final=True)
+
+    @staticmethod
+    def _streaming_response(received: int, bytes_per_second: int, is_final: bool):
+        return cloud_speech.StreamingRecognizeResponse(
+            results=[
+                cloud_speech.StreamingRecognitionResult(
+                    alternatives=[
+                        cloud_speech.SpeechRecognitionAlternative(
+                            transcript=f"{received} bytes", confidence=0.9 if is_final else 0.0
+                        )
+                    ],
+                    is_final=is_final,
+                    stability=0.0 if is_final else 0.5,
+                    result_end_offset=timedelta(seconds=received / bytes_per_second),
+                )
+            ]
+        )
+
+    async def _batch_recognize(self, request, context):
+        await self._serve("BatchRecognize")
+        name = f"projects/fake/locations/global/operations/{len(self.operations) + 1}"
+        self.operations[name] = {
+            "started": time.monotonic(),
+            "uris": [file.uri for file in request.files],
+            "cancelled": False,
+        }
+        return operations_pb2.Operation(name=name)
+
+    async def _get_operation(self, request, context):
+        """
+        Report an operation as running until operation_seconds have passed, then
+        finish it with one transcript per file.
+        """
+        await self._serve("GetOperation")
+        state = self.operations.get(request.name)
+        if state is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "operation not found")
+        elapsed = time.monotonic() - state["started"]
+        progress = min(100, int(elapsed / self.operation_seconds * 100)) if self.operation_seconds else 100
+        operation = operations_pb2.Operation(name=request.name)
+        operation.metadata.Pack(cloud_speech.OperationMetadata.pb(
+            cloud_speech.OperationMetadata(progress_percent=progress)
+        ))
+        if state["cancelled"]:
+            operation.done = True
+            operation.error.code = code_pb2.CANCELLED
+            operation.error.message = "operation cancelled"
+        elif progress >= 100:
+            operation.done = True
+            operation.response.Pack(cloud_speech.BatchRecognizeResponse.pb(
+                cloud_speech.BatchRecognizeResponse(results={
+                    uri: cloud_speech.BatchRecognizeFileResult(
+                        inline_result=cloud_speech.InlineResult(
+                            transcript=cloud_speech.BatchRecognizeResults(results=[
+                                cloud_speech.SpeechRecognitionResult(
+                                    alternatives=[cloud_speech.SpeechRecognitionAlternative(
+                                        transcript=f"transcript of {uri}", confidence=0.9,
+                                    )],
+                                    result_end_offset=timedelta(seconds=60),
+                                )
+                            ])
+                        )
+                    )
+                    for uri in state["uris"]
+                })
+            ))
+        return operation
+
+    async def _cancel_operation(self, request, context):
+        await self._serve("CancelOperation")
+        if request.name in self.operations:
+            self.operations[request.name]["cancelled"] = True
+        return empty_pb2.Empty()
+
+    def translation_client(self) -> translate_v3.TranslationServiceAsyncClient:
+        transport = TranslationServiceGrpcAsyncIOTransport(
+            channel=grpc.aio.insecure_channel(self.address)
+        )
+        return translate_v3.TranslationServiceAsyncClient(transport=transport)
+
+    def tts_client(self) -> texttospeech.TextToSpeechAsyncClient:
+        transport = TextToSpeechGrpcAsyncIOTransport(
+            channel=grpc.aio.insecure_channel(self.address)
+        )
+        return texttospeech.TextToSpeechAsyncClient(transport=transport)
+
+    def stt_client(self) -> SpeechAsyncClient:
+        transport = SpeechGrpcAsyncIOTransport(
+            channel=grpc.aio.insecure_channel(self.address)
+        )
+        return SpeechAsyncClient(transport=transport)
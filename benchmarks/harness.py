@@ -0,0 +1,120 @@
+"""
+Benchmark Harness
+
+Starts the fake Google backends and points the application's services at them,
+so requests sent through benchmarks.asgi exercise the whole stack (routing,
+validation, caching, quota pacing, resilience) without Google Cloud access or
+quota. Also summarizes latency samples the same way for every benchmark.
+
+The persistent stores that are enabled (translation memory, synthesized audio
+store, batch job table) are moved to a temporary directory for the run, so a run
+never starts with results left on disk by an earlier one.
+"""
+
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.fake_backends import FakeBackends
+
+# Setting of each persistent store, and its name inside the run's temporary directory
+_STORES = {
+    "TRANSLATION_MEMORY_PATH": "translation-memory.db",
+    "TTS_AUDIO_CACHE_DIR": "tts-audio",
+    "STT_JOBS_DB_PATH": "stt-jobs.db",
+}
+
+
+@asynccontextmanager
+async def fake_services(**backend_options) -> AsyncIterator[FakeBackends]:
+    """
+    Run the application's services against fake backends.
+
+    Installs a ServiceRegistry whose translation, text-to-speech and
+    speech-to-text services use clients connected to the fakes as
+    app.state.services, and closes both on exit. Enabled persistent stores
+    start empty in a temporary directory removed on exit.
+
+    Args:
+        **backend_options: Arguments of FakeBackends (latency, latency_sigma,
+                           slow_fraction, failure_rate, audio_bytes_per_char, ...)
+
+    Yields:
+        FakeBackends: The running fakes, whose options can be changed on the fly
+    """
+    saved = {name: getattr(settings, name) for name in _STORES}
+    with tempfile.TemporaryDirectory(prefix="gtranslate-bench-") as directory:
+        for name, path in _STORES.items():
+            if saved[name]:
+                setattr(settings, name, os.path.join(directory, path))
+        backends = FakeBackends(**backend_options)
+        await backends.start()
+        app.state.services = ServiceRegistry(
+            translation=TranslationService(client=backends.translation_client()),
+            tts=TTSService(client=backends.tts_client()),
+            stt=STTService(client=backends.stt_client()),
+        )
+        try:
+            yield backends
+        finally:
+            await app.state.services.close()
+            await backends.stop()
+            for name, value in saved.items():
+                setattr(settings, name, value)
+
+
+def store_settings() -> dict:
+    """
+    Report which persistent stores the services use.
+
+    Returns:
+        dict: Per store setting, "temporary" when the store is enabled (and so
+              started empty in the run's temporary directory), else "disabled"
+    """
+    return {name: "temporary" if getattr(settings, name) else "disabled" for name in _STORES}
+
+
+def percentile(sorted_values: list[float], percentile: float) -> float:
+    """
+    Return a percentile of sorted values by the nearest-rank method.
+
+    Args:
+        sorted_values (list[float]): Values in increasing order
+        percentile (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 without values
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percentile / 100))]
+
+
+def summarize(latencies: list[float], seconds: float) -> dict:
+    """
+    Summarize the latencies of the requests sent during a run.
+
+    Args:
+        latencies (list[float]): Latency of each request in seconds
+        seconds (float): Length of the run in seconds
+
+    Returns:
+        dict: requests, throughput (requests per second) and the mean, p50, p90,
+              p95, p99 and max latencies in milliseconds
+    """
+    values = sorted(latencies)
+    summary = {
+        "requests": len(values),
+        "throughput": len(values) / seconds if seconds > 0 else 0.0,
+        "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+    }
+    for name, value in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99), ("max", 100)):
+        summary[f"{name}_ms"] = percentile(values, value) * 1000
+    return summary
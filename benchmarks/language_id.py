@@ -0,0 +1,154 @@
+"""
+Language Identification Benchmark
+
+Measures the accuracy, coverage (share of texts answered without the API) and
+latency of the local language identifier on a labelled sample set, and how many
+texts in languages the model does not cover it answers anyway (each one a wrong
+answer served instead of the API's). Exits with status 1 when any answer above
+the threshold is wrong. With --upstream, the same texts are also sent to the
+Cloud Translation detectLanguage API to compare latency and agreement; this
+requires real credentials.
+
+Usage:
+    python -m benchmarks.language_id --threshold 0.95 [--upstream]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.language_id import LanguageIdentifier
+
+SAMPLES = [
+    ("en", "Your subscription has been renewed successfully."),
+    ("en", "Click here to download the latest version of the app."),
+    ("en", "The weather tomorrow will be sunny with a light breeze."),
+    ("en", "Free shipping on all orders over fifty dollars"),
+    ("es", "Tu suscripción se ha renovado correctamente."),
+    ("es", "Haga clic aquí para descargar la última versión de la aplicación."),
+    ("es", "El tiempo mañana será soleado con una brisa ligera."),
+    ("es", "Envío gratis en todos los pedidos superiores a cincuenta dólares"),
+    ("fr", "Votre abonnement a été renouvelé avec succès."),
+    ("fr", "Cliquez ici pour télécharger la dernière version de l'application."),
+    ("fr", "Le temps demain sera ensoleillé avec une légère brise."),
+    ("fr", "Livraison gratuite pour toutes les commandes de plus de cinquante euros"),
+    ("de", "Ihr Abonnement wurde erfolgreich verlängert."),
+    ("de", "Klicken Sie hier, um die neueste Version der App herunterzuladen."),
+    ("de", "Das Wetter morgen wird sonnig mit einer leichten Brise."),
+    ("de", "Kostenloser Versand für alle Bestellungen über fünfzig Euro"),
+    ("it", "Il tuo abbonamento è stato rinnovato con successo."),
+    ("it", "Fai clic qui per scaricare l'ultima versione dell'app."),
+    ("it", "Il tempo domani sarà soleggiato con una leggera brezza."),
+    ("it", "Spedizione gratuita per tutti gli ordini superiori a cinquanta euro"),
+    ("pt", "A sua assinatura foi renovada com sucesso."),
+    ("pt", "Clique aqui para baixar a versão mais recente do aplicativo."),
+    ("pt", "O tempo amanhã será ensolarado com uma brisa leve."),
+    ("pt", "Frete grátis em todos os pedidos acima de cinquenta reais"),
+    ("nl", "Uw abonnement is succesvol verlengd."),
+    ("nl", "Klik hier om de nieuwste versie van de app te downloaden."),
+    ("nl", "Het weer morgen wordt zonnig met een lichte bries."),
+    ("nl", "Gratis verzending voor alle bestellingen boven de vijftig euro"),
+    ("ja", "こんにちは、お元気ですか？"),
+    ("ja", "ご注文ありがとうございます。"),
+    ("ko", "안녕하세요, 잘 지내세요?"),
+    ("ko", "주문해 주셔서 감사합니다."),
+    ("el", "Καλημέρα, τι κάνεις;"),
+    ("th", "ขอบคุณสำหรับการสั่งซื้อ"),
+    ("ru", "Спасибо за ваш заказ."),
+    ("zh-CN", "感谢您的订购。"),
+]
+
+# Latin-script languages the model does not cover, several close to covered ones
+OUT_OF_SET = [
+    ("af", "Jou intekening is suksesvol hernu."),
+    ("af", "Klik hier om die nuutste weergawe van die toepassing af te laai."),
+    ("af", "Die weer môre sal sonnig wees met 'n ligte briesie."),
+    ("af", "Gratis aflewering op alle bestellings bo vyftig rand"),
+    ("gl", "A túa subscrición renovouse correctamente."),
+    ("gl", "Fai clic aquí para descargar a última versión da aplicación."),
+    ("gl", "O tempo mañá será soleado cunha brisa lixeira."),
+    ("gl", "Envío gratuíto en todos os pedidos superiores a cincuenta euros"),
+    ("ca", "La teva subscripció s'ha renovat correctament."),
+    ("ca", "Fes clic aquí per baixar la darrera versió de l'aplicació."),
+    ("da", "Dit abonnement er blevet fornyet."),
+    ("da", "Vejret i morgen bliver solrigt med en let brise."),
+    ("sv", "Klicka här för att ladda ner den senaste versionen av appen."),
+    ("no", "Klikk her for å laste ned den nyeste versjonen av appen."),
+    ("ro", "Abonamentul dumneavoastră a fost reînnoit cu succes."),
+    ("id", "Klik di sini untuk mengunduh versi terbaru aplikasi."),
+    ("pl", "Twoja subskrypcja została pomyślnie odnowiona."),
+    ("tr", "Aboneliğiniz başarıyla yenilendi."),
+    ("fi", "Tilauksesi on uusittu onnistuneesti."),
+    ("cs", "Vaše předplatné bylo úspěšně obnoveno."),
+]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def run_local(threshold: float, repeats: int) -> list[str]:
+    start = time.perf_counter()
+    identifier = LanguageIdentifier()
+    print(f"profile build: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    answered = correct = 0
+    latencies = []
+    wrong = []
+    for expected, text in SAMPLES:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            detected = identifier.detect(text)
+            latencies.append((time.perf_counter() - start) * 1e6)
+        if detected is not None and detected[1] >= threshold:
+            answered += 1
+            correct += detected[0] == expected
+            if detected[0] != expected:
+                wrong.append(f"{expected}->{detected[0]} ({detected[1]:.3f})")
+
+    print(f"local: coverage={answered}/{len(SAMPLES)} "
+          f"precision={correct}/{answered if answered else 1} "
+          f"p50={statistics.median(latencies):.1f} us p99={_percentile(latencies, 0.99):.1f} us")
+
+    out_of_set = []
+    for language, text in OUT_OF_SET:
+        detected = identifier.detect(text)
+        if detected is not None and detected[1] >= threshold:
+            out_of_set.append(f"{language}->{detected[0]} ({detected[1]:.3f})")
+    print(f"out-of-set answered: {len(out_of_set)}/{len(OUT_OF_SET)} {' '.join(out_of_set)}")
+    return wrong + out_of_set
+
+
+async def run_upstream() -> None:
+    from app.services.translation_service import TranslationService
+
+    service = TranslationService()
+    latencies = []
+    agree = 0
+    identifier = LanguageIdentifier()
+    try:
+        for expected, text in SAMPLES:
+            start = time.perf_counter()
+            result = await service._detect_fresh(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+            local = identifier.detect(text)
+            agree += local is not None and local[0] == result["languageCode"]
+    finally:
+        await service.client.transport.close()
+    print(f"upstream: agreement with local={agree}/{len(SAMPLES)} "
+          f"p50={statistics.median(latencies):.1f} ms p99={_percentile(latencies, 0.99):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--upstream", action="store_true")
+    args = parser.parse_args()
+    wrong = run_local(args.threshold, args.repeats)
+    if args.upstream:
+        asyncio.run(run_upstream())
+    if wrong:
+        raise SystemExit(f"wrong local answers: {' '.join(wrong)}")
@@ -0,0 +1,210 @@
+"""
+Load Test
+
+Drives /translate, /detect-language, /tts/synthesize and /stt/synthesize
+through the whole application against the local fake backends, one endpoint
+after the other, and reports the throughput and latency percentiles of each.
+
+Two load models are supported:
+
+    --concurrency N   closed loop: N clients each send a request as soon as
+                      their previous one is answered
+    --rps R           open loop: requests are started at a fixed rate whether or
+                      not earlier ones were answered. Latency is measured from
+                      the time a request was due, so a stalled application is
+                      not hidden by requests that were sent late
+
+The upstream latency distribution, error rate and payload sizes are set on the
+command line. With --output the results and the options of the run are saved
+as JSON, to be compared with another run by benchmarks.compare. The persistent
+stores start empty on every run (see benchmarks.harness); which of them were
+enabled is saved too.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.load --concurrency 32 --duration 10 --output baseline.json
+    python -m benchmarks.load --rps 200 --duration 10 --latency-sigma 0.5 --failure-rate 0.01
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Callable
+
+from app.core.config import settings
+from app.main import app
+from benchmarks.asgi import request
+from benchmarks.harness import fake_services, store_settings, summarize
+
+_JSON = {"content-type": "application/json"}
+
+# Upstream method called by each endpoint, to report the calls it caused
+_UPSTREAM = {
+    "translate": "TranslateText",
+    "detect-language": "DetectLanguage",
+    "tts": "SynthesizeSpeech",
+    "stt": "Recognize",
+}
+
+
+def _text(index: int, chars: int, distinct: int) -> str:
+    """
+    Return a text of about `chars` characters, one of `distinct` different ones
+    (every text differs when distinct is 0).
+    """
+    key = index % distinct if distinct else index
+    prefix = f"sentence {key} "
+    return prefix + ("lorem ipsum " * (chars // 12 + 1))[:max(0, chars - len(prefix))]
+
+
+def _scenarios(args: argparse.Namespace) -> dict[str, tuple[str, Callable[[int], bytes]]]:
+    """
+    Return the path and request body builder of every endpoint under test.
+    """
+    silence = bytes(max(0, int(32000 * args.audio_seconds) - 8))
+
+    def audio(index: int) -> str:
+        # Distinct recordings, so the transcriptions are not shared by single-flight
+        key = index % args.distinct_texts if args.distinct_texts else index
+        return base64.b64encode(key.to_bytes(8, "big", signed=True) + silence).decode()
+
+    return {
+        "translate": ("/api/translate", lambda index: json.dumps({
+            "text": _text(index, args.text_chars, args.distinct_texts),
+            "sourceLanguage": "en",
+            "targetLanguage": "es",
+        }).encode()),
+        "detect-language": ("/api/detect-language", lambda index: json.dumps({
+            "text": _text(index, args.text_chars, args.distinct_texts),
+        }).encode()),
+        "tts": ("/api/tts/synthesize", lambda index: json.dumps({
+            "text": _text(index, args.text_chars, args.distinct_texts),
+            "ttsCode": "en-US",
+            "ttsName": "en-US-Standard-A",
+        }).encode()),
+        "stt": ("/api/stt/synthesize", lambda index: json.dumps({
+            "audioContent": audio(index),
+            "languageCode": "en-US",
+        }).encode()),
+    }
+
+
+async def _run(path: str, body: Callable[[int], bytes], args: argparse.Namespace, first: int) -> dict:
+    """
+    Send requests to one endpoint for args.duration seconds and summarize them.
+    """
+    loop = asyncio.get_running_loop()
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def send(index: int, due: float) -> None:
+        status, _, _ = await request(app, "POST", path, body(first + index), _JSON)
+        if 200 <= status < 300:
+            latencies.append(loop.time() - due)
+        else:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+
+    start = loop.time()
+    end = start + args.duration
+    if args.rps:
+        tasks = []
+        for index in range(int(args.rps * args.duration)):
+            due = start + index / args.rps
+            if due > loop.time():
+                await asyncio.sleep(due - loop.time())
+            tasks.append(asyncio.create_task(send(index, due)))
+        await asyncio.gather(*tasks)
+    else:
+        counter = iter(range(1 << 62))
+
+        async def client() -> None:
+            while loop.time() < end:
+                await send(next(counter), loop.time())
+
+        await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    result = summarize(latencies, loop.time() - start)
+    result["errors"] = errors
+    result["error_rate"] = sum(errors.values()) / max(1, len(latencies) + sum(errors.values()))
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    settings.STT_MAX_UPLOAD_BYTES = max(settings.STT_MAX_UPLOAD_BYTES, int(32000 * args.audio_seconds) * 2)
+    scenarios = _scenarios(args)
+    results = {}
+    async with fake_services(
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        slow_fraction=args.slow_fraction,
+        slow_latency=args.slow_latency,
+        failure_rate=args.failure_rate,
+        audio_bytes_per_char=args.audio_bytes_per_char,
+        seed=args.seed,
+    ) as backends:
+        stores = store_settings()
+        for name in args.endpoints.split(","):
+            path, body = scenarios[name]
+            # Warm up connections and code paths with texts not used by the run
+            for index in range(args.warmup):
+                await request(app, "POST", path, body(-1 - index), _JSON)
+            calls = backends.calls.get(_UPSTREAM[name], 0)
+            result = await _run(path, body, args, first=len(results) * 10_000_000)
+            result["upstream_calls"] = backends.calls.get(_UPSTREAM[name], 0) - calls
+            results[name] = result
+            print(f"{name:<16} {result['throughput']:8.1f} req/s  "
+                  f"p50={result['p50_ms']:7.1f} ms  p95={result['p95_ms']:7.1f} ms  "
+                  f"p99={result['p99_ms']:7.1f} ms  max={result['max_ms']:7.1f} ms  "
+                  f"errors={result['errors'] or 0}  upstream calls={result['upstream_calls']}")
+
+    report = {
+        "version": 1,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "options": vars(args),
+        "stores": stores,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results saved to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--endpoints", default=",".join(_UPSTREAM),
+                        help="Comma-separated endpoints: translate, detect-language, tts, stt")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=32, help="Closed-loop clients")
+    load.add_argument("--rps", type=float, default=0.0, help="Open-loop request rate")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per endpoint")
+    parser.add_argument("--latency", type=float, default=0.02, help="Median upstream latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.3, help="Log-normal shape of the upstream latency")
+    parser.add_argument("--slow-fraction", type=float, default=0.0)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of upstream calls failing with UNAVAILABLE")
+    parser.add_argument("--text-chars", type=int, default=200)
+    parser.add_argument("--distinct-texts", type=int, default=0, help="Different texts sent; 0 for all different")
+    parser.add_argument("--audio-seconds", type=float, default=2.0, help="Length of the audio sent to /stt/synthesize")
+    parser.add_argument("--audio-bytes-per-char", type=int, default=2000, help="Audio returned by the fake per character")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Save the results as JSON to this file")
+    asyncio.run(main(parser.parse_args()))
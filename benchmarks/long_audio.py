@@ -0,0 +1,81 @@
+"""
+Long Audio Transcription Benchmark
+
+Transcribes a synthetic 10-minute 16 kHz recording (noise bursts standing in for
+speech, separated by short pauses) against the local fake backend, whose
+Recognize latency grows with the length of the audio. Compares sending the whole
+file in one request with splitting it at pauses and transcribing the chunks
+concurrently, and reports the time spent finding the split points.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.long_audio --minutes 10 --realtime-factor 0.02
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.audio_segmentation import PcmAudio, decode_wav, split_on_silence
+from app.services.stt_service import STTService
+from benchmarks.fake_backends import FakeBackends
+
+_SAMPLE_RATE = 16000
+
+
+def synthetic_recording(minutes: float, seed: int = 0) -> bytes:
+    """
+    Build a WAV file of alternating loud bursts and quiet pauses.
+    """
+    rng = np.random.default_rng(seed)
+    parts, total = [], 0
+    while total < minutes * 60 * _SAMPLE_RATE:
+        for seconds, level in ((rng.uniform(2, 12), 3000), (rng.uniform(0.2, 1.5), 20)):
+            length = int(seconds * _SAMPLE_RATE)
+            parts.append(rng.normal(0, level, length).astype(np.int16))
+            total += length
+    samples = np.concatenate(parts).reshape(-1, 1)
+    return PcmAudio(samples, _SAMPLE_RATE).to_wav()
+
+
+async def main(minutes: float, realtime_factor: float, latency: float) -> None:
+    wav = synthetic_recording(minutes)
+
+    start = time.perf_counter()
+    spans = split_on_silence(
+        decode_wav(wav),
+        max_seconds=settings.STT_LONG_AUDIO_CHUNK_SECONDS,
+        window_seconds=settings.STT_LONG_AUDIO_SPLIT_WINDOW_SECONDS,
+    )
+    print(f"decode + split: {(time.perf_counter() - start) * 1000:.1f} ms, {len(spans)} chunks")
+
+    backends = FakeBackends(latency=latency, realtime_factor=realtime_factor)
+    await backends.start()
+    service = STTService(client=backends.stt_client())
+    try:
+        start = time.perf_counter()
+        await service._recognize(wav, "en-US")
+        print(f"single request: {time.perf_counter() - start:7.3f} s")
+
+        backends.max_in_flight = 0
+        start = time.perf_counter()
+        result = await service.transcribe_audio(wav, "en-US")
+        print(f"chunked:        {time.perf_counter() - start:7.3f} s  "
+              f"segments={len(result['segments'])} peak in flight={backends.max_in_flight}")
+    finally:
+        await service.client.transport.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--realtime-factor", type=float, default=0.02)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.minutes, args.realtime_factor, args.latency))
@@ -0,0 +1,101 @@
+"""
+Metrics Overhead Benchmark
+
+Measures what recording metrics adds to the hot path: the cost of a histogram
+observation and a counter increment, and the per-request cost of
+MetricsMiddleware around a minimal ASGI application. Then sends a few
+/translate requests against the local fake backend and prints an excerpt of
+/metrics.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.metrics_overhead --requests 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core import metrics
+from app.core.middleware import MetricsMiddleware
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+
+async def _minimal_app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _per_request(asgi_app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def _per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+async def main(requests: int) -> None:
+    histogram = metrics.Histogram("benchmark_seconds", "Benchmark histogram", ("route",))
+    counter = metrics.Counter("benchmark_total", "Benchmark counter", ("route", "status"))
+    observe = _per_call(lambda: histogram.labels("/api/translate").observe(0.042), requests)
+    increment = _per_call(lambda: counter.labels("/api/translate", 200).inc(), requests)
+    print(f"histogram observe  {observe * 1e9:6.0f} ns")
+    print(f"counter increment  {increment * 1e9:6.0f} ns")
+
+    bare = await _per_request(_minimal_app, requests)
+    instrumented = await _per_request(MetricsMiddleware(_minimal_app), requests)
+    print(f"minimal ASGI app   {bare * 1e6:6.2f} us/request")
+    print(f"with middleware    {instrumented * 1e6:6.2f} us/request  "
+          f"(+{(instrumented - bare) * 1e6:.2f} us)")
+
+    backends = FakeBackends(latency=0.005)
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    try:
+        for index in range(20):
+            body = json.dumps({"text": f"sentence {index % 10}", "sourceLanguage": "en", "targetLanguage": "es"})
+            await request(app, "POST", "/api/translate", body.encode(), {"content-type": "application/json"})
+        status, headers, body = await request(app, "GET", "/metrics", b"", {})
+        print(f"/metrics: HTTP {status}, {headers['content-type']}, {len(body)} bytes")
+        for line in body.decode().splitlines():
+            if line.startswith(("http_requests_total", "upstream_rpcs_total", "translation_cache_hits",
+                                "translation_breaker_state", 'http_request_duration_seconds_bucket{method="POST",route="/api/translate",le="0.025"}')):
+                print(f"  {line}")
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,96 @@
+"""
+Upstream Outage Check
+
+Walks /translate through a simulated Translation API outage against the local
+fake backend:
+
+    1. healthy: translations succeed and fill the result cache
+    2. outage: every upstream call hangs past the request deadline. The first
+       requests time out, then the circuit breaker opens and the rest fail fast
+       with 503, except texts translated before, which are served from the
+       expired cache entries with stale=true and a Warning header
+    3. recovery: the API answers again; once CIRCUIT_OPEN_SECONDS have passed,
+       trial calls close the breaker and fresh translations are served
+
+Reports the status codes and latency of every phase and the breaker state.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.outage --requests 40
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+_JSON = {"content-type": "application/json"}
+
+
+async def _phase(label: str, texts: list[str]) -> None:
+    outcomes: dict[str, int] = {}
+    latencies: list[float] = []
+    for text in texts:
+        body = json.dumps({"text": text, "sourceLanguage": "en", "targetLanguage": "es"}).encode()
+        start = time.perf_counter()
+        status, headers, payload = await request(app, "POST", "/api/translate", body, _JSON)
+        latencies.append(time.perf_counter() - start)
+        outcome = str(status)
+        if status == 200 and json.loads(payload)["stale"]:
+            outcome = f"200 stale (Warning: {headers.get('warning')})"
+        elif status == 503:
+            outcome = f"503 (Retry-After: {headers.get('retry-after')})"
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    breaker = app.state.services.translation.breaker.stats()
+    print(f"{label:<9} max latency {max(latencies) * 1000:7.1f} ms  "
+          f"total {sum(latencies):6.2f} s  breaker={breaker['state']}")
+    for outcome, count in sorted(outcomes.items()):
+        print(f"{'':<9} {count:4d} x {outcome}")
+
+
+async def main(requests: int) -> None:
+    settings.RESULT_CACHE_TTL_SECONDS = 0.5
+    settings.TRANSLATE_DEADLINE_SECONDS = 1.0
+    settings.CIRCUIT_OPEN_SECONDS = 2.0
+    backends = FakeBackends(latency=0.01, slow_latency=5.0)
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    try:
+        cached = [f"cached sentence {index}" for index in range(requests // 2)]
+        await _phase("healthy", cached)
+        await asyncio.sleep(settings.RESULT_CACHE_TTL_SECONDS)
+
+        backends.slow_fraction = 1.0
+        texts = [text for pair in zip(cached, (f"new sentence {index}" for index in range(len(cached))))
+                 for text in pair]
+        await _phase("outage", texts)
+
+        backends.slow_fraction = 0.0
+        await _phase("recovery", [f"another sentence {index}" for index in range(requests // 2)])
+        await asyncio.sleep(settings.CIRCUIT_OPEN_SECONDS)
+        await _phase("recovery", [f"recovered sentence {index}" for index in range(requests // 2)])
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
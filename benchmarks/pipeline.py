@@ -0,0 +1,110 @@
+"""
+Speech Pipeline Benchmark
+
+Translates a synthetic recording into speech against the local fake backends,
+first the way a client chaining the individual endpoints does (base64 JSON to
+/stt/synthesize, then /translate, then /tts/synthesize) and then with a single
+raw upload to /pipeline/speech. Reports the time until the first audio is ready
+and the total time of each, and the pipeline's Server-Timing header.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.pipeline --minutes 3 --realtime-factor 0.02
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import time
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+from benchmarks.long_audio import synthetic_recording
+
+_JSON = {"content-type": "application/json"}
+
+
+async def _post_json(path: str, payload: dict) -> tuple[dict[str, str], bytes]:
+    status, headers, body = await request(app, "POST", path, json.dumps(payload).encode(), _JSON)
+    if status != 200:
+        raise SystemExit(f"{path}: HTTP {status} {body[:200]!r}")
+    return headers, body
+
+
+async def chained(wav: bytes) -> None:
+    start = time.perf_counter()
+    _, body = await _post_json("/api/stt/synthesize", {
+        "audioContent": base64.b64encode(wav).decode("ascii"),
+        "languageCode": "en-US",
+    })
+    transcript = json.loads(body)["text"]
+    _, body = await _post_json("/api/translate", {
+        "text": transcript,
+        "sourceLanguage": "en-US",
+        "targetLanguage": "es",
+    })
+    translation = json.loads(body)["translatedText"]
+    _, audio = await _post_json("/api/tts/synthesize", {
+        "text": translation,
+        "ttsCode": "es-ES",
+        "ttsName": "es-ES-Standard-A",
+    })
+    elapsed = time.perf_counter() - start
+    print(f"chained endpoints: first audio {elapsed:7.3f} s  total {elapsed:7.3f} s  "
+          f"audio={len(audio)} bytes")
+
+
+async def pipelined(wav: bytes) -> None:
+    start = time.perf_counter()
+    status, headers, audio = await request(
+        app, "POST",
+        "/api/pipeline/speech?sourceLanguage=en-US&targetLanguage=es&ttsCode=es-ES&ttsName=es-ES-Standard-A",
+        wav, {"content-type": "audio/wav"},
+    )
+    elapsed = time.perf_counter() - start
+    if status != 200:
+        raise SystemExit(f"/api/pipeline/speech: HTTP {status} {audio[:200]!r}")
+    timing = dict(
+        (metric.split(";")[0].strip(), float(metric.rsplit("dur=", 1)[1]))
+        for metric in headers["server-timing"].split(",")
+    )
+    print(f"pipeline endpoint: first audio {timing['tts'] / 1000:7.3f} s  total {elapsed:7.3f} s  "
+          f"audio={len(audio)} bytes")
+    print(f"  Server-Timing: {headers['server-timing']}")
+
+
+async def main(minutes: float, realtime_factor: float, latency: float) -> None:
+    wav = synthetic_recording(minutes)
+    settings.STT_MAX_UPLOAD_BYTES = max(settings.STT_MAX_UPLOAD_BYTES, 2 * len(wav))
+    backends = FakeBackends(latency=latency, realtime_factor=realtime_factor)
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    try:
+        await chained(wav)
+        # Different audio so the pipeline does not reuse cached results
+        await pipelined(synthetic_recording(minutes, seed=1))
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=3)
+    parser.add_argument("--realtime-factor", type=float, default=0.02)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.minutes, args.realtime_factor, args.latency))
@@ -0,0 +1,93 @@
+"""
+Profiler and Slow Request Check
+
+Sends /translate and /tts/synthesize requests to the local fake backend while
+POST /admin/profile samples the event loop, then prints the most sampled stacks
+and the slow requests recorded with their per-phase timings.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.profiler --seconds 2 --threshold-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.core.config import settings
+from app.core.profiling import slow_requests
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+_TOKEN = "benchmark-admin-token"
+_JSON = {"content-type": "application/json"}
+
+
+async def _load(stop: asyncio.Event) -> int:
+    sent = 0
+    while not stop.is_set():
+        body = json.dumps({"text": f"sentence {sent}", "sourceLanguage": "en", "targetLanguage": "es"})
+        await request(app, "POST", "/api/translate", body.encode(), _JSON)
+        body = json.dumps({"text": f"sentence {sent}", "ttsCode": "en-US", "ttsName": "en-US-Standard-A"})
+        await request(app, "POST", "/api/tts/synthesize", body.encode(), _JSON)
+        sent += 2
+    return sent
+
+
+async def main(seconds: float, threshold_ms: float) -> None:
+    settings.ADMIN_TOKEN = _TOKEN
+    slow_requests.threshold_ms = threshold_ms
+    backends = FakeBackends(latency=0.005, slow_fraction=0.1, slow_latency=0.05)
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    try:
+        status, _, _ = await request(app, "GET", "/api/admin/slow-requests", b"", {})
+        print(f"without token: HTTP {status}")
+
+        stop = asyncio.Event()
+        load = asyncio.create_task(_load(stop))
+        status, headers, body = await request(
+            app, "POST", f"/api/admin/profile?seconds={seconds}&intervalMs=2", b"",
+            {"authorization": f"Bearer {_TOKEN}"},
+        )
+        stop.set()
+        sent = await load
+        lines = body.decode().splitlines()
+        samples = sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+        print(f"profile: HTTP {status}, {headers['content-type']}, {len(lines)} stacks, "
+              f"{samples} samples while sending {sent} requests")
+        for line in lines[:3]:
+            stack, count = line.rsplit(" ", 1)
+            frames = stack.split(";")
+            print(f"  {count:>5} {' ; '.join(frames[-3:])}")
+
+        status, _, body = await request(
+            app, "GET", "/api/admin/slow-requests?limit=5", b"", {"x-admin-token": _TOKEN}
+        )
+        log = json.loads(body)
+        print(f"slow requests: HTTP {status}, {log['recorded']} over {log['thresholdMs']:g} ms")
+        for entry in log["requests"]:
+            phases = "  ".join(f"{name} {ms:.1f}" for name, ms in entry["phases"].items())
+            print(f"  {entry['method']} {entry['route']} {entry['status']} {entry['totalMs']:.1f} ms: {phases}")
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--threshold-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.threshold_ms))
@@ -0,0 +1,120 @@
+"""
+Quota Scheduler Benchmark
+
+Runs /translate traffic from two tenants against the local fake backend with a
+small characters-per-minute quota: a "bulk" tenant floods the service with
+concurrent requests while an "interactive" tenant sends one request at a time.
+Reports, per tenant, how many requests succeeded, how many were rejected with 429
+(and the Retry-After they carried), and the latency of the successful ones. With
+fair queuing the interactive tenant keeps a steady latency while the bulk
+tenant's excess is queued or rejected.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.quota --chars-per-minute 60000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+_TEXT_CHARS = 100
+
+
+class _Tally:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.rejected = 0
+        self.retry_after: list[int] = []
+
+
+async def _translate(tenant: str, index: int, tally: _Tally) -> None:
+    text = f"{tenant} request {index} ".ljust(_TEXT_CHARS, "x")
+    body = json.dumps({"text": text, "sourceLanguage": "en", "targetLanguage": "es"}).encode()
+    start = time.perf_counter()
+    status, headers, _ = await request(
+        app, "POST", "/api/translate", body,
+        {"content-type": "application/json", settings.QUOTA_TENANT_HEADER: tenant},
+    )
+    if status == 200:
+        tally.latencies.append(time.perf_counter() - start)
+    elif status == 429:
+        tally.rejected += 1
+        tally.retry_after.append(int(headers["retry-after"]))
+    else:
+        raise SystemExit(f"{tenant}: HTTP {status}")
+
+
+async def _bulk(deadline: float, concurrency: int, tally: _Tally) -> None:
+    counter = iter(range(10**9))
+
+    async def worker():
+        # Ignores Retry-After, as a misbehaving client would
+        while time.perf_counter() < deadline:
+            await _translate("bulk", next(counter), tally)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def _interactive(deadline: float, tally: _Tally) -> None:
+    index = 0
+    while time.perf_counter() < deadline:
+        await _translate("interactive", index, tally)
+        index += 1
+        await asyncio.sleep(0.2)
+
+
+def _report(name: str, tally: _Tally) -> None:
+    latencies = sorted(tally.latencies)
+    p50 = statistics.median(latencies) if latencies else 0.0
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    retry = f"  Retry-After {min(tally.retry_after)}-{max(tally.retry_after)} s" if tally.retry_after else ""
+    print(f"{name:<12} ok={len(latencies):4d}  429={tally.rejected:5d}  "
+          f"p50={p50 * 1000:7.1f} ms  p95={p95 * 1000:7.1f} ms{retry}")
+
+
+async def main(chars_per_minute: int, seconds: float, concurrency: int) -> None:
+    settings.TRANSLATION_QUOTA_CHARS_PER_MINUTE = chars_per_minute
+    settings.TRANSLATION_CACHE_MAX_BYTES = 0
+    backends = FakeBackends(latency=0.02)
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    try:
+        bulk, interactive = _Tally(), _Tally()
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(_bulk(deadline, concurrency, bulk), _interactive(deadline, interactive))
+        quota = app.state.services.translation.quota
+        sent = backends.calls.get("TranslateText", 0) * _TEXT_CHARS
+        print(f"quota {chars_per_minute} chars/min over {seconds:.0f} s: "
+              f"{sent} chars sent upstream, {quota.stats()}")
+        _report("bulk", bulk)
+        _report("interactive", interactive)
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chars-per-minute", type=int, default=60000)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.chars_per_minute, args.seconds, args.concurrency))
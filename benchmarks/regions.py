@@ -0,0 +1,114 @@
+"""
+Multi-Region Routing Check
+
+Runs /translate against three fake regional backends: a nearby region, a
+distant one answering several times slower, and a third one in between.
+
+    1. healthy: after a warm-up that measures every region, calls settle on the
+       nearby one; the others only receive the occasional probe
+    2. outage: the nearby region fails every call with UNAVAILABLE. Failed calls
+       are sent again to the next region at once, so requests keep succeeding,
+       and the region is ejected after a few failures
+    3. ejected: the nearby region answers again but stays ejected, so the
+       traffic stays on the other regions
+    4. recovery: once REGION_EJECT_SECONDS have passed, the nearby region
+       receives calls on probation and takes the traffic back
+
+Reports, for every phase, the latency percentiles and status codes of the
+requests and the calls each region received.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.regions --requests 300 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.config import settings
+from app.main import app
+from app.services.region_router import Region
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+from benchmarks.harness import summarize
+
+_JSON = {"content-type": "application/json"}
+# Location and median latency of each fake region
+_REGIONS = (("us-central1", 0.02), ("europe-west4", 0.15), ("us-east1", 0.06))
+
+
+async def _phase(label: str, args: argparse.Namespace, backends: dict[str, FakeBackends]) -> None:
+    before = {location: fake.calls.get("TranslateText", 0) for location, fake in backends.items()}
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    counter = iter(range(args.requests))
+
+    async def client():
+        for index in counter:
+            body = json.dumps({
+                "text": f"{label} sentence {index}", "sourceLanguage": "en", "targetLanguage": "es",
+            }).encode()
+            start = time.perf_counter()
+            status, _, _ = await request(app, "POST", "/api/translate", body, _JSON)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    summary = summarize(latencies, time.perf_counter() - start)
+    router = app.state.services.translation.router.stats()
+    calls = "  ".join(
+        f"{location}={fake.calls.get('TranslateText', 0) - before[location]}" for location, fake in backends.items()
+    )
+    print(f"{label:<9} p50={summary['p50_ms']:6.1f} ms  p99={summary['p99_ms']:6.1f} ms  "
+          f"status={statuses}  preferred={router['preferred']}")
+    print(f"{'':<9} calls: {calls}  failovers={router['failovers']}  ejections={router['ejections']}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings.TRANSLATION_CACHE_MAX_BYTES = 0
+    settings.REGION_EJECT_SECONDS = args.eject_seconds
+    backends = {location: FakeBackends(latency=latency, latency_sigma=0.2) for location, latency in _REGIONS}
+    for fake in backends.values():
+        await fake.start()
+    fallback = backends[_REGIONS[0][0]]
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(regions=[
+            Region(location, fake.translation_client()) for location, fake in backends.items()
+        ]),
+        tts=TTSService(client=fallback.tts_client()),
+        stt=STTService(client=fallback.stt_client()),
+    )
+    try:
+        # Connect every regional channel, as the application does on startup
+        await app.state.services.start()
+        await _phase("warm-up", args, backends)
+        nearby = backends[_REGIONS[0][0]]
+        await _phase("healthy", args, backends)
+        nearby.failure_rate = 1.0
+        await _phase("outage", args, backends)
+        nearby.failure_rate = 0.0
+        nearby_ejected_until = app.state.services.translation.router.regions[0].ejected_until
+        await _phase("ejected", args, backends)
+        await asyncio.sleep(max(0.0, nearby_ejected_until - time.monotonic()))
+        await _phase("recovery", args, backends)
+    finally:
+        await app.state.services.close()
+        for fake in backends.values():
+            await fake.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--eject-seconds", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,102 @@
+"""
+Response Serialization Micro-Benchmark
+
+Measures the CPU time spent turning service output into a JSON response body,
+per response, for payloads of the sizes the endpoints typically return:
+
+    fastapi   the endpoint builds the response model from the service dict and
+              returns it; FastAPI dumps it, validates it again against the
+              response_model, makes it JSON-compatible and JSONResponse encodes it
+    model     the endpoint returns ModelResponse: the dict is validated once and
+              encoded by the model's compiled serializer
+
+Both bodies are checked to decode to the same JSON.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.serialization --iterations 5000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.core.responses import ModelResponse
+from app.main import app
+from app.schemas.responses import BatchTranslateResponse, DetectLanguageResponse, STTResponse, TranslateResponse
+
+
+def _text(chars: int) -> str:
+    return ("lorem ipsum dolor sit amet " * (chars // 27 + 1))[:chars]
+
+
+def _payloads() -> dict[str, tuple[str, type, dict]]:
+    """
+    Return the route path, response model and a typical service result per payload.
+    """
+    translation = {
+        "translatedText": _text(200),
+        "detectedSourceLanguage": "en",
+        "targetLanguage": "es",
+        "memoryMatch": None,
+        "stale": False,
+    }
+    segments = [
+        {"text": _text(60), "confidence": 0.92, "startOffset": index * 4.0, "endOffset": index * 4.0 + 3.8}
+        for index in range(15)
+    ]
+    return {
+        "translate": ("/api/translate", TranslateResponse, translation),
+        "detect-language": ("/api/detect-language", DetectLanguageResponse, {
+            "languageCode": "en", "confidence": 0.98, "stale": False,
+        }),
+        "translate/batch (50)": ("/api/translate/batch", BatchTranslateResponse, {
+            "translations": [dict(translation, error=None) for _ in range(50)],
+        }),
+        "stt (15 segments)": ("/api/stt/synthesize", STTResponse, {
+            "text": " ".join(segment["text"] for segment in segments),
+            "confidence": 0.92,
+            "languageCode": "en-US",
+            "segments": segments,
+        }),
+    }
+
+
+async def _fastapi(field, model: type, result: dict) -> bytes:
+    content = await serialize_response(field=field, response_content=model(**result), is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def main(args: argparse.Namespace) -> None:
+    fields = {route.path: route.response_field for route in app.routes if hasattr(route, "response_field")}
+    print(f"{'payload':<22} {'bytes':>7} {'fastapi':>10} {'model':>10} {'saved':>10}")
+    for name, (path, model, result) in _payloads().items():
+        field = fields[path]
+        body = await _fastapi(field, model, result)
+        if json.loads(body) != json.loads(ModelResponse(model, result).body):
+            raise AssertionError(f"{name}: the two bodies differ")
+
+        start = time.process_time()
+        for _ in range(args.iterations):
+            await _fastapi(field, model, result)
+        fastapi_us = (time.process_time() - start) / args.iterations * 1e6
+
+        start = time.process_time()
+        for _ in range(args.iterations):
+            ModelResponse(model, result)
+        model_us = (time.process_time() - start) / args.iterations * 1e6
+
+        print(f"{name:<22} {len(body):>7} {fastapi_us:>8.1f}us {model_us:>8.1f}us "
+              f"{fastapi_us - model_us:>8.1f}us ({fastapi_us / model_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,211 @@
+"""
+Transcription Jobs Check
+
+Drives the batch transcription job API in process against the local fake
+backend, whose BatchRecognize operations finish after a fixed time:
+
+    - submits a batch of jobs and waits for them to finish, reporting the total
+      time and how many times each operation was polled
+    - cancels a running job and checks its operation was cancelled upstream
+    - restarts the service while jobs are running and checks they resume from
+      the job table, while a cancelled job stays cancelled
+    - starts two workers on the same job table and checks every resumed job is
+      claimed and polled by only one of them
+    - makes an operation unpollable and checks its job is marked failed after
+      STT_JOBS_MAX_POLL_ERRORS consecutive errors
+    - checks every cancelled job is still cancelled, without a result, after its
+      operation would have finished
+
+Every check is an assertion, so a regression exits with an error.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.stt_jobs --jobs 12 --operation-seconds 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from collections import defaultdict
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+_HEADERS = {"content-type": "application/json"}
+
+
+async def _call(method: str, path: str, body: dict | None = None) -> tuple[int, dict]:
+    payload = json.dumps(body).encode() if body is not None else b""
+    status, _, response = await request(app, method, f"/api/stt{path}", payload, _HEADERS)
+    return status, json.loads(response)
+
+
+async def _submit(uri: str) -> str:
+    status, job = await _call("POST", "/jobs", {"audioUri": uri, "languageCode": "en-US"})
+    assert status == 202, (status, job)
+    return job["jobId"]
+
+
+async def _wait(job_ids: list[str], timeout: float, service: STTService | None = None) -> dict[str, dict]:
+    """
+    Wait for jobs to finish, reading them through the API or straight from a service.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if service is None:
+            jobs = {job_id: (await _call("GET", f"/jobs/{job_id}"))[1] for job_id in job_ids}
+        else:
+            jobs = {job_id: await service.jobs.get(job_id) for job_id in job_ids}
+        if all(job["status"] not in ("queued", "running") for job in jobs.values()):
+            return jobs
+        if time.monotonic() > deadline:
+            raise SystemExit(f"jobs still active after {timeout}s: {jobs}")
+        await asyncio.sleep(0.05)
+
+
+async def _start(backends: FakeBackends) -> None:
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    await app.state.services.stt.start()
+
+
+def _operations(backends: FakeBackends, uri: str) -> list[dict]:
+    return [state for state in backends.operations.values() if uri in state["uris"]]
+
+
+async def _workers_share_table(backends: FakeBackends, job_ids: list[str], timeout: float) -> None:
+    """
+    Resume the same jobs in two workers at once and check each is held by one only.
+    """
+    holders: dict[str, set[int]] = defaultdict(set)
+    pollers: dict[str, set[int]] = defaultdict(set)
+    workers = [STTService(client=backends.stt_client()) for _ in range(2)]
+    for index, worker in enumerate(workers):
+        get_batch_operation = worker.get_batch_operation
+        claim = worker.jobs._claim
+
+        async def polled(name, language_code, index=index, get_batch_operation=get_batch_operation):
+            pollers[name].add(index)
+            return await get_batch_operation(name, language_code)
+
+        async def claimed(job_id, index=index, claim=claim):
+            job = await claim(job_id)
+            if job is not None:
+                holders[job_id].add(index)
+            return job
+
+        worker.get_batch_operation = polled
+        worker.jobs._claim = claimed
+    await asyncio.gather(*(worker.start() for worker in workers))
+    try:
+        jobs = await _wait(job_ids, timeout, workers[0])
+    finally:
+        await asyncio.gather(*(worker.close() for worker in workers))
+    assert all(job["status"] == "succeeded" for job in jobs.values()), jobs
+    uris = [uri for state in backends.operations.values() for uri in state["uris"]]
+    assert len(uris) == len(set(uris)), "a job started more than one operation"
+    assert set(holders) == set(job_ids), f"jobs never claimed: {set(job_ids) - set(holders)}"
+    shared = [job_id for job_id, indexes in holders.items() if len(indexes) > 1]
+    assert not shared, f"jobs held by both workers: {shared}"
+    shared = [name for name, indexes in pollers.items() if len(indexes) > 1]
+    assert pollers and not shared, f"operations polled by both workers: {shared}"
+    print(f"two workers: {len(job_ids)} resumed jobs each claimed and polled by one worker only")
+
+
+async def main(count: int, operation_seconds: float) -> None:
+    settings.STT_JOBS_DB_PATH = os.path.join(tempfile.mkdtemp(), "stt-jobs.db")
+    settings.STT_JOBS_POLL_INITIAL_SECONDS = operation_seconds / 10
+    settings.STT_JOBS_POLL_MAX_SECONDS = operation_seconds / 2
+    timeout = operation_seconds * (count / settings.STT_JOBS_MAX_PER_PROJECT + 5)
+
+    backends = FakeBackends(latency=0.01, operation_seconds=operation_seconds)
+    await backends.start()
+    await _start(backends)
+    try:
+        start = time.perf_counter()
+        job_ids = [await _submit(f"gs://bucket/recording-{i}.wav") for i in range(count)]
+        jobs = await _wait(job_ids, timeout)
+        assert all(job["status"] == "succeeded" for job in jobs.values()), jobs
+        status, result = await _call("GET", f"/jobs/{job_ids[0]}/result")
+        assert status == 200 and result["text"] == "transcript of gs://bucket/recording-0.wav", result
+        print(f"{count} jobs done in {time.perf_counter() - start:.2f} s "
+              f"(per-project limit {settings.STT_JOBS_MAX_PER_PROJECT}), "
+              f"{backends.calls.get('GetOperation', 0) / count:.1f} polls per job")
+
+        job_id = await _submit("gs://bucket/cancelled.wav")
+        cancelled_ids = [job_id]
+        await asyncio.sleep(operation_seconds / 3)
+        status, job = await _call("POST", f"/jobs/{job_id}/cancel")
+        assert status == 200 and job["status"] == "cancelled", job
+        operations = _operations(backends, "gs://bucket/cancelled.wav")
+        assert operations and all(state["cancelled"] for state in operations), operations
+        status, _ = await _call("GET", f"/jobs/{job_id}/result")
+        assert status == 409, status
+        print("cancel: job cancelled and upstream operation cancelled")
+
+        job_ids = [await _submit(f"gs://bucket/resumed-{i}.wav") for i in range(2)]
+        cancelled_id = await _submit("gs://bucket/cancelled-before-restart.wav")
+        cancelled_ids.append(cancelled_id)
+        await asyncio.sleep(operation_seconds / 3)
+        status, job = await _call("POST", f"/jobs/{cancelled_id}/cancel")
+        assert status == 200 and job["status"] == "cancelled", job
+        cancelled_at = time.monotonic()
+        started = len(backends.operations)
+        await app.state.services.close()
+        await _start(backends)
+        jobs = await _wait(job_ids + [cancelled_id], timeout)
+        assert all(jobs[job_id]["status"] == "succeeded" for job_id in job_ids), jobs
+        assert jobs[cancelled_id]["status"] == "cancelled", jobs[cancelled_id]
+        assert len(backends.operations) == started, "resumed jobs started new operations"
+        print("restart: running jobs resumed and finished without new operations, cancelled job stayed cancelled")
+
+        job_ids = [await _submit(f"gs://bucket/shared-{i}.wav") for i in range(count)]
+        await asyncio.sleep(operation_seconds / 3)
+        await app.state.services.close()
+        await _workers_share_table(backends, job_ids, timeout)
+        await _start(backends)
+
+        settings.STT_JOBS_MAX_POLL_ERRORS = 3
+        job_id = await _submit("gs://bucket/unpollable.wav")
+        while (job := await app.state.services.stt.jobs.get(job_id))["operation"] is None:
+            await asyncio.sleep(0.01)
+        # The fake answers NOT_FOUND for operations it does not know
+        del backends.operations[job["operation"]]
+        job = (await _wait([job_id], timeout))[job_id]
+        assert job["status"] == "failed" and "3 times in a row" in job["error"], job
+        print(f"poll errors: job failed after {settings.STT_JOBS_MAX_POLL_ERRORS} consecutive poll errors")
+
+        # By now the operations of the cancelled jobs would have finished
+        await asyncio.sleep(max(0.0, cancelled_at + 2 * operation_seconds - time.monotonic()))
+        for job_id in cancelled_ids:
+            status, job = await _call("GET", f"/jobs/{job_id}")
+            assert status == 200 and job["status"] == "cancelled", job
+            status, _ = await _call("GET", f"/jobs/{job_id}/result")
+            assert status == 409, status
+        print(f"cancelled jobs: {len(cancelled_ids)} still cancelled after their operations would have finished")
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=12)
+    parser.add_argument("--operation-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.jobs, args.operation_seconds))
@@ -0,0 +1,124 @@
+"""
+Speech-to-Text Upload Memory Benchmark
+
+Sends multi-megabyte audio clips through the speech-to-text endpoints in process:
+base64 inside JSON (/stt/synthesize) versus raw bytes (/stt/upload with
+application/octet-stream) and a multipart form upload. For each it reports the
+peak Python memory allocated until the audio reaches the speech-to-text service,
+and over the whole request. The recognizer is the local fake backend, whose
+copies of the audio are included in the total.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.stt_upload --sizes 1 4 8
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+import tracemalloc
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+_BOUNDARY = "gtranslate-benchmark"
+
+
+def _json_body(audio: bytes) -> tuple[bytes, dict]:
+    body = json.dumps({
+        "audioContent": base64.b64encode(audio).decode("ascii"),
+        "languageCode": "en-US",
+    }).encode()
+    return body, {"content-type": "application/json"}
+
+
+def _multipart_body(audio: bytes) -> tuple[bytes, dict]:
+    body = b"".join((
+        f"--{_BOUNDARY}\r\n".encode(),
+        b'Content-Disposition: form-data; name="languageCode"\r\n\r\nen-US\r\n',
+        f"--{_BOUNDARY}\r\n".encode(),
+        b'Content-Disposition: form-data; name="audio"; filename="clip.wav"\r\n',
+        b"Content-Type: audio/wav\r\n\r\n",
+        audio,
+        f"\r\n--{_BOUNDARY}--\r\n".encode(),
+    ))
+    return body, {"content-type": f"multipart/form-data; boundary={_BOUNDARY}"}
+
+
+async def _measure(label: str, path: str, body: bytes, headers: dict, audio_size: int) -> None:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    status, _, response = await request(app, "POST", path, body, headers)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if status != 200:
+        raise SystemExit(f"{label}: HTTP {status} {response[:200]!r}")
+    handling = _handoff_peak.pop()
+    print(f"{label:<12} upload={len(body) / 2**20:6.2f} MiB  "
+          f"until recognizer={handling / 2**20:7.2f} MiB ({handling / audio_size:4.1f}x audio)  "
+          f"total={peak / 2**20:7.2f} MiB  time={elapsed * 1000:7.1f} ms")
+
+
+def _record_handoff(service: STTService) -> None:
+    """
+    Record the peak memory reached by the time the audio reaches the service.
+
+    The total peak also includes the gRPC client and the in-process fake server,
+    which hold their own copies of the audio.
+    """
+    transcribe_audio = service.transcribe_audio
+
+    async def recorded(**kwargs):
+        _handoff_peak.append(tracemalloc.get_traced_memory()[1])
+        return await transcribe_audio(**kwargs)
+
+    service.transcribe_audio = recorded
+
+
+_handoff_peak: list[int] = []
+
+
+async def main(sizes: list[float]) -> None:
+    backends = FakeBackends(latency=0.0)
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    _record_handoff(app.state.services.stt)
+    settings.STT_MAX_UPLOAD_BYTES = max(settings.STT_MAX_UPLOAD_BYTES, int(max(sizes) * 2**20) + 4096)
+    try:
+        for size in sizes:
+            audio = os.urandom(int(size * 2**20))
+            print(f"clip of {size} MiB")
+            body, headers = _json_body(audio)
+            await _measure("json/base64", "/api/stt/synthesize", body, headers, len(audio))
+            del body
+            headers = {"content-type": "application/octet-stream"}
+            await _measure("octet-stream", "/api/stt/upload?languageCode=en-US", audio, headers, len(audio))
+            body, headers = _multipart_body(audio)
+            await _measure("multipart", "/api/stt/upload", body, headers, len(audio))
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
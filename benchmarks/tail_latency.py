@@ -0,0 +1,104 @@
+"""
+Tail Latency Benchmark
+
+Sends /translate requests against the local fake backend while a share of the
+upstream calls is slow and another share fails with UNAVAILABLE, once with
+retries and hedging disabled and once with them enabled. Reports the latency
+percentiles, the requests that failed, the upstream calls made and the retries
+and hedges spent, so the tail latency won can be weighed against the extra load.
+
+GOOGLE_PROJECT_ID and GOOGLE_APPLICATION_CREDENTIALS must be set for the
+settings to load; no Google Cloud access is needed.
+
+Usage:
+    python -m benchmarks.tail_latency --requests 1000 --slow-fraction 0.05 --failure-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.config import settings
+from app.main import app
+from app.services.registry import ServiceRegistry
+from app.services.stt_service import STTService
+from app.services.translation_service import TranslationService
+from app.services.tts_service import TTSService
+from benchmarks.asgi import request
+from benchmarks.fake_backends import FakeBackends
+
+_JSON = {"content-type": "application/json"}
+
+
+def _percentile(latencies: list[float], percentile: float) -> float:
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+
+async def run(label: str, args: argparse.Namespace, resilient: bool) -> None:
+    settings.RPC_MAX_ATTEMPTS = 3 if resilient else 1
+    settings.RPC_HEDGING_ENABLED = resilient
+    backends = FakeBackends(
+        latency=args.latency,
+        slow_fraction=args.slow_fraction,
+        slow_latency=args.slow_latency,
+        failure_rate=args.failure_rate,
+    )
+    await backends.start()
+    app.state.services = ServiceRegistry(
+        translation=TranslationService(client=backends.translation_client()),
+        tts=TTSService(client=backends.tts_client()),
+        stt=STTService(client=backends.stt_client()),
+    )
+    latencies: list[float] = []
+    failures: dict[int, int] = {}
+    counter = iter(range(args.requests))
+
+    async def worker():
+        for index in counter:
+            body = json.dumps({
+                "text": f"{label} sentence number {index}",
+                "sourceLanguage": "en",
+                "targetLanguage": "es",
+            }).encode()
+            start = time.perf_counter()
+            status, _, _ = await request(app, "POST", "/api/translate", body, _JSON)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures[status] = failures.get(status, 0) + 1
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        latencies.sort()
+        policy = app.state.services.translation.translate_rpc.stats()
+        print(f"{label:<10} p50={_percentile(latencies, 50) * 1000:7.1f} ms  "
+              f"p95={_percentile(latencies, 95) * 1000:7.1f} ms  "
+              f"p99={_percentile(latencies, 99) * 1000:7.1f} ms  "
+              f"max={_percentile(latencies, 100) * 1000:7.1f} ms  failed={failures or 0}")
+        print(f"{'':<10} upstream calls={backends.calls.get('TranslateText', 0)}  "
+              f"retries={policy['retries']}  hedges={policy['hedges']}  hedge wins={policy['hedge_wins']}  delay={policy['hedge_delay']}")
+    finally:
+        await app.state.services.close()
+        await backends.stop()
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings.TRANSLATION_CACHE_MAX_BYTES = 0
+    settings.TRANSLATE_DEADLINE_SECONDS = args.deadline
+    await run("baseline", args, resilient=False)
+    await run("resilient", args, resilient=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--deadline", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
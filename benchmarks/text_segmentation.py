@@ -0,0 +1,73 @@
+"""
+Text Segmentation Check
+
+Splits Latin and CJK text into TTS chunks at a range of byte limits and checks
+that no chunk is over its limit and that the chunks put back together give the
+original text: the same words for Latin text (no words glued together at clause
+boundaries) and the same characters for CJK text (no spaces added between
+sentences). Reports the time spent splitting a long text.
+
+Usage:
+    python -m benchmarks.text_segmentation --iterations 200
+"""
+
+import argparse
+import time
+
+from app.services.text_segmentation import split_text
+
+_LATIN = (
+    "Hello, world, how are you doing today my friend. The quick brown fox jumps over the "
+    "lazy dog; it was not amused: mu, nu, xi and omicron followed! Did anyone notice?\n\n"
+    "A new paragraph starts here, and it goes on for a while before it finally ends."
+)
+_CJK = "今日は晴れです。明日は雨です。週末は、友達と、公園に行きます！楽しみですか？"
+
+# Cases from regressions: (text, max_bytes, expected chunks)
+_EXPECTED = [
+    ("Hello, world, how are you doing today my friend", 20,
+     ["Hello, world, how", "are you doing today", "my friend"]),
+    ("alpha beta gamma delta, mu, nu xi", 12, ["alpha beta", "gamma delta,", "mu, nu xi"]),
+    ("今日は晴れです。明日は雨です。", 100, ["今日は晴れです。明日は雨です。"]),
+]
+
+
+def _check(text: str, max_bytes: int, first_max_bytes: int | None) -> None:
+    chunks = split_text(text, max_bytes, first_max_bytes)
+    for index, chunk in enumerate(chunks):
+        limit = min(first_max_bytes or max_bytes, max_bytes) if index == 0 else max_bytes
+        if len(chunk.encode("utf-8")) > limit:
+            raise AssertionError(f"chunk {index} over {limit} bytes: {chunk!r}")
+    if " " in text:
+        words = " ".join(chunks).split()
+        # Words only break when a single word is over the limit
+        if not any(len(word.encode("utf-8")) > min(first_max_bytes or max_bytes, max_bytes) for word in text.split()):
+            if words != text.split():
+                raise AssertionError(f"words changed at {max_bytes} bytes: {chunks}")
+    elif "".join(chunks) != text:
+        raise AssertionError(f"text changed at {max_bytes} bytes: {chunks}")
+
+
+def main(args: argparse.Namespace) -> None:
+    for text, max_bytes, expected in _EXPECTED:
+        chunks = split_text(text, max_bytes)
+        if chunks != expected:
+            raise AssertionError(f"split_text({text!r}, {max_bytes}) = {chunks}, expected {expected}")
+    for text in (_LATIN, _CJK):
+        for max_bytes in range(12, 400, 7):
+            for first_max_bytes in (None, max_bytes // 2 or 1):
+                _check(text, max_bytes, first_max_bytes)
+    print("chunks: OK")
+
+    text = " ".join([_LATIN, _CJK] * 50)
+    start = time.process_time()
+    for _ in range(args.iterations):
+        split_text(text, 1500, 200)
+    elapsed = (time.process_time() - start) / args.iterations * 1000
+    print(f"split {len(text.encode('utf-8'))} bytes: {elapsed:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    main(parser.parse_args())